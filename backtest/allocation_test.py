@@ -1,9 +1,11 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
 import pandas as pd
 
 from backtest.engine import BacktestEngine
-from backtest.metrics import compute_equity_curve, compute_max_drawdown
+from backtest.metrics import compute_max_drawdown
+from backtest.portfolio import PortfolioEngine
+from backtest.result_cache import ResultCache
 from engine.sma_trend_strategy import SMATrendStrategy
 from engine.mean_reversion_strategy import MeanReversionStrategy
 
@@ -12,10 +14,19 @@ def run_allocation(
     data: pd.DataFrame,
     total_capital: float,
     trend_weight: float,
+    sma_window: int = 200,
+    trend_risk_per_trade: float = 0.01,
+    trend_atr_multiplier: float = 2.0,
+    cache: Optional[ResultCache] = None,
 ) -> Tuple[float, float]:
     """
     Run portfolio with static allocation.
     Returns (final_equity, max_drawdown).
+
+    Both sleeves share one pass over the data, and indicator series
+    come from the shared cache, so sweeping trend_weight over the same
+    data computes them only once. With a ResultCache, sleeve runs
+    identical to earlier ones are reused.
     """
 
     trend_capital = total_capital * trend_weight
@@ -24,19 +35,16 @@ def run_allocation(
     # --- Trend ---
     trend_engine = BacktestEngine(
         data=data,
-        strategy=SMATrendStrategy(window=200),
+        strategy=SMATrendStrategy(window=sma_window),
         initial_capital=trend_capital,
-        risk_per_trade=0.01,
+        risk_per_trade=trend_risk_per_trade,
         max_drawdown=0.20,
         atr_period=14,
-        atr_multiplier=2.0,
+        atr_multiplier=trend_atr_multiplier,
         transaction_cost=10.0,
         slippage=0.5,
     )
 
-    trend_trades = trend_engine.run()
-    trend_equity = compute_equity_curve(trend_trades, trend_capital)
-
     # --- Mean Reversion ---
     mr_engine = BacktestEngine(
         data=data,
@@ -50,20 +58,8 @@ def run_allocation(
         slippage=0.5,
     )
 
-    mr_trades = mr_engine.run()
-    mr_equity = compute_equity_curve(mr_trades, mr_capital)
-
     # --- Combine ---
-    combined = trend_equity.merge(
-        mr_equity,
-        on="date",
-        how="outer",
-        suffixes=("_trend", "_mr"),
-    ).sort_values("date").ffill()
-
-    combined["portfolio_equity"] = (
-        combined["equity_trend"] + combined["equity_mr"]
-    )
+    combined = PortfolioEngine({"trend": trend_engine, "mr": mr_engine}).run(cache)
 
     final_equity = combined["portfolio_equity"].iloc[-1]
     max_dd = compute_max_drawdown(combined["portfolio_equity"])
@@ -0,0 +1,131 @@
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Optional
+
+from backtest.engine import BacktestEngine
+from backtest.trade_log import TradeLog
+from engine.data_loader import PROCESSED_DIR, dataset_hash
+from engine.strategy import StreamingStrategy, iter_bars
+
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_DIR = PROCESSED_DIR / "checkpoints"
+
+
+def checkpoint_path(data_path: Path, sleeve: str, root: Path = CHECKPOINT_DIR) -> Path:
+    return root / f"{Path(data_path).stem}_{sleeve}.ckpt"
+
+
+def engine_fingerprint(engine: BacktestEngine) -> Dict:
+    """
+    Strategy class and parameters plus engine settings. A checkpoint
+    written under a different fingerprint is never resumed.
+    """
+    strategy = engine.strategy
+    return {
+        "strategy": type(strategy).__name__,
+        "params": {k: v for k, v in vars(strategy).items() if not k.startswith("_")},
+        "initial_capital": engine.initial_capital,
+        "risk_per_trade": engine.risk_per_trade,
+        "max_drawdown": engine.max_drawdown,
+        "atr_period": engine.atr_period,
+        "atr_multiplier": engine.atr_multiplier,
+        "transaction_cost": engine.transaction_cost,
+        "slippage": engine.slippage,
+    }
+
+
+def save_checkpoint(engine: BacktestEngine, path: Path) -> None:
+    """
+    Write the engine's state after it has consumed all of engine.data,
+    with a hash of that data so a later run can check its prefix.
+    """
+    checkpoint = {
+        "version": CHECKPOINT_VERSION,
+        "fingerprint": engine_fingerprint(engine),
+        "rows": len(engine.data),
+        "prefix_hash": dataset_hash(engine.data),
+        "state": engine.get_state(),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: Path) -> Optional[Dict]:
+    try:
+        with open(path, "rb") as f:
+            checkpoint = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        return None
+    return checkpoint
+
+
+def _resumable_rows(engine: BacktestEngine, checkpoint: Optional[Dict]) -> int:
+    """
+    Rows of engine.data the checkpoint already covers, or 0 when it
+    can't be used and the run has to start from scratch.
+    """
+    if checkpoint is None:
+        return 0
+    if checkpoint["fingerprint"] != engine_fingerprint(engine):
+        logger.info("Checkpoint settings differ; rebuilding")
+        return 0
+
+    rows = checkpoint["rows"]
+    if rows > len(engine.data):
+        logger.info("Data is shorter than the checkpoint; rebuilding")
+        return 0
+    if dataset_hash(engine.data.iloc[:rows]) != checkpoint["prefix_hash"]:
+        logger.info("Historical bars changed since the checkpoint; rebuilding")
+        return 0
+
+    return rows
+
+
+def run_incremental(engine: BacktestEngine, path: Path) -> TradeLog:
+    """
+    Bring a streaming-strategy engine up to date with engine.data.
+
+    Restores the checkpoint at path when it was written with the same
+    settings over an unchanged prefix of the data and steps through the
+    appended bars only; otherwise replays everything. Either way the
+    checkpoint is rewritten for the next run, and the trades match a
+    full engine.run().
+    """
+    if not isinstance(engine.strategy, StreamingStrategy):
+        raise TypeError("Incremental runs need a streaming strategy")
+
+    checkpoint = load_checkpoint(path)
+    rows = _resumable_rows(engine, checkpoint)
+
+    if rows:
+        engine.set_state(checkpoint["state"])
+        for bar in iter_bars(engine.data.iloc[rows:]):
+            if not engine.step(bar):
+                break
+        logger.info(
+            "Resumed %s at bar %d; %d new bars",
+            path.name,
+            rows,
+            len(engine.data) - rows,
+        )
+    else:
+        engine.run()
+
+    try:
+        save_checkpoint(engine, path)
+    except OSError as exc:
+        logger.warning("Could not write checkpoint %s: %s", path, exc)
+
+    return engine.trades
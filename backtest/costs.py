@@ -0,0 +1,431 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import BacktestEngine
+from backtest.metrics import compute_max_drawdown
+from backtest.trade_log import ENTRY_TYPES, EXIT_TYPES, TradeLog, TradeType
+from engine.indicators import indicator_cache
+
+
+# Statutory charges per segment, as fractions of turnover. These follow
+# the NSE / SEBI schedule at the time of writing and change from time to
+# time; check them before relying on the absolute numbers.
+NSE_RATES = {
+    "delivery": {
+        "stt_buy": 0.001,
+        "stt_sell": 0.001,
+        "exchange": 0.0000297,
+        "sebi": 0.000001,
+        "stamp_buy": 0.00015,
+    },
+    "intraday": {
+        "stt_buy": 0.0,
+        "stt_sell": 0.00025,
+        "exchange": 0.0000297,
+        "sebi": 0.000001,
+        "stamp_buy": 0.00003,
+    },
+    "futures": {
+        "stt_buy": 0.0,
+        "stt_sell": 0.0002,
+        "exchange": 0.0000173,
+        "sebi": 0.000001,
+        "stamp_buy": 0.00002,
+    },
+}
+
+GST_RATE = 0.18
+
+
+class Fills:
+    """
+    Every entry and exit of a run as parallel arrays, priced at the bar
+    close before any slippage: bar index, price, units, side (+1 buy,
+    -1 sell), bar volume and ATR, whether the fill was a stop, and the
+    index of the entry fill each fill belongs to (itself for entries).
+    """
+
+    def __init__(self, bar, price, size, side, volume, atr, stop, entry):
+        self.bar = bar
+        self.price = price
+        self.size = size
+        self.side = side
+        self.volume = volume
+        self.atr = atr
+        self.stop = stop
+        self.entry = entry
+
+    def __len__(self):
+        return len(self.bar)
+
+    @property
+    def notional(self) -> np.ndarray:
+        return self.price * self.size
+
+    @classmethod
+    def from_engine(cls, engine: BacktestEngine) -> "Fills":
+        """
+        Fills of a completed run. Exits take their size and side from
+        the entry before them.
+        """
+        return cls._from_log(engine.trades, engine.data, engine.atr_period)
+
+    @classmethod
+    def _from_log(cls, log: TradeLog, data: pd.DataFrame, atr_period: int) -> "Fills":
+        rows = log.mask(*ENTRY_TYPES, *EXIT_TYPES)
+        types = log.types[rows]
+        entries = np.isin(types, [int(t) for t in ENTRY_TYPES])
+
+        # Index of the entry each exit closes (each row, for entries)
+        entry_of = np.maximum.accumulate(np.where(entries, np.arange(len(types)), 0))
+        entry_side = np.where(types == TradeType.BUY, 1, -1)[entry_of]
+        side = np.where(entries, entry_side, -entry_side)
+        size = log.column("size")[rows][entry_of]
+
+        dates = data["date"].to_numpy().astype("datetime64[ns]").view("i8")
+        bar = np.searchsorted(dates, log.dates[rows])
+        close = data["close"].to_numpy(dtype=np.float64)
+
+        if "volume" in data:
+            volume = data["volume"].to_numpy(dtype=np.float64)[bar]
+        else:
+            volume = np.full(len(bar), np.nan)
+
+        return cls(
+            bar=bar,
+            price=close[bar],
+            size=size,
+            side=side,
+            volume=volume,
+            atr=indicator_cache.atr(data, atr_period)[bar],
+            stop=types == TradeType.STOP,
+            entry=entry_of,
+        )
+
+
+class CostModel(ABC):
+    """
+    Cost of each fill in money, computed over all fills at once.
+
+    kind is "fee" for charges paid on top of the trade, or "slippage"
+    for costs that worsen the fill price. Models add up with +.
+    """
+
+    kind = "fee"
+
+    @abstractmethod
+    def cost(self, fills: Fills) -> np.ndarray:
+        """
+        Cost of each fill.
+        """
+
+    def split(self, fills: Fills) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (fees, slippage) per fill.
+        """
+        cost = self.cost(fills)
+        zero = np.zeros(len(fills))
+        return (cost, zero) if self.kind == "fee" else (zero, cost)
+
+    def __add__(self, other: "CostModel") -> "CompositeCost":
+        return CompositeCost([self, other])
+
+
+class CompositeCost(CostModel):
+    """
+    Sum of several models, keeping fees and slippage apart.
+    """
+
+    def __init__(self, models: Sequence[CostModel]):
+        self.models: List[CostModel] = []
+        for model in models:
+            if isinstance(model, CompositeCost):
+                self.models.extend(model.models)
+            else:
+                self.models.append(model)
+
+    def cost(self, fills: Fills) -> np.ndarray:
+        fees, slippage = self.split(fills)
+        return fees + slippage
+
+    def split(self, fills: Fills) -> Tuple[np.ndarray, np.ndarray]:
+        fees = np.zeros(len(fills))
+        slippage = np.zeros(len(fills))
+        for model in self.models:
+            f, s = model.split(fills)
+            fees += f
+            slippage += s
+        return fees, slippage
+
+
+class FixedFee(CostModel):
+    """
+    Flat charge per fill, like BacktestEngine's transaction_cost.
+    """
+
+    def __init__(self, per_fill: float):
+        self.per_fill = per_fill
+
+    def cost(self, fills: Fills) -> np.ndarray:
+        return np.full(len(fills), float(self.per_fill))
+
+
+class PercentageFee(CostModel):
+    """
+    Fraction of turnover, optionally different for buys and sells.
+    """
+
+    def __init__(self, buy_rate: float = 0.0, sell_rate: Optional[float] = None):
+        self.buy_rate = buy_rate
+        self.sell_rate = buy_rate if sell_rate is None else sell_rate
+
+    def cost(self, fills: Fills) -> np.ndarray:
+        rate = np.where(fills.side > 0, self.buy_rate, self.sell_rate)
+        return fills.notional * rate
+
+
+class TieredBrokerage(CostModel):
+    """
+    Brokerage at a rate that depends on the fill's notional, clipped to
+    [minimum, maximum] per fill. tiers is [(from_notional, rate), ...]
+    in increasing order, the first starting at 0; e.g. the discount
+    broker "0.03% or Rs 20, whichever is lower" is
+    TieredBrokerage([(0, 0.0003)], maximum=20).
+    """
+
+    def __init__(
+        self,
+        tiers: Sequence[Tuple[float, float]],
+        minimum: float = 0.0,
+        maximum: float = np.inf,
+    ):
+        if not tiers or tiers[0][0] != 0:
+            raise ValueError("tiers must start at notional 0")
+        self.bounds = np.array([t[0] for t in tiers], dtype=np.float64)
+        self.rates = np.array([t[1] for t in tiers], dtype=np.float64)
+        if np.any(np.diff(self.bounds) <= 0):
+            raise ValueError("tier bounds must be increasing")
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def cost(self, fills: Fills) -> np.ndarray:
+        notional = fills.notional
+        tier = np.searchsorted(self.bounds, notional, side="right") - 1
+        return np.clip(notional * self.rates[tier], self.minimum, self.maximum)
+
+
+class NSECharges(CostModel):
+    """
+    Exchange and statutory charges on NSE trades: STT, exchange
+    transaction charges, SEBI turnover fees, stamp duty on buys and
+    GST on exchange + SEBI charges plus brokerage. segment is one of
+    NSE_RATES ("delivery", "intraday", "futures"); brokerage is
+    another model whose fees are included and taxed.
+    """
+
+    def __init__(self, segment: str = "delivery", brokerage: Optional[CostModel] = None):
+        if segment not in NSE_RATES:
+            raise ValueError(f"segment must be one of {sorted(NSE_RATES)}")
+        self.segment = segment
+        self.rates = NSE_RATES[segment]
+        self.brokerage = brokerage
+
+    def cost(self, fills: Fills) -> np.ndarray:
+        r = self.rates
+        notional = fills.notional
+        buy = fills.side > 0
+
+        stt = notional * np.where(buy, r["stt_buy"], r["stt_sell"])
+        stamp = notional * np.where(buy, r["stamp_buy"], 0.0)
+        exchange = notional * r["exchange"]
+        sebi = notional * r["sebi"]
+        brokerage = (
+            self.brokerage.cost(fills) if self.brokerage is not None else 0.0
+        )
+
+        gst = GST_RATE * (brokerage + exchange + sebi)
+        return stt + stamp + exchange + sebi + brokerage + gst
+
+
+class FixedSlippage(CostModel):
+    """
+    A fixed number of points per unit, like BacktestEngine's slippage.
+    stops=False leaves stop exits unslipped, as the engine does.
+    """
+
+    kind = "slippage"
+
+    def __init__(self, points: float, stops: bool = True):
+        self.points = points
+        self.stops = stops
+
+    def cost(self, fills: Fills) -> np.ndarray:
+        cost = self.points * fills.size
+        return cost if self.stops else np.where(fills.stop, 0.0, cost)
+
+
+class ATRSlippage(CostModel):
+    """
+    multiple x ATR per unit, so slippage widens with volatility.
+    """
+
+    kind = "slippage"
+
+    def __init__(self, multiple: float = 0.05, stops: bool = True):
+        self.multiple = multiple
+        self.stops = stops
+
+    def cost(self, fills: Fills) -> np.ndarray:
+        cost = self.multiple * np.nan_to_num(fills.atr) * fills.size
+        return cost if self.stops else np.where(fills.stop, 0.0, cost)
+
+
+class VolumeImpact(CostModel):
+    """
+    Square-root market impact: per unit, coefficient x ATR x
+    (size / bar volume) ** exponent, with the participation capped at
+    max_participation. Fills on bars without a volume figure cost
+    nothing.
+    """
+
+    kind = "slippage"
+
+    def __init__(
+        self,
+        coefficient: float = 0.1,
+        exponent: float = 0.5,
+        max_participation: float = 1.0,
+    ):
+        self.coefficient = coefficient
+        self.exponent = exponent
+        self.max_participation = max_participation
+
+    def cost(self, fills: Fills) -> np.ndarray:
+        volume = fills.volume
+        with np.errstate(divide="ignore", invalid="ignore"):
+            participation = np.where(volume > 0, fills.size / volume, 0.0)
+        participation = np.minimum(participation, self.max_participation)
+        impact = self.coefficient * fills.atr * participation**self.exponent
+        return np.nan_to_num(impact * fills.size)
+
+
+def engine_costs(transaction_cost: float, slippage: float) -> CompositeCost:
+    """
+    The flat costs BacktestEngine applies itself.
+    """
+    return FixedFee(transaction_cost) + FixedSlippage(slippage, stops=False)
+
+
+def reprice(
+    engine: BacktestEngine,
+    model: CostModel,
+    fills: Optional[Fills] = None,
+) -> Tuple[TradeLog, np.ndarray]:
+    """
+    The completed run's trades and bar equity under another cost model,
+    without re-running it.
+
+    Every fill keeps its bar and size; its price becomes the close
+    worsened by the model's slippage per unit, and its fees are charged
+    to cash as the engine charges transaction_cost. Sizes were chosen
+    under the original costs, so this answers "what would these fills
+    have cost", not "what would the strategy have done". Repricing
+    with engine_costs(engine.transaction_cost, engine.slippage)
+    reproduces the engine's own results.
+
+    Pass precomputed fills to reprice one run under many models.
+    """
+    log = engine.trades
+    fills = fills if fills is not None else Fills.from_engine(engine)
+    fees, slippage = model.split(fills)
+
+    # Trade log: slippage into the price, fees into cash
+    price = fills.price + fills.side * slippage / fills.size
+    entries = fills.entry == np.arange(len(fills))
+    pnl = np.where(
+        entries,
+        np.nan,
+        -fills.side * (price - price[fills.entry]) * fills.size - fees,
+    )
+    delta = np.where(entries, -fees, pnl)
+
+    rows = np.flatnonzero(log.mask(*ENTRY_TYPES, *EXIT_TYPES))
+    change = np.zeros(len(log))
+    change[rows] = delta
+    cash = engine.initial_capital + np.cumsum(change)
+
+    floats = {col: log.column(col).copy() for col in ("price", "size", "stop", "pnl")}
+    floats["price"][rows] = price
+    floats["pnl"][rows] = pnl
+    repriced = TradeLog.from_arrays(log.dates.copy(), log.types.copy(), cash=cash, **floats)
+
+    # Bar equity: close-to-close PnL of the held units less fill costs
+    n = engine.bars_processed
+    close = engine.data["close"].to_numpy(dtype=np.float64)[:n]
+    units = engine.position_series()[:n]
+    costs = np.zeros(n)
+    np.add.at(costs, fills.bar, fees + slippage)
+
+    pnl_bar = np.zeros(n)
+    pnl_bar[1:] = units[:-1] * np.diff(close)
+    equity = engine.initial_capital + np.cumsum(pnl_bar - costs)
+
+    if n < len(engine.data):
+        last = equity[-1] if n else engine.initial_capital
+        equity = np.concatenate([equity, np.full(len(engine.data) - n, last)])
+
+    return repriced, equity
+
+
+def reprice_many(engine: BacktestEngine, models: Dict[str, CostModel]) -> pd.DataFrame:
+    """
+    Final equity, costs and drawdown of one run under each named model.
+    """
+    fills = Fills.from_engine(engine)
+    rows = []
+    for name, model in models.items():
+        fees, slippage = model.split(fills)
+        _, equity = reprice(engine, model, fills)
+        rows.append(
+            {
+                "model": name,
+                "final_equity": equity[-1],
+                "fees": fees.sum(),
+                "slippage": slippage.sum(),
+                "max_drawdown": compute_max_drawdown(equity),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+COST_MODELS = {
+    "fixed_fee": FixedFee,
+    "percentage_fee": PercentageFee,
+    "tiered_brokerage": TieredBrokerage,
+    "nse_charges": NSECharges,
+    "fixed_slippage": FixedSlippage,
+    "atr_slippage": ATRSlippage,
+    "volume_impact": VolumeImpact,
+}
+
+
+def make_cost_model(specs: List[Dict]) -> CompositeCost:
+    """
+    A composite model from config entries such as
+    [{"type": "nse_charges", "segment": "futures",
+      "brokerage": {"type": "tiered_brokerage", "tiers": [[0, 0.0003]], "maximum": 20}},
+     {"type": "atr_slippage", "multiple": 0.05}].
+    """
+    models = []
+    for spec in specs:
+        spec = dict(spec)
+        kind = spec.pop("type")
+        if kind not in COST_MODELS:
+            raise ValueError(f"Unknown cost model {kind}; expected one of {sorted(COST_MODELS)}")
+        if isinstance(spec.get("brokerage"), dict):
+            spec["brokerage"] = make_cost_model([spec["brokerage"]])
+        models.append(COST_MODELS[kind](**spec))
+    return CompositeCost(models)
@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import Dict, Optional
 
-from engine.strategy import Strategy
-from engine.indicators import compute_atr
+from engine.strategy import Bar, Strategy, StreamingStrategy, iter_bars
+from engine.indicators import compute_atr, RollingATR, indicator_cache
+from backtest.trade_log import TradeLog, TradeType
+from backtest.profiling import Profiler
 
 
 class BacktestEngine:
@@ -21,6 +24,7 @@ class BacktestEngine:
         atr_multiplier: float = 2.0,
         transaction_cost: float = 0.0,
         slippage: float = 0.0,
+        profiler: Optional[Profiler] = None,
     ):
         self.data = data
         self.strategy = strategy
@@ -31,6 +35,7 @@ class BacktestEngine:
         self.atr_multiplier = atr_multiplier
         self.transaction_cost = transaction_cost
         self.slippage = slippage
+        self.profiler = profiler
 
         self.position = 0
         self.entry_price = None
@@ -39,114 +44,334 @@ class BacktestEngine:
 
         self.cash = initial_capital
         self.equity_peak = initial_capital
-        self.trades: List[Dict] = []
+        self.halted = False
+        self.trades = TradeLog()
 
-    def _current_drawdown(self):
-        return (self.cash - self.equity_peak) / self.equity_peak
+        # End-of-bar state, one row per processed bar
+        self.bars_processed = 0
+        capacity = max(1, len(data))
+        self._bar_close = np.empty(capacity)
+        self._bar_cash = np.empty(capacity)
+        self._bar_size = np.empty(capacity)
+        self._bar_entry = np.empty(capacity)
+
+    def _mark_to_market(self, price: float) -> float:
+        """
+        Cash plus open profit on the position at price.
+        """
+        if self.position == 0:
+            return self.cash
+        return self.cash + self.position * (price - self.entry_price) * self.position_size
+
+    def _current_drawdown(self, equity: float):
+        return (equity - self.equity_peak) / self.equity_peak
+
+    def _record_bar(self, price: float) -> None:
+        i = self.bars_processed
+        if i == len(self._bar_close):
+            capacity = 2 * i
+            self._bar_close = np.resize(self._bar_close, capacity)
+            self._bar_cash = np.resize(self._bar_cash, capacity)
+            self._bar_size = np.resize(self._bar_size, capacity)
+            self._bar_entry = np.resize(self._bar_entry, capacity)
+
+        self._bar_close[i] = price
+        self._bar_cash[i] = self.cash
+        if self.position == 0:
+            self._bar_size[i] = 0.0
+            self._bar_entry[i] = 0.0
+        else:
+            # Signed units, so equity is cash + size * (close - entry) either way
+            self._bar_size[i] = self.position * self.position_size
+            self._bar_entry[i] = self.entry_price
+        self.bars_processed = i + 1
+
+    def equity_series(self) -> np.ndarray:
+        """
+        Mark-to-market equity at the close of every bar of the data,
+        computed in one pass from the recorded cash, position and price
+        arrays. After a halt, equity is held at its value on the halt bar.
+        """
+        n = self.bars_processed
+        equity = self._bar_cash[:n] + self._bar_size[:n] * (
+            self._bar_close[:n] - self._bar_entry[:n]
+        )
+
+        if n < len(self.data):
+            last = equity[-1] if n else self.initial_capital
+            equity = np.concatenate([equity, np.full(len(self.data) - n, last)])
+
+        return equity
+
+    def position_series(self) -> np.ndarray:
+        """
+        Units held at the close of every bar of the data (zero when
+        flat, negative when short), aligned with equity_series.
+        """
+        n = self.bars_processed
+        size = self._bar_size[:n].copy()
+
+        if n < len(self.data):
+            last = size[-1] if n else 0.0
+            size = np.concatenate([size, np.full(len(self.data) - n, last)])
+
+        return size
+
+    def equity_curve(self) -> pd.DataFrame:
+        """
+        Daily equity curve with columns: date, equity
+        """
+        return pd.DataFrame(
+            {
+                "date": self.data["date"].to_numpy(),
+                "equity": self.equity_series(),
+            }
+        )
 
     def run(self):
+        """
+        Replay the data bar by bar.
+        Streaming strategies are fed one bar at a time (O(1) per bar);
+        others get the growing history window on every bar.
+        """
+        if self.profiler is not None:
+            with self.profiler.session(self):
+                return self._run()
+        return self._run()
+
+    def _run(self):
+        if isinstance(self.strategy, StreamingStrategy):
+            return self._run_streaming()
+
         for i in range(len(self.data)):
-            window = self.data.iloc[: i + 1]
+            window = self._window(i)
             signal = self.strategy.generate_signal(window)
 
             price = window.iloc[-1]["close"]
             date = window.iloc[-1]["date"]
 
-            # Update equity peak
-            self.equity_peak = max(self.equity_peak, self.cash)
-
-            # Kill switch
-            if self._current_drawdown() <= -self.max_drawdown:
-                self.trades.append(
-                    {
-                        "date": date,
-                        "type": "HALT",
-                        "reason": "Max drawdown breached",
-                        "cash": self.cash,
-                    }
-                )
+            # ATR over the window is only needed when sizing an entry
+            atr = (
+                self._window_atr(window)
+                if self._needs_atr(signal.direction)
+                else np.nan
+            )
+
+            if not self._process_bar(date, price, signal.direction, atr):
+                break
+
+        return self.trades
+
+    def _window(self, i: int) -> pd.DataFrame:
+        return self.data.iloc[: i + 1]
+
+    def _window_atr(self, window: pd.DataFrame) -> float:
+        return compute_atr(window, period=self.atr_period)
+
+    def _new_atr_tracker(self) -> RollingATR:
+        return RollingATR(self.atr_period)
+
+    def _run_streaming(self):
+        self.start_stream()
+
+        for bar in iter_bars(self.data):
+            if not self.step(bar):
                 break
 
-            # Exit on stop-loss
-            if self.position == 1 and price <= self.stop_price:
-                pnl = (
-                    (price - self.entry_price)
-                    * self.position_size
-                    - self.transaction_cost
-                )
-                self.cash += pnl
-
-                self.trades.append(
-                    {
-                        "date": date,
-                        "type": "STOP",
-                        "price": price,
-                        "pnl": pnl,
-                        "cash": self.cash,
-                    }
-                )
-
-                self.position = 0
-                self.entry_price = None
-                self.stop_price = None
-                self.position_size = 0.0
-                continue
-
-            # Entry
-            if self.position == 0 and signal.direction == 1:
-                atr = compute_atr(window, period=self.atr_period)
-
-                if pd.isna(atr) or atr <= 0:
-                    continue
-
-                stop_distance = self.atr_multiplier * atr
-                risk_amount = self.cash * self.risk_per_trade
-                position_size = risk_amount / stop_distance
-
-                execution_price = price + self.slippage
-                stop_price = execution_price - stop_distance
-
-                self.position = 1
-                self.entry_price = execution_price
-                self.stop_price = stop_price
-                self.position_size = position_size
-                self.cash -= self.transaction_cost
-
-                self.trades.append(
-                    {
-                        "date": date,
-                        "type": "BUY",
-                        "price": execution_price,
-                        "size": position_size,
-                        "stop": stop_price,
-                        "cash": self.cash,
-                    }
-                )
-
-            # Exit on regime break
-            elif self.position == 1 and signal.direction == 0:
-                execution_price = price - self.slippage
-                pnl = (
-                    (execution_price - self.entry_price)
-                    * self.position_size
-                    - self.transaction_cost
-                )
-
-                self.cash += pnl
-
-                self.trades.append(
-                    {
-                        "date": date,
-                        "type": "SELL",
-                        "price": execution_price,
-                        "pnl": pnl,
-                        "cash": self.cash,
-                    }
-                )
-
-                self.position = 0
-                self.entry_price = None
-                self.stop_price = None
-                self.position_size = 0.0
+        return self.trades
+
+    def start_stream(self) -> None:
+        """
+        Reset the strategy's rolling state before feeding bars to step().
+        """
+        self.strategy.reset()
+        self._stream_atr = self._new_atr_tracker()
+
+    def step(self, bar: Bar) -> bool:
+        """
+        Process one more bar for a streaming strategy in O(1).
+        Returns False once the kill switch has halted the engine.
+        """
+        if self.halted:
+            return False
+
+        signal = self.strategy.on_bar(bar)
+        atr = self._stream_atr
+        atr.update(bar.high, bar.low, bar.close)
+
+        return self._process_bar(bar.date, bar.close, signal.direction, atr.value)
+
+    def get_state(self) -> Dict:
+        """
+        Everything step() needs to carry on from the last processed bar:
+        position and risk state, the trade log, the recorded end-of-bar
+        arrays and the streaming ATR and strategy state.
+        """
+        n = self.bars_processed
+        return {
+            "position": self.position,
+            "entry_price": self.entry_price,
+            "stop_price": self.stop_price,
+            "position_size": self.position_size,
+            "cash": self.cash,
+            "equity_peak": self.equity_peak,
+            "halted": self.halted,
+            "trades": self.trades,
+            "bar_close": self._bar_close[:n].copy(),
+            "bar_cash": self._bar_cash[:n].copy(),
+            "bar_size": self._bar_size[:n].copy(),
+            "bar_entry": self._bar_entry[:n].copy(),
+            "stream_atr": self._stream_atr,
+            "strategy": self.strategy.get_state(),
+        }
+
+    def set_state(self, state: Dict) -> None:
+        """
+        Restore a get_state() snapshot; follow with step() for new bars.
+        """
+        self.position = state["position"]
+        self.entry_price = state["entry_price"]
+        self.stop_price = state["stop_price"]
+        self.position_size = state["position_size"]
+        self.cash = state["cash"]
+        self.equity_peak = state["equity_peak"]
+        self.halted = state["halted"]
+        self.trades = state["trades"]
+
+        n = len(state["bar_close"])
+        capacity = max(1, n, len(self.data))
+        for name in ("close", "cash", "size", "entry"):
+            values = np.empty(capacity)
+            values[:n] = state[f"bar_{name}"]
+            setattr(self, f"_bar_{name}", values)
+        self.bars_processed = n
+
+        self._stream_atr = state["stream_atr"]
+        self.strategy.set_state(state["strategy"])
+
+    def run_vectorized(
+        self,
+        signals: Optional[np.ndarray] = None,
+        atr: Optional[np.ndarray] = None,
+    ):
+        """
+        Simulate from precomputed per-bar arrays.
+
+        signals holds the direction for every bar and atr the ATR series;
+        both default to the strategy's generate_signals and the shared
+        indicator cache. Produces the same trades as run().
+        """
+        if self.profiler is not None:
+            with self.profiler.session(self):
+                return self._run_vectorized(signals, atr)
+        return self._run_vectorized(signals, atr)
+
+    def _run_vectorized(self, signals, atr):
+        if signals is None:
+            signals = self.strategy.generate_signals(self.data)
+        if atr is None:
+            atr = self._atr_series()
+
+        if len(signals) != len(self.data) or len(atr) != len(self.data):
+            raise ValueError("signals and atr must have one value per bar")
+
+        dates = self.data["date"].tolist()
+        closes = self.data["close"].tolist()
+        directions = np.asarray(signals, dtype=np.int64).tolist()
+        atrs = np.asarray(atr, dtype=np.float64).tolist()
+
+        for date, price, direction, bar_atr in zip(dates, closes, directions, atrs):
+            if not self._process_bar(date, price, direction, bar_atr):
+                break
 
         return self.trades
+
+    def _atr_series(self) -> np.ndarray:
+        return indicator_cache.atr(self.data, self.atr_period)
+
+    def _needs_atr(self, direction: int) -> bool:
+        # Entering from flat, or reversing into the opposite side
+        return direction != 0 and direction != self.position
+
+    def _process_bar(self, date, price, direction: int, atr: float) -> bool:
+        """
+        Apply risk checks, exits and entries for one bar, then record
+        the end-of-bar state. atr is only read when an entry needs sizing.
+        Returns False once the kill switch halts the run.
+        """
+        running = self._apply_bar(date, price, direction, atr)
+        self._record_bar(price)
+        return running
+
+    def _apply_bar(self, date, price, direction: int, atr: float) -> bool:
+        # Update equity peak, marking any open position to market
+        equity = self._mark_to_market(price)
+        self.equity_peak = max(self.equity_peak, equity)
+
+        # Kill switch
+        if self._current_drawdown(equity) <= -self.max_drawdown:
+            self.trades.append(date, TradeType.HALT, cash=self.cash)
+            self.halted = True
+            return False
+
+        # Exit on stop-loss: below it when long, above it when short
+        if self.position != 0 and self.position * (price - self.stop_price) <= 0:
+            self._close_position(date, price, TradeType.STOP)
+            return True
+
+        # Exit on regime break, or on a reversal before the new entry
+        if self.position != 0 and direction != self.position:
+            execution_price = price - self.slippage * self.position
+            exit_type = TradeType.SELL if self.position == 1 else TradeType.COVER
+            self._close_position(date, execution_price, exit_type)
+
+        # Entry
+        if self.position == 0 and direction != 0:
+            if pd.isna(atr) or atr <= 0:
+                return True
+
+            stop_distance = self.atr_multiplier * atr
+            risk_amount = self.cash * self.risk_per_trade
+            position_size = risk_amount / stop_distance
+
+            execution_price = price + self.slippage * direction
+            stop_price = execution_price - stop_distance * direction
+
+            self.position = direction
+            self.entry_price = execution_price
+            self.stop_price = stop_price
+            self.position_size = position_size
+            self.cash -= self.transaction_cost
+
+            self.trades.append(
+                date,
+                TradeType.BUY if direction == 1 else TradeType.SHORT,
+                price=execution_price,
+                size=position_size,
+                stop=stop_price,
+                cash=self.cash,
+            )
+
+        return True
+
+    def _close_position(self, date, execution_price: float, exit_type: TradeType) -> None:
+        pnl = (
+            self.position
+            * (execution_price - self.entry_price)
+            * self.position_size
+            - self.transaction_cost
+        )
+        self.cash += pnl
+
+        self.trades.append(
+            date,
+            exit_type,
+            price=execution_price,
+            pnl=pnl,
+            cash=self.cash,
+        )
+
+        self.position = 0
+        self.entry_price = None
+        self.stop_price = None
+        self.position_size = 0.0
@@ -0,0 +1,423 @@
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest.trade_log import TradeLog, TradeType
+from engine.indicators import RollingATR
+from engine.strategy import StreamingStrategy, iter_bars
+
+
+# Event kinds, in the order they are handled at equal timestamps
+TIMER, BAR, STOP, FILL, CLOSE, ORDER = range(6)
+EVENT_NAMES = ("TIMER", "BAR", "STOP", "FILL", "CLOSE", "ORDER")
+
+# Order types
+MARKET, LIMIT, STOP_ORDER = range(3)
+ORDER_TYPES = {"market": MARKET, "limit": LIMIT, "stop": STOP_ORDER}
+
+BUY_SIDE, SELL_SIDE = 1, -1
+
+
+class Order:
+    """
+    An order from a sleeve. Market orders fill at the close of the bar
+    they are placed on; limit and stop orders rest from the next bar
+    until filled or cancelled.
+
+    Entries (exit_type None) are sized when they fill, from the cash at
+    that moment and stop_distance; exits close the whole position.
+    """
+
+    __slots__ = ("side", "type", "price", "stop_distance", "exit_type")
+
+    def __init__(self, side, type, price, stop_distance=0.0, exit_type=None):
+        self.side = side
+        self.type = type
+        self.price = price
+        self.stop_distance = stop_distance
+        self.exit_type = exit_type
+
+
+class Feed:
+    """
+    One instrument at one frequency. Bars become events at their date
+    plus delay, e.g. a daily bar labelled at midnight with a delay of
+    15:30 is seen after that session's intraday bars.
+    """
+
+    def __init__(self, name: str, data: pd.DataFrame, delay: Optional[pd.Timedelta] = None):
+        self.name = name
+        self.bars = list(iter_bars(data))
+        times = data["date"].to_numpy().astype("datetime64[ns]").view("i8")
+        if delay is not None:
+            times = times + pd.Timedelta(delay).value
+        self.times = times.tolist()
+        self.sleeves: List["EventSleeve"] = []
+
+
+class EventSleeve:
+    """
+    A streaming strategy with the same ATR risk management as
+    BacktestEngine, driven by events.
+
+    Goes long on direction 1 and short on -1, reversing on a flip.
+    entry chooses the entry order: "market" (fill at the signal bar's
+    close plus slippage), "limit" (entry_offset ATRs better than the
+    close: below it for a buy, above for a short) or "stop"
+    (entry_offset ATRs worse, i.e. on a breakout). With intrabar_stops
+    the protective stop triggers as soon as a bar's range reaches it
+    (the low for a long, the high for a short), filling at the stop or
+    the open if it gapped through; otherwise it is checked against the
+    close as in BacktestEngine.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        strategy: StreamingStrategy,
+        initial_capital: float,
+        risk_per_trade: float,
+        max_drawdown: float,
+        atr_period: int = 14,
+        atr_multiplier: float = 2.0,
+        transaction_cost: float = 0.0,
+        slippage: float = 0.0,
+        entry: str = "market",
+        entry_offset: float = 0.0,
+        intrabar_stops: bool = True,
+    ):
+        if entry not in ORDER_TYPES:
+            raise ValueError(f"entry must be one of {sorted(ORDER_TYPES)}")
+
+        self.name = name
+        self.strategy = strategy
+        self.initial_capital = initial_capital
+        self.risk_per_trade = risk_per_trade
+        self.max_drawdown = max_drawdown
+        self.atr_multiplier = atr_multiplier
+        self.transaction_cost = transaction_cost
+        self.slippage = slippage
+        self.entry_type = ORDER_TYPES[entry]
+        self.entry_offset = entry_offset
+        self.intrabar_stops = intrabar_stops
+
+        self.strategy.reset()
+        self.atr = RollingATR(atr_period)
+
+        self.position = 0
+        self.entry_price = None
+        self.stop_price = None
+        self.position_size = 0.0
+        self.cash = initial_capital
+        self.equity_peak = initial_capital
+        self.halted = False
+        self.pending: Optional[Order] = None
+        self.trades = TradeLog()
+
+        # End-of-bar state: close, cash, size, entry per processed bar.
+        # _open is True between a bar's open and its recorded close.
+        self._bars: List[tuple] = []
+        self._bar_date = None
+        self._open = False
+
+        # Set by EventEngine.add_sleeve
+        self.feed: Optional[Feed] = None
+
+    def _record(self, price: float) -> None:
+        self._bars.append(
+            (
+                price,
+                self.cash,
+                self.position * self.position_size,
+                self.entry_price if self.position else 0.0,
+            )
+        )
+        self._open = False
+
+    def equity_series(self) -> np.ndarray:
+        """
+        Mark-to-market equity at the close of every processed bar.
+        After a halt, equity is held at its value on the halt bar
+        through the rest of the feed, as in BacktestEngine.
+        """
+        if self._bars:
+            close, cash, size, entry = np.array(self._bars).T
+            equity = cash + size * (close - entry)
+        else:
+            equity = np.empty(0)
+
+        if self.halted and self.feed is not None and len(equity) < len(self.feed.bars):
+            last = equity[-1] if len(equity) else self.initial_capital
+            equity = np.concatenate([equity, np.full(len(self.feed.bars) - len(equity), last)])
+
+        return equity
+
+    def on_bar_open(self, engine: "EventEngine", feed: Feed, i: int) -> bool:
+        """
+        Match the resting entry order and the protective stop against
+        the new bar's range. Returns True if an event was queued.
+        """
+        if self.halted:
+            return False
+
+        date, open_, high, low, _, _ = feed.bars[i]
+        self._bar_date = date
+        self._open = True
+
+        if self.position:
+            if not self.intrabar_stops:
+                return False
+            stop = self.stop_price
+            if self.position == 1 and low <= stop:
+                engine.push(STOP, self, min(open_, stop))
+                return True
+            if self.position == -1 and high >= stop:
+                engine.push(STOP, self, max(open_, stop))
+                return True
+            return False
+
+        order = self.pending
+        if order is None:
+            return False
+
+        # Limits fill at their price or better, stops at theirs or worse
+        price = order.price
+        buy = order.side == BUY_SIDE
+        if order.type == LIMIT:
+            if buy and low <= price:
+                fill = min(open_, price)
+            elif not buy and high >= price:
+                fill = max(open_, price)
+            else:
+                return False
+        else:
+            if buy and high >= price:
+                fill = max(open_, price)
+            elif not buy and low <= price:
+                fill = min(open_, price)
+            else:
+                return False
+            fill += self.slippage * order.side
+
+        self.pending = None
+        engine.push(FILL, self, (order, fill))
+        return True
+
+    def on_stop(self, engine: "EventEngine", trigger: float) -> None:
+        order = Order(-self.position, STOP_ORDER, trigger, exit_type=TradeType.STOP)
+        engine.push(FILL, self, (order, trigger + self.slippage * order.side))
+
+    def on_close(self, engine: "EventEngine", feed: Feed, i: int) -> None:
+        if self.halted:
+            return
+
+        bar = feed.bars[i]
+        price = bar.close
+        self._bar_date = bar.date
+
+        signal = self.strategy.on_bar(bar)
+        atr = self.atr.update(bar.high, bar.low, price)
+        direction = signal.direction
+        position = self.position
+
+        # Equity peak and kill switch on mark-to-market equity
+        equity = self.cash
+        if position:
+            equity += position * (price - self.entry_price) * self.position_size
+        self.equity_peak = max(self.equity_peak, equity)
+
+        if (equity - self.equity_peak) / self.equity_peak <= -self.max_drawdown:
+            self.trades.append(bar.date, TradeType.HALT, cash=self.cash)
+            self.halted = True
+            self.pending = None
+            self._record(price)
+            return
+
+        if position:
+            if not self.intrabar_stops and position * (price - self.stop_price) <= 0:
+                # Close-checked stop, as in BacktestEngine: no slippage
+                order = Order(-position, MARKET, price, exit_type=TradeType.STOP)
+                engine.push(FILL, self, (order, price))
+                self._record(price)
+                return
+            if direction != position:
+                exit_type = TradeType.SELL if position == 1 else TradeType.COVER
+                engine.push(ORDER, self, Order(-position, MARKET, price, exit_type=exit_type))
+
+        if self.pending is not None and self.pending.side != direction:
+            # Signal gone or flipped before the entry filled
+            self.pending = None
+
+        if direction != 0 and direction != position and self.pending is None:
+            if atr == atr and atr > 0:
+                offset = self.entry_offset * atr * direction
+                limit = {MARKET: price, LIMIT: price - offset, STOP_ORDER: price + offset}
+                order = Order(
+                    direction,
+                    self.entry_type,
+                    limit[self.entry_type],
+                    stop_distance=self.atr_multiplier * atr,
+                )
+                engine.push(ORDER, self, order)
+
+        self._record(price)
+
+    def on_order(self, engine: "EventEngine", order: Order) -> None:
+        if order.type == MARKET:
+            price = order.price + self.slippage * order.side
+            engine.push(FILL, self, (order, price))
+        else:
+            self.pending = order
+
+    def on_fill(self, engine: "EventEngine", fill) -> None:
+        order, price = fill
+        date = self._bar_date
+
+        if order.exit_type is None:
+            side = order.side
+            size = self.cash * self.risk_per_trade / order.stop_distance
+            self.position = side
+            self.entry_price = price
+            self.stop_price = price - side * order.stop_distance
+            self.position_size = size
+            self.cash -= self.transaction_cost
+            self.trades.append(
+                date,
+                TradeType.BUY if side == BUY_SIDE else TradeType.SHORT,
+                price=price,
+                size=size,
+                stop=self.stop_price,
+                cash=self.cash,
+            )
+        else:
+            pnl = (
+                self.position * (price - self.entry_price) * self.position_size
+                - self.transaction_cost
+            )
+            self.cash += pnl
+            self.trades.append(date, order.exit_type, price=price, pnl=pnl, cash=self.cash)
+            self.position = 0
+            self.entry_price = None
+            self.stop_price = None
+            self.position_size = 0.0
+
+        # Fills at the close arrive after the bar was recorded
+        if not self._open and self._bars:
+            close = self._bars[-1][0]
+            self._bars.pop()
+            self._record(close)
+
+
+class EventEngine:
+    """
+    Event-driven simulation over any number of feeds and sleeves.
+
+    Events are (time, kind, seq, target, payload) tuples on a heap, so
+    feeds of different frequencies interleave in time order and, at
+    equal times, timers run first, then bars, stop triggers, fills,
+    bar closes and new orders. Each feed keeps only its next bar on the
+    heap. Bars are read from pre-built tuples; nothing touches a
+    DataFrame per event.
+    """
+
+    def __init__(self):
+        self.feeds: Dict[str, Feed] = {}
+        self.now = 0
+        self.events_processed = 0
+        self.elapsed = 0.0
+        self._heap: list = []
+        self._seq = itertools.count()
+
+    def add_feed(self, name: str, data: pd.DataFrame, delay: Optional[pd.Timedelta] = None) -> Feed:
+        feed = Feed(name, data, delay)
+        self.feeds[name] = feed
+        return feed
+
+    def add_sleeve(self, sleeve: EventSleeve, feed: str) -> EventSleeve:
+        self.feeds[feed].sleeves.append(sleeve)
+        sleeve.feed = self.feeds[feed]
+        return sleeve
+
+    def push(self, kind: int, target, payload=None, at: Optional[int] = None) -> None:
+        """
+        Queue an event for target, at the current time unless at is given.
+        """
+        heapq.heappush(
+            self._heap,
+            (self.now if at is None else at, kind, next(self._seq), target, payload),
+        )
+
+    def schedule(self, at, callback: Callable[["EventEngine"], None]) -> None:
+        """
+        Call callback(engine) at time at (a timestamp or int nanoseconds).
+        """
+        if not isinstance(at, (int, np.integer)):
+            at = pd.Timestamp(at).value
+        self.push(TIMER, callback, at=at)
+
+    def _on_bar(self, feed: Feed, i: int) -> None:
+        queued = False
+        for sleeve in feed.sleeves:
+            queued |= sleeve.on_bar_open(self, feed, i)
+
+        # Without intrabar events nothing can come between open and close
+        if queued:
+            self.push(CLOSE, feed, i)
+        else:
+            self._on_close(feed, i)
+
+        if i + 1 < len(feed.times):
+            self.push(BAR, feed, i + 1, at=feed.times[i + 1])
+
+    def _on_close(self, feed: Feed, i: int) -> None:
+        for sleeve in feed.sleeves:
+            sleeve.on_close(self, feed, i)
+
+    def run(self, until=None) -> "EventEngine":
+        """
+        Process events in time order until the queue is empty (or past
+        until). Returns the engine; events_processed and elapsed give
+        the throughput.
+        """
+        for feed in self.feeds.values():
+            if feed.times:
+                self.push(BAR, feed, 0, at=feed.times[0])
+
+        stop_at = None if until is None else pd.Timestamp(until).value
+        heap = self._heap
+        pop = heapq.heappop
+        on_bar = self._on_bar
+        on_close = self._on_close
+        processed = 0
+        started = time.perf_counter()
+
+        while heap:
+            if stop_at is not None and heap[0][0] > stop_at:
+                break
+            now, kind, _, target, payload = pop(heap)
+            self.now = now
+            processed += 1
+
+            if kind == BAR:
+                on_bar(target, payload)
+            elif kind == FILL:
+                target.on_fill(self, payload)
+            elif kind == ORDER:
+                target.on_order(self, payload)
+            elif kind == STOP:
+                target.on_stop(self, payload)
+            elif kind == CLOSE:
+                on_close(target, payload)
+            else:
+                target(self)
+
+        self.elapsed += time.perf_counter() - started
+        self.events_processed += processed
+        return self
+
+    def events_per_sec(self) -> float:
+        return self.events_processed / self.elapsed if self.elapsed else 0.0
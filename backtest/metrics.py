@@ -1,18 +1,22 @@
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple, Union
+
+from backtest.trade_log import EXIT_TYPES, TradeLog, as_trade_log
 
 
 def compute_equity_curve(
-    trades: List[Dict],
+    trades: Union[TradeLog, List[Dict]],
     initial_capital: float,
 ) -> pd.DataFrame:
     """
     Build equity curve from executed trades.
     Handles the case of zero trades safely.
     """
+    log = as_trade_log(trades)
 
     # No trades → flat equity
-    if not trades:
+    if not len(log):
         return pd.DataFrame(
             {
                 "date": [None],
@@ -20,27 +24,136 @@ def compute_equity_curve(
             }
         )
 
-    equity = initial_capital
-    records = []
-
-    for trade in trades:
-        if trade["type"] == "SELL":
-            equity = trade["cash"]
-
-        records.append(
-            {
-                "date": trade.get("date"),
-                "equity": equity,
-            }
-        )
+    # Equity steps to the cash balance after each exit and holds in between.
+    # For bar-level mark-to-market equity use BacktestEngine.equity_curve.
+    exits = log.mask(*EXIT_TYPES)
+    last_exit = np.maximum.accumulate(np.where(exits, np.arange(len(log)), -1))
+    equity = np.where(
+        last_exit >= 0,
+        log.column("cash")[np.maximum(last_exit, 0)],
+        initial_capital,
+    )
 
-    return pd.DataFrame(records)
+    return pd.DataFrame(
+        {
+            "date": log.dates.view("datetime64[ns]"),
+            "equity": equity,
+        }
+    )
 
 
-def compute_max_drawdown(equity_curve: pd.Series) -> float:
+def compute_max_drawdown(equity_curve: Union[pd.Series, np.ndarray]) -> float:
     """
     Compute maximum drawdown from equity curve.
     """
-    cumulative_max = equity_curve.cummax()
-    drawdown = equity_curve - cumulative_max
+    equity = np.asarray(equity_curve, dtype=np.float64)
+    if equity.size == 0:
+        return np.nan
+
+    drawdown = equity - np.maximum.accumulate(equity)
     return drawdown.min()
+
+
+BARS_PER_YEAR = 252
+
+
+def drawdown_profile(equity: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For each row of a (runs, bars) equity array: drawdown from the
+    running peak as a negative fraction, and the number of bars since
+    that peak was set.
+    """
+    peak = np.maximum.accumulate(equity, axis=1)
+    drawdown = equity / peak - 1.0
+
+    bars = np.arange(equity.shape[1])
+    since_peak = np.where(equity >= peak, bars, 0)
+    np.maximum.accumulate(since_peak, axis=1, out=since_peak)
+    np.subtract(bars, since_peak, out=since_peak)
+
+    return drawdown, since_peak
+
+
+def _years(dates: np.ndarray) -> float:
+    span = dates[-1] - dates[0]
+    return span / np.timedelta64(1, "D") / 365.25
+
+
+def batch_metrics(
+    equity: np.ndarray,
+    dates,
+    position: Optional[np.ndarray] = None,
+    prices: Optional[np.ndarray] = None,
+    periods_per_year: int = BARS_PER_YEAR,
+) -> pd.DataFrame:
+    """
+    Performance metrics for many equity curves at once.
+
+    equity is (runs, bars), one curve per row on a shared date index
+    (a 1-D curve is treated as one run). position, the same shape,
+    holds the units held at each bar and enables exposure (share of
+    bars in the market); with prices, per bar or per run and bar, it
+    also gives turnover (traded value per year as a multiple of mean
+    equity).
+
+    Returns one row per run: cagr, sharpe, sortino, calmar,
+    max_drawdown (negative fraction), max_drawdown_bars (longest
+    stretch below a prior peak), exposure and turnover.
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=np.float64))
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    if equity.shape[1] != len(dates):
+        raise ValueError("equity must have one column per date")
+
+    years = _years(dates)
+    returns = equity[:, 1:] / equity[:, :-1] - 1.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cagr = (equity[:, -1] / equity[:, 0]) ** (1.0 / years) - 1.0
+
+        mean = returns.mean(axis=1)
+        std = returns.std(axis=1, ddof=1)
+        downside = np.sqrt((np.minimum(returns, 0.0) ** 2).mean(axis=1))
+        annualize = np.sqrt(periods_per_year)
+        sharpe = np.where(std > 0, mean / std * annualize, 0.0)
+        sortino = np.where(downside > 0, mean / downside * annualize, 0.0)
+
+        drawdown, since_peak = drawdown_profile(equity)
+        max_drawdown = drawdown.min(axis=1)
+        calmar = np.where(max_drawdown < 0, cagr / -max_drawdown, np.nan)
+
+    metrics = {
+        "cagr": cagr,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "calmar": calmar,
+        "max_drawdown": max_drawdown,
+        "max_drawdown_bars": since_peak.max(axis=1),
+    }
+
+    if position is not None:
+        position = np.atleast_2d(np.asarray(position, dtype=np.float64))
+        metrics["exposure"] = (position != 0).mean(axis=1)
+
+        if prices is not None:
+            traded = np.abs(np.diff(position, axis=1, prepend=0.0)) * prices
+            metrics["turnover"] = traded.sum(axis=1) / equity.mean(axis=1) / years
+
+    return pd.DataFrame(metrics)
+
+
+def batch_yearly_pnl(equity: np.ndarray, dates) -> pd.DataFrame:
+    """
+    Change in equity over each calendar year, one row per run and one
+    column per year. The first year is measured from the first bar.
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=np.float64))
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+
+    years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    year_end = np.flatnonzero(np.diff(years, append=years[-1] + 1))
+
+    closes = equity[:, year_end]
+    opens = np.concatenate([equity[:, :1], closes[:, :-1]], axis=1)
+
+    return pd.DataFrame(closes - opens, columns=years[year_end])
@@ -0,0 +1,194 @@
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from backtest.metrics import drawdown_profile
+from backtest.trade_log import EXIT_TYPES, TradeLog, as_trade_log
+
+
+PERCENTILES = (5, 25, 50, 75, 95, 99)
+METHODS = ("shuffle", "resample", "block")
+
+# Default number of path steps held in memory per chunk (32 MB per array)
+CHUNK_ELEMENTS = 4_000_000
+
+
+def trade_returns(trades: Union[TradeLog, List[Dict]]) -> np.ndarray:
+    """
+    Fractional return on capital of every exit (SELL, COVER, STOP), in order.
+    """
+    log = as_trade_log(trades)
+    exits = log.mask(*EXIT_TYPES)
+
+    pnl = log.column("pnl")[exits]
+    cash_after = log.column("cash")[exits]
+    return pnl / (cash_after - pnl)
+
+
+def bar_returns(equity: np.ndarray) -> np.ndarray:
+    """
+    Bar-over-bar returns of an equity series such as
+    BacktestEngine.equity_series().
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    return equity[1:] / equity[:-1] - 1.0
+
+
+def _sample_returns(
+    rng: np.random.Generator,
+    returns: np.ndarray,
+    n_paths: int,
+    n_steps: int,
+    method: str,
+    block_size: int,
+) -> np.ndarray:
+    """
+    (n_paths, n_steps) array of returns drawn from the observed ones.
+    """
+    if method == "shuffle":
+        return rng.permuted(np.broadcast_to(returns, (n_paths, len(returns))), axis=1)
+
+    if method == "resample":
+        return returns[rng.integers(0, len(returns), size=(n_paths, n_steps))]
+
+    # Moving-block bootstrap keeps short-range autocorrelation intact
+    n_blocks = -(-n_steps // block_size)
+    starts = rng.integers(0, len(returns) - block_size + 1, size=(n_paths, n_blocks))
+    index = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, -1)
+    return returns[index[:, :n_steps]]
+
+
+def _path_stats(returns: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Per-path statistics of equity paths that start at 1 and compound
+    the given (paths, steps) returns.
+    """
+    n_paths, n_steps = returns.shape
+
+    equity = np.empty((n_paths, n_steps + 1))
+    equity[:, 0] = 1.0
+    np.cumprod(1.0 + returns, axis=1, out=equity[:, 1:])
+
+    drawdown, since_peak = drawdown_profile(equity)
+
+    return {
+        "final_return": equity[:, -1] - 1.0,
+        "max_drawdown": drawdown.min(axis=1),
+        "time_to_recovery": since_peak.max(axis=1),
+        "recovered": since_peak[:, -1] == 0,
+    }
+
+
+def simulate_paths(
+    returns: np.ndarray,
+    n_paths: int = 10_000,
+    method: str = "shuffle",
+    n_steps: Optional[int] = None,
+    block_size: int = 20,
+    chunk_size: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate n_paths equity paths from observed returns and return
+    per-path arrays: final_return, max_drawdown (a negative fraction),
+    time_to_recovery (longest stretch of steps below a prior high) and
+    recovered (back at a high on the last step).
+
+    method is "shuffle" (reorder the trades; only the path varies),
+    "resample" (draw trades with replacement) or "block" (moving-block
+    bootstrap of bar returns, blocks of block_size). Paths are generated
+    chunk_size at a time as one 2-D array, so memory stays bounded by
+    chunk_size × n_steps; by default about CHUNK_ELEMENTS steps.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+
+    returns = np.asarray(returns, dtype=np.float64)
+    returns = returns[~np.isnan(returns)]
+    if returns.size == 0:
+        raise ValueError("No returns to simulate from")
+
+    if method == "shuffle" or n_steps is None:
+        n_steps = len(returns)
+    if method == "block":
+        block_size = min(block_size, len(returns))
+
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_ELEMENTS // n_steps)
+
+    rng = np.random.default_rng(seed)
+    chunks = []
+
+    for start in range(0, n_paths, chunk_size):
+        size = min(chunk_size, n_paths - start)
+        sampled = _sample_returns(rng, returns, size, n_steps, method, block_size)
+        chunks.append(_path_stats(sampled))
+
+    return {key: np.concatenate([c[key] for c in chunks]) for key in chunks[0]}
+
+
+def summarize_paths(stats: Dict[str, np.ndarray], max_drawdown: float) -> Dict:
+    """
+    Percentiles of drawdown, time to recovery and final return, and the
+    probability that a path trips a kill switch at max_drawdown (the
+    BacktestEngine setting, as a positive fraction).
+    """
+
+    def percentiles(values: np.ndarray) -> Dict[int, float]:
+        return dict(zip(PERCENTILES, np.percentile(values, PERCENTILES).tolist()))
+
+    # Drawdowns are negative: low percentiles are the bad tail
+    return {
+        "paths": len(stats["final_return"]),
+        "max_drawdown": percentiles(stats["max_drawdown"]),
+        "time_to_recovery": percentiles(stats["time_to_recovery"]),
+        "final_return": percentiles(stats["final_return"]),
+        "prob_kill_switch": float((stats["max_drawdown"] <= -max_drawdown).mean()),
+        "prob_loss": float((stats["final_return"] < 0).mean()),
+        "prob_unrecovered": float((~stats["recovered"]).mean()),
+    }
+
+
+def run_monte_carlo(
+    trades: Union[TradeLog, List[Dict]],
+    max_drawdown: float,
+    n_paths: int = 10_000,
+    method: str = "shuffle",
+    seed: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> Dict:
+    """
+    Drawdown and ruin distribution of a run's realized trade sequence.
+    Time to recovery is measured in trades.
+    """
+    stats = simulate_paths(
+        trade_returns(trades),
+        n_paths=n_paths,
+        method=method,
+        chunk_size=chunk_size,
+        seed=seed,
+    )
+    return summarize_paths(stats, max_drawdown)
+
+
+def run_block_bootstrap(
+    equity: np.ndarray,
+    max_drawdown: float,
+    n_paths: int = 10_000,
+    block_size: int = 20,
+    seed: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> Dict:
+    """
+    Same distribution from a bar-level equity series, resampling its
+    returns in blocks of block_size bars. Time to recovery is in bars.
+    """
+    stats = simulate_paths(
+        bar_returns(equity),
+        n_paths=n_paths,
+        method="block",
+        block_size=block_size,
+        chunk_size=chunk_size,
+        seed=seed,
+    )
+    return summarize_paths(stats, max_drawdown)
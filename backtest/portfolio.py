@@ -1,5 +1,38 @@
+import logging
+
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+
+from backtest.engine import BacktestEngine
+from engine.indicators import indicator_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+def align_curves(curves: Dict[str, pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Put equity curves (columns date, equity) on one sorted union of
+    their dates. Returns (dates, equity) with equity shaped
+    (bars, sleeves), each column forward-filled and NaN before its
+    curve starts. One pass over each curve, so the cost grows with the
+    total number of rows rather than with merges per sleeve.
+    """
+    frames = list(curves.values())
+    stamps = [df["date"].to_numpy() for df in frames]
+    dates = np.unique(np.concatenate(stamps))
+
+    equity = np.full((len(dates), len(frames)), np.nan)
+    for j, (df, d) in enumerate(zip(frames, stamps)):
+        equity[np.searchsorted(dates, d), j] = df["equity"].to_numpy(dtype=np.float64)
+
+    # Forward fill: index of the last observed row at or above each row
+    rows = np.where(np.isnan(equity), 0, np.arange(len(dates))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    equity = np.take_along_axis(equity, rows, axis=0)
+
+    return dates, equity
 
 
 def combine_equity_curves(curves: Dict[str, pd.DataFrame]) -> pd.DataFrame:
@@ -7,26 +40,361 @@ def combine_equity_curves(curves: Dict[str, pd.DataFrame]) -> pd.DataFrame:
     Combine multiple equity curves into a portfolio curve.
     Assumes each curve has columns: date, equity
     """
+    dates, equity = align_curves(curves)
+
+    merged = pd.DataFrame(equity, columns=[f"equity_{name}" for name in curves])
+    merged.insert(0, "date", dates)
+    merged["portfolio_equity"] = np.nansum(equity, axis=1)
+
+    return merged
+
+
+WEIGHTINGS = ("static", "inverse_vol", "risk_parity")
+
+# Longest stretch simulated at once between rebalance checks
+SEGMENT_BARS = 4096
+
+
+def inverse_vol_weights(returns: np.ndarray) -> np.ndarray:
+    """
+    Weights proportional to 1 / volatility of each column of returns.
+    """
+    inv = 1.0 / returns.std(axis=0, ddof=1)
+    return inv / inv.sum()
+
+
+def risk_parity_weights(
+    returns: np.ndarray,
+    iterations: int = 50,
+    tol: float = 1e-10,
+) -> np.ndarray:
+    """
+    Equal-risk-contribution weights from the covariance of returns.
+
+    Solves min 0.5 y'Cy - sum(log y) / n by Newton's method, whose
+    positive solution is proportional to the ERC weights whatever the
+    correlations; steps are halved to keep y positive.
+    """
+    cov = np.atleast_2d(np.cov(returns, rowvar=False))
+    budget = 1.0 / len(cov)
+    y = inverse_vol_weights(returns) / np.sqrt(np.diag(cov)).mean()
+
+    for _ in range(iterations):
+        grad = cov @ y - budget / y
+        hess = cov + np.diag(budget / (y * y))
+        step = np.linalg.solve(hess, grad)
+        scale = 1.0
+        while np.any(y - scale * step <= 0):
+            scale /= 2
+        y = y - scale * step
+        if np.abs(step).max() * scale < tol * y.max():
+            break
+
+    return y / y.sum()
+
+
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sample std of every trailing window of values (len - window + 1 of them).
+    """
+    s1 = np.cumsum(np.r_[0.0, values])
+    s2 = np.cumsum(np.r_[0.0, values * values])
+    total = s1[window:] - s1[:-window]
+    total_sq = s2[window:] - s2[:-window]
+    var = (total_sq - total * total / window) / (window - 1)
+    return np.sqrt(np.maximum(var, 0.0))
+
+
+class Allocator:
+    """
+    Shares one pool of capital between sleeves and rebalances it.
 
-    merged = None
+    Works on sleeve equity curves aligned bars x sleeves: each sleeve's
+    bar returns are applied to the capital allocated to it, so a
+    reallocation scales the sleeve's whole return stream. At each
+    rebalance the total is split by target weights:
 
-    for name, df in curves.items():
-        df = df.copy()
-        df = df.rename(columns={"equity": f"equity_{name}"})
+    - static: the configured weights (equal if none);
+    - inverse_vol: 1 / volatility of each sleeve over lookback bars;
+    - risk_parity: equal risk contribution over lookback bars.
 
-        if merged is None:
-            merged = df
+    Rebalances happen every `every` bars (an int) or at the start of
+    each calendar period (a pandas frequency such as "M", "Q", "W"),
+    and additionally when the portfolio's trailing volatility moves by
+    more than a factor of vol_trigger from its level at the last
+    rebalance, or when its drawdown from the peak since the last
+    rebalance reaches drawdown_trigger. Sleeves without data yet, or
+    with no variance over the lookback (flat or halted), get no weight
+    under the volatility-based methods.
+    """
+
+    def __init__(
+        self,
+        method: str = "static",
+        weights: Optional[Dict[str, float]] = None,
+        every=None,
+        lookback: int = 63,
+        vol_trigger: Optional[float] = None,
+        drawdown_trigger: Optional[float] = None,
+    ):
+        if method not in WEIGHTINGS:
+            raise ValueError(f"method must be one of {WEIGHTINGS}")
+        if lookback < 2:
+            raise ValueError("lookback must be at least 2 bars")
+        if vol_trigger is not None and vol_trigger <= 1:
+            raise ValueError("vol_trigger must be a ratio above 1")
+
+        self.method = method
+        self.weights = weights
+        self.every = every
+        self.lookback = lookback
+        self.vol_trigger = vol_trigger
+        self.drawdown_trigger = drawdown_trigger
+
+    def _scheduled(self, dates: np.ndarray) -> np.ndarray:
+        n = len(dates)
+        due = np.zeros(n, dtype=bool)
+        if self.every is None:
+            return due
+        if isinstance(self.every, (int, np.integer)):
+            due[:: int(self.every)] = True
         else:
-            merged = pd.merge(
-                merged,
-                df,
-                on="date",
-                how="outer",
-            )
+            periods = pd.DatetimeIndex(dates).to_period(self.every).asi8
+            due[1:] = periods[1:] != periods[:-1]
+        due[0] = False
+        return due
 
-    merged = merged.sort_values("date").ffill()
+    def _target(self, names: List[str], returns: np.ndarray, available: np.ndarray) -> np.ndarray:
+        """
+        Target weights from the trailing returns window, over the
+        available sleeves.
+        """
+        if self.weights is None:
+            base = available.astype(np.float64)
+        else:
+            base = np.array([self.weights.get(n, 0.0) for n in names]) * available
 
-    equity_cols = [c for c in merged.columns if c.startswith("equity_")]
-    merged["portfolio_equity"] = merged[equity_cols].sum(axis=1)
+        if self.method != "static" and len(returns) >= 2:
+            live = available & (returns.std(axis=0, ddof=1) > 0)
+            if live.any():
+                w = np.zeros(len(names))
+                window = returns[:, live]
+                w[live] = (
+                    inverse_vol_weights(window)
+                    if self.method == "inverse_vol" or live.sum() == 1
+                    else risk_parity_weights(window)
+                )
+                return w
 
-    return merged
+        total = base.sum()
+        return base / total if total > 0 else base
+
+    def run(
+        self,
+        curves: pd.DataFrame,
+        capital: float,
+        exposure: Optional[np.ndarray] = None,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Allocate capital over curves in the combine_equity_curves /
+        PortfolioEngine layout (date plus equity_<sleeve> columns).
+
+        exposure, optional and aligned with curves, is each sleeve's
+        position value as a fraction of its equity per bar; with it the
+        result includes the portfolio's gross_exposure.
+
+        Returns (portfolio, rebalances): capital_<sleeve> per bar with
+        portfolio_equity, and one row per rebalance with its reason and
+        target weights.
+        """
+        columns = [c for c in curves.columns if c.startswith("equity_")]
+        names = [c[len("equity_") :] for c in columns]
+        dates = curves["date"].to_numpy()
+        equity = curves[columns].to_numpy(dtype=np.float64)
+        n, m = equity.shape
+
+        available = ~np.isnan(equity)
+        prev = np.vstack([equity[:1], equity[:-1]])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = equity / prev - 1.0
+        returns[~np.isfinite(returns)] = 0.0
+        growth = 1.0 + returns
+
+        scheduled = self._scheduled(dates)
+        lookback = self.lookback
+
+        held = np.empty((n, m))
+        portfolio_returns = np.zeros(n)
+        log = []
+
+        weights = self._target(names, returns[:1], available[0])
+        held[0] = weights * capital
+        log.append((dates[0], "initial", weights))
+
+        t = 0
+        peak = capital
+        ref_vol = np.nan
+
+        while t < n - 1:
+            due = np.flatnonzero(scheduled[t + 1 : t + 1 + SEGMENT_BARS])
+            end = t + 1 + (due[0] if len(due) else min(SEGMENT_BARS, n - 1 - t) - 1)
+
+            path = held[t] * np.cumprod(growth[t + 1 : end + 1], axis=0)
+            total = path.sum(axis=1)
+            start_total = held[t].sum()
+            seg_returns = total / np.r_[start_total, total[:-1]] - 1.0
+
+            reason = "schedule" if scheduled[end] else None
+            hits = np.zeros(len(total), dtype=bool)
+            drawdown_hits = None
+
+            if self.drawdown_trigger is not None:
+                seg_peak = np.maximum.accumulate(np.maximum(total, peak))
+                drawdown_hits = total / seg_peak - 1.0 <= -self.drawdown_trigger
+                hits |= drawdown_hits
+
+            if self.vol_trigger is not None:
+                history = portfolio_returns[max(1, t + 2 - lookback) : t + 1]
+                window = np.r_[history, seg_returns]
+                vols = np.full(len(total), np.nan)
+                if len(window) >= lookback:
+                    rolled = _rolling_std(window, lookback)
+                    vols[len(total) - len(rolled) :] = rolled
+                if not ref_vol > 0:
+                    valid = np.flatnonzero(vols > 0)
+                    ref_vol = vols[valid[0]] if len(valid) else np.nan
+                if ref_vol > 0:
+                    with np.errstate(invalid="ignore"):
+                        hits |= (vols > ref_vol * self.vol_trigger) | (
+                            vols < ref_vol / self.vol_trigger
+                        )
+
+            if hits.any():
+                k = int(np.argmax(hits))
+                end = t + 1 + k
+                reason = (
+                    "drawdown"
+                    if drawdown_hits is not None and drawdown_hits[k]
+                    else "volatility"
+                )
+
+            k = end - t
+            held[t + 1 : end + 1] = path[:k]
+            portfolio_returns[t + 1 : end + 1] = seg_returns[:k]
+            peak = max(peak, total[:k].max())
+            t = end
+
+            if reason is not None:
+                window = returns[max(1, t + 1 - lookback) : t + 1]
+                weights = self._target(names, window, available[t])
+                held[t] = weights * held[t].sum()
+                log.append((dates[t], reason, weights))
+                peak = held[t].sum()
+                ref_vol = np.nan
+                if self.vol_trigger is not None and len(window) >= lookback:
+                    ref_vol = portfolio_returns[t + 1 - lookback : t + 1].std(ddof=1)
+
+        portfolio = pd.DataFrame(held, columns=[f"capital_{n}" for n in names])
+        portfolio.insert(0, "date", dates)
+        portfolio["portfolio_equity"] = held.sum(axis=1)
+        if exposure is not None:
+            portfolio["gross_exposure"] = (
+                np.nan_to_num(np.abs(exposure)) * held
+            ).sum(axis=1) / portfolio["portfolio_equity"].to_numpy()
+
+        rebalances = pd.DataFrame(
+            [w for _, _, w in log], columns=[f"weight_{n}" for n in names]
+        )
+        rebalances.insert(0, "reason", [r for _, r, _ in log])
+        rebalances.insert(0, "date", [d for d, _, _ in log])
+
+        return portfolio, rebalances
+
+
+class PortfolioEngine:
+    """
+    Runs several strategy sleeves over the same data in one pass.
+
+    Each sleeve is a BacktestEngine with its own capital, risk and stop
+    state. Signals and ATR come from each strategy's generate_signals and
+    the shared indicator cache, then every bar is dispatched to all
+    sleeves in turn.
+    """
+
+    def __init__(self, sleeves: Dict[str, BacktestEngine]):
+        if not sleeves:
+            raise ValueError("PortfolioEngine needs at least one sleeve")
+
+        data = next(iter(sleeves.values())).data
+        for name, sleeve in sleeves.items():
+            if sleeve.data is not data:
+                raise ValueError(f"Sleeve {name} runs on different data")
+
+        self.data = data
+        self.sleeves = sleeves
+
+    def run(self, cache=None) -> pd.DataFrame:
+        """
+        Walk the bars once.
+        Returns per-sleeve mark-to-market equity at every bar plus the
+        combined portfolio_equity, in the combine_equity_curves layout.
+        Per-sleeve trades are left on each sleeve's trades list.
+
+        With a ResultCache, sleeves whose identical run is cached are
+        restored from it and skip the pass; the others are saved to it.
+        """
+        names = list(self.sleeves)
+        sleeves = [self.sleeves[name] for name in names]
+        cached = [cache is not None and cache.load(s) for s in sleeves]
+        pending = [s for s, hit in zip(sleeves, cached) if not hit]
+
+        if pending:
+            self._run_pass(pending)
+            if cache is not None:
+                for sleeve in pending:
+                    try:
+                        cache.save(sleeve)
+                    except OSError as exc:
+                        logger.warning("Could not cache backtest result: %s", exc)
+
+        equity = np.column_stack([s.equity_series() for s in sleeves])
+
+        curves = pd.DataFrame(equity, columns=[f"equity_{n}" for n in names])
+        curves.insert(0, "date", self.data["date"].to_numpy())
+        curves["portfolio_equity"] = equity.sum(axis=1)
+
+        return curves
+
+    def _run_pass(self, sleeves: List[BacktestEngine]) -> None:
+        dates = self.data["date"].tolist()
+        closes = self.data["close"].tolist()
+
+        signals = [
+            s.strategy.generate_signals(self.data).tolist() for s in sleeves
+        ]
+        atrs = [
+            indicator_cache.atr(self.data, s.atr_period).tolist() for s in sleeves
+        ]
+
+        active = [True] * len(sleeves)
+
+        for i, (date, price) in enumerate(zip(dates, closes)):
+            for j, sleeve in enumerate(sleeves):
+                # A halted sleeve stops trading
+                if active[j]:
+                    active[j] = sleeve._process_bar(
+                        date, price, signals[j][i], atrs[j][i]
+                    )
+
+    def exposure(self) -> np.ndarray:
+        """
+        Each sleeve's position value as a fraction of its equity, per
+        bar (bars x sleeves), for Allocator.run.
+        """
+        closes = self.data["close"].to_numpy(dtype=np.float64)
+        return np.column_stack(
+            [
+                s.position_series() * closes / s.equity_series()
+                for s in self.sleeves.values()
+            ]
+        )
@@ -0,0 +1,212 @@
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+CAPTURE_MODES = (None, "cprofile", "tracemalloc")
+
+# (owner, method name, stage) patched for the duration of a session;
+# owner is "engine" or "strategy"
+INSTRUMENTED = [
+    ("engine", "_window", "window"),
+    ("engine", "_window_atr", "atr"),
+    ("engine", "_atr_series", "atr"),
+    ("engine", "_process_bar", "bookkeeping"),
+    ("strategy", "generate_signal", "signal"),
+    ("strategy", "on_bar", "signal"),
+    ("strategy", "generate_signals", "signals"),
+]
+
+
+class Profiler:
+    """
+    Opt-in per-stage instrumentation for BacktestEngine runs.
+
+    While a run is in a session, the engine's and strategy's per-bar
+    methods are replaced on the instance by wrappers that count calls
+    and wall time. Outside a session nothing is wrapped, so an engine
+    without a profiler pays no overhead.
+
+    count_allocations adds the net change in allocated memory blocks per
+    stage; it costs several microseconds per call, so it is off by
+    default. capture optionally records a cProfile or tracemalloc
+    snapshot of the whole run as well.
+    """
+
+    def __init__(
+        self,
+        capture: Optional[str] = None,
+        count_allocations: bool = False,
+        top: int = 20,
+    ):
+        if capture not in CAPTURE_MODES:
+            raise ValueError(f"capture must be one of {CAPTURE_MODES}")
+        self.capture = capture
+        self.count_allocations = count_allocations
+        self.top = top
+        self.reset()
+
+    def reset(self) -> None:
+        # stage -> [calls, nanoseconds, allocated blocks]
+        self.stats: Dict[str, List[int]] = {}
+        self.wall_ns = 0
+        self.captured: Optional[str] = None
+
+    def timed(self, stage: str, fn: Callable) -> Callable:
+        """
+        Wrap fn so each call is added to stage's counters.
+        """
+        counters = self.stats.setdefault(stage, [0, 0, 0])
+        clock = time.perf_counter_ns
+
+        if not self.count_allocations:
+
+            def wrapper(*args, **kwargs):
+                t0 = clock()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    counters[0] += 1
+                    counters[1] += clock() - t0
+
+            return wrapper
+
+        blocks = sys.getallocatedblocks
+
+        def counting_wrapper(*args, **kwargs):
+            b0 = blocks()
+            t0 = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                counters[0] += 1
+                counters[1] += clock() - t0
+                counters[2] += blocks() - b0
+
+        return counting_wrapper
+
+    @contextmanager
+    def session(self, engine):
+        """
+        Instrument engine and its strategy for the duration of the block.
+        """
+        owners = {"engine": engine, "strategy": engine.strategy}
+        patched = []
+
+        for owner, name, stage in INSTRUMENTED:
+            obj = owners[owner]
+            if hasattr(obj, name):
+                setattr(obj, name, self.timed(stage, getattr(obj, name)))
+                patched.append((obj, name))
+
+        # The streaming ATR tracker is created per run; wrap its update
+        make_tracker = engine._new_atr_tracker
+
+        def new_atr_tracker():
+            tracker = make_tracker()
+            tracker.update = self.timed("atr", tracker.update)
+            return tracker
+
+        engine._new_atr_tracker = new_atr_tracker
+        patched.append((engine, "_new_atr_tracker"))
+
+        profile = None
+        # Leave tracing as we found it: the caller may be tracing already
+        started_tracing = False
+        baseline = None
+        if self.capture == "cprofile":
+            profile = cProfile.Profile()
+            profile.enable()
+        elif self.capture == "tracemalloc":
+            if tracemalloc.is_tracing():
+                baseline = tracemalloc.take_snapshot()
+            else:
+                tracemalloc.start()
+                started_tracing = True
+
+        t0 = time.perf_counter_ns()
+        try:
+            yield self
+        finally:
+            self.wall_ns += time.perf_counter_ns() - t0
+
+            if profile is not None:
+                profile.disable()
+                out = io.StringIO()
+                stats = pstats.Stats(profile, stream=out)
+                stats.sort_stats("cumulative").print_stats(self.top)
+                self.captured = out.getvalue()
+            elif self.capture == "tracemalloc":
+                snapshot = tracemalloc.take_snapshot()
+                if started_tracing:
+                    tracemalloc.stop()
+                if baseline is None:
+                    top = snapshot.statistics("lineno")[: self.top]
+                else:
+                    top = snapshot.compare_to(baseline, "lineno")[: self.top]
+                self.captured = "\n".join(str(stat) for stat in top)
+
+            # Dropping the instance attributes restores the class methods
+            for obj, name in patched:
+                delattr(obj, name)
+
+    def report(self) -> Dict:
+        """
+        Structured summary: total wall time and per-stage counters,
+        slowest stage first.
+        """
+        wall_s = self.wall_ns / 1e9
+        stages = []
+
+        for stage, (calls, ns, blocks) in self.stats.items():
+            if not calls:
+                continue
+            stages.append(
+                {
+                    "stage": stage,
+                    "calls": calls,
+                    "total_s": ns / 1e9,
+                    "mean_us": ns / calls / 1e3,
+                    "share": (ns / self.wall_ns) if self.wall_ns else 0.0,
+                    "alloc_blocks": blocks if self.count_allocations else None,
+                }
+            )
+
+        stages.sort(key=lambda s: s["total_s"], reverse=True)
+
+        return {"wall_s": wall_s, "stages": stages, "captured": self.captured}
+
+    def log(
+        self,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.INFO,
+    ) -> None:
+        """
+        Emit the report through logging, so the handlers configured in
+        config/logging.yaml receive it. Captured profiles go at DEBUG.
+        """
+        logger = logger or logging.getLogger("backtest.profile")
+        report = self.report()
+
+        logger.log(level, "Backtest profile: %.4fs wall", report["wall_s"])
+        for s in report["stages"]:
+            blocks = s["alloc_blocks"]
+            logger.log(
+                level,
+                "%-12s calls %9d | total %.4fs | mean %.2fus | %5.1f%%%s",
+                s["stage"],
+                s["calls"],
+                s["total_s"],
+                s["mean_us"],
+                100 * s["share"],
+                "" if blocks is None else f" | blocks {blocks:+d}",
+            )
+
+        if report["captured"]:
+            logger.debug("%s capture:\n%s", self.capture, report["captured"])
@@ -1,28 +1,32 @@
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Union
 
+from backtest.trade_log import EXIT_TYPES, TradeLog, as_trade_log
 
-def yearly_performance(trades: List[Dict]) -> pd.DataFrame:
+
+def yearly_performance(trades: Union[TradeLog, List[Dict]]) -> pd.DataFrame:
     """
     Aggregate PnL and trade count by year.
-    Considers only SELL and STOP exits.
+    Considers only exits (SELL, COVER, STOP).
     """
+    log = as_trade_log(trades)
+    exits = log.mask(*EXIT_TYPES)
 
-    records = []
-
-    for trade in trades:
-        if trade["type"] in ("SELL", "STOP"):
-            records.append(
-                {
-                    "year": trade["date"].year,
-                    "pnl": trade["pnl"],
-                }
-            )
-
-    if not records:
+    if not exits.any():
         return pd.DataFrame(columns=["year", "total_pnl", "trade_count"])
 
-    df = pd.DataFrame(records)
+    years = (
+        log.dates[exits].view("datetime64[ns]").astype("datetime64[Y]").astype(np.int64)
+        + 1970
+    )
+
+    df = pd.DataFrame(
+        {
+            "year": years,
+            "pnl": log.column("pnl")[exits],
+        }
+    )
 
     summary = (
         df.groupby("year")
@@ -0,0 +1,216 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import tempfile
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from backtest.checkpoint import engine_fingerprint
+from backtest.engine import BacktestEngine
+from backtest.trade_log import TradeLog, _FLOAT_COLUMNS
+from engine.data_loader import PROCESSED_DIR, dataset_hash
+
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_DIR = PROCESSED_DIR / "results"
+
+# Bump to drop every cached result after a change the salt can't see
+RESULT_CACHE_VERSION = 1
+
+MAX_CACHE_BYTES = 512 * 2**20
+
+# Source files that decide a run's outcome besides the strategy's own;
+# PortfolioEngine.run(cache=...) drives cached sleeves through portfolio.py
+_ENGINE_SOURCES = (
+    "backtest/engine.py",
+    "backtest/portfolio.py",
+    "backtest/trade_log.py",
+    "engine/indicators.py",
+    "engine/strategy.py",
+)
+
+_SCALARS = ("position", "entry_price", "stop_price", "position_size", "cash", "equity_peak", "halted")
+
+
+@lru_cache(maxsize=None)
+def code_salt(strategy_cls: type) -> str:
+    """
+    Hash of the cache version, the engine sources and the strategy's
+    module source, so editing any of them invalidates stale results.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(RESULT_CACHE_VERSION).encode())
+
+    root = Path(__file__).resolve().parent.parent
+    paths = [root / p for p in _ENGINE_SOURCES]
+    source = inspect.getsourcefile(strategy_cls)
+    if source:
+        paths.append(Path(source))
+
+    for path in paths:
+        try:
+            h.update(path.read_bytes())
+        except OSError:
+            h.update(str(path).encode())
+
+    return h.hexdigest()
+
+
+def result_key(engine: BacktestEngine) -> str:
+    """
+    Content address of a run: dataset hash, strategy class and
+    parameters, engine settings and the code salt.
+    """
+    key = {
+        "data": dataset_hash(engine.data),
+        "engine": engine_fingerprint(engine),
+        "code": code_salt(type(engine.strategy)),
+    }
+    blob = json.dumps(key, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(blob, digest_size=20).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of completed BacktestEngine runs.
+
+    Each entry is an uncompressed .npz of the trade log columns, the
+    end-of-bar arrays behind equity_series and the final position and
+    risk state, named by result_key. Hits refresh the file's mtime and
+    the least recently used entries are deleted once the directory
+    exceeds max_bytes. Writes go through a temporary file and
+    os.replace, so concurrent sweep workers can share a directory.
+
+    A restored engine reports the same trades, equity and positions as
+    a fresh run, but carries no streaming state, so it can't step()
+    further.
+    """
+
+    def __init__(self, directory: Path = RESULT_CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def load(self, engine: BacktestEngine) -> bool:
+        """
+        Restore a cached result into a fresh engine. Returns False on a
+        miss, leaving the engine untouched.
+        """
+        path = self._path(result_key(engine))
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                arrays = {name: entry[name] for name in entry.files}
+            os.utime(path)
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+            self.misses += 1
+            return False
+
+        engine.trades = TradeLog.from_arrays(
+            arrays["trade_date"],
+            arrays["trade_type"],
+            **{col: arrays[f"trade_{col}"] for col in _FLOAT_COLUMNS},
+        )
+
+        n = len(arrays["bar_close"])
+        capacity = max(1, n, len(engine.data))
+        for name in ("close", "cash", "size", "entry"):
+            values = np.empty(capacity)
+            values[:n] = arrays[f"bar_{name}"]
+            setattr(engine, f"_bar_{name}", values)
+        engine.bars_processed = n
+
+        state = dict(zip(_SCALARS, arrays["state"].tolist()))
+        engine.position = int(state["position"])
+        engine.position_size = state["position_size"]
+        engine.cash = state["cash"]
+        engine.equity_peak = state["equity_peak"]
+        engine.halted = bool(state["halted"])
+        engine.entry_price = state["entry_price"] if engine.position else None
+        engine.stop_price = state["stop_price"] if engine.position else None
+
+        self.hits += 1
+        return True
+
+    def save(self, engine: BacktestEngine) -> None:
+        """
+        Store a completed run, then evict down to max_bytes.
+        """
+        n = engine.bars_processed
+        trades = engine.trades
+        arrays = {
+            "trade_date": trades.dates,
+            "trade_type": trades.types,
+            **{f"trade_{col}": trades.column(col) for col in _FLOAT_COLUMNS},
+            "bar_close": engine._bar_close[:n],
+            "bar_cash": engine._bar_cash[:n],
+            "bar_size": engine._bar_size[:n],
+            "bar_entry": engine._bar_entry[:n],
+            "state": np.array(
+                [
+                    np.nan if getattr(engine, name) is None else float(getattr(engine, name))
+                    for name in _SCALARS
+                ]
+            ),
+        }
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, self._path(result_key(engine)))
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Delete least recently used entries until the cache fits max_bytes.
+        """
+        entries = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def run(self, engine: BacktestEngine, vectorized: bool = False) -> TradeLog:
+        """
+        engine.run() (or run_vectorized()), unless an identical run is
+        cached. Returns the trade log either way.
+        """
+        if self.load(engine):
+            return engine.trades
+
+        trades = engine.run_vectorized() if vectorized else engine.run()
+        try:
+            self.save(engine)
+        except OSError as exc:
+            logger.warning("Could not cache backtest result: %s", exc)
+        return trades
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.npz"):
+            path.unlink(missing_ok=True)
+        self.hits = 0
+        self.misses = 0
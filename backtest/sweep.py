@@ -0,0 +1,99 @@
+import csv
+import itertools
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from backtest.allocation_test import run_allocation
+from backtest.result_cache import RESULT_CACHE_DIR, ResultCache
+from engine.data_store import read_store, write_store
+
+
+# Set once per worker process by _init_worker
+_worker_data: Optional[pd.DataFrame] = None
+_worker_capital: float = 0.0
+_worker_cache: Optional[ResultCache] = None
+
+
+def _init_worker(directory: str, total_capital: float, cache_dir: Optional[str]) -> None:
+    global _worker_data, _worker_capital, _worker_cache
+    _worker_data = read_store(Path(directory))
+    _worker_capital = total_capital
+    _worker_cache = ResultCache(Path(cache_dir)) if cache_dir is not None else None
+
+
+def _run_task(params: Dict) -> Dict:
+    final_equity, max_dd = run_allocation(
+        _worker_data, _worker_capital, cache=_worker_cache, **params
+    )
+    return {
+        **params,
+        "final_equity": float(final_equity),
+        "max_drawdown": float(max_dd),
+    }
+
+
+def expand_grid(grid: Dict[str, Sequence]) -> List[Dict]:
+    """
+    Cartesian product of a parameter grid, first key varying slowest.
+    """
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def run_sweep(
+    data: pd.DataFrame,
+    total_capital: float,
+    grid: Dict[str, Sequence],
+    output_path: str = "output/sweep_results.csv",
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    cache_dir: Optional[Path] = RESULT_CACHE_DIR,
+) -> pd.DataFrame:
+    """
+    Run run_allocation over every combination in grid on a process pool.
+
+    grid keys are run_allocation keyword arguments (trend_weight,
+    sma_window, trend_risk_per_trade, trend_atr_multiplier). The data is
+    handed to workers once as a memory-mapped column store; each task only
+    carries its parameters. Rows are appended to output_path as they
+    complete, in grid order. Sleeve runs are shared through the result
+    cache in cache_dir, so a repeated sweep only computes what changed;
+    pass cache_dir=None to disable it.
+    """
+    tasks = expand_grid(grid)
+    if not tasks:
+        raise ValueError("Parameter grid is empty")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (max_workers * 4))
+
+    fieldnames = list(grid) + ["final_equity", "max_drawdown"]
+    rows = []
+
+    with tempfile.TemporaryDirectory(prefix="sweep_") as tmp:
+        shared_dir = str(Path(tmp) / "data")
+        write_store(data, Path(shared_dir))
+
+        with open(output_path, "w", newline="") as f, ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(
+                shared_dir,
+                total_capital,
+                None if cache_dir is None else str(cache_dir),
+            ),
+        ) as pool:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+
+            for row in pool.map(_run_task, tasks, chunksize=chunksize):
+                writer.writerow(row)
+                rows.append(row)
+
+    return pd.DataFrame(rows, columns=fieldnames)
@@ -1,16 +1,17 @@
-import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Union
 
+from backtest.trade_log import EXIT_TYPES, TradeLog, TradeType, as_trade_log
 
-def analyze_trades(trades: List[Dict]) -> dict:
+
+def analyze_trades(trades: Union[TradeLog, List[Dict]]) -> dict:
     """
     Analyze executed trades.
-    Assumes SELL and STOP trades contain PnL.
+    Assumes exit trades (SELL, COVER, STOP) contain PnL.
     """
+    log = as_trade_log(trades)
+    exits = log.mask(*EXIT_TYPES)
 
-    pnl_trades = [t for t in trades if t["type"] in ("SELL", "STOP")]
-
-    if not pnl_trades:
+    if not exits.any():
         return {
             "total_trades": 0,
             "win_rate": 0.0,
@@ -21,23 +22,24 @@ def analyze_trades(trades: List[Dict]) -> dict:
             "regime_exits": 0,
         }
 
-    df = pd.DataFrame(pnl_trades)
+    pnl = log.column("pnl")[exits]
+    types = log.types[exits]
 
-    wins = df[df["pnl"] > 0]
-    losses = df[df["pnl"] <= 0]
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl <= 0]
 
-    win_rate = len(wins) / len(df)
-    avg_win = wins["pnl"].mean() if not wins.empty else 0.0
-    avg_loss = losses["pnl"].mean() if not losses.empty else 0.0
+    win_rate = len(wins) / len(pnl)
+    avg_win = wins.mean() if wins.size else 0.0
+    avg_loss = losses.mean() if losses.size else 0.0
 
     expectancy = (win_rate * avg_win) + ((1 - win_rate) * avg_loss)
 
     return {
-        "total_trades": len(df),
+        "total_trades": len(pnl),
         "win_rate": win_rate,
         "avg_win": avg_win,
         "avg_loss": avg_loss,
         "expectancy": expectancy,
-        "stop_exits": (df["type"] == "STOP").sum(),
-        "regime_exits": (df["type"] == "SELL").sum(),
+        "stop_exits": int((types == TradeType.STOP).sum()),
+        "regime_exits": int(((types == TradeType.SELL) | (types == TradeType.COVER)).sum()),
     }
@@ -0,0 +1,232 @@
+from enum import IntEnum
+from typing import Dict, Iterable, Iterator, Union
+
+import numpy as np
+import pandas as pd
+
+
+class TradeType(IntEnum):
+    BUY = 0
+    SELL = 1
+    STOP = 2
+    HALT = 3
+    SHORT = 4
+    COVER = 5
+
+
+TRADE_TYPES = [t.name for t in TradeType]
+
+ENTRY_TYPES = (TradeType.BUY, TradeType.SHORT)
+
+# Trades that close a position and carry its PnL; STOP closes either side
+EXIT_TYPES = (TradeType.SELL, TradeType.COVER, TradeType.STOP)
+
+# Order side of each trade type; a STOP takes the side opposite its entry
+ORDER_ACTIONS = {
+    TradeType.BUY: "BUY",
+    TradeType.SELL: "SELL",
+    TradeType.SHORT: "SELL",
+    TradeType.COVER: "BUY",
+}
+
+HALT_REASON = "Max drawdown breached"
+
+# Keys present in the dict view of each trade type
+_RECORD_KEYS = {
+    TradeType.BUY: ("price", "size", "stop", "cash"),
+    TradeType.SELL: ("price", "pnl", "cash"),
+    TradeType.STOP: ("price", "pnl", "cash"),
+    TradeType.HALT: ("cash",),
+    TradeType.SHORT: ("price", "size", "stop", "cash"),
+    TradeType.COVER: ("price", "pnl", "cash"),
+}
+
+_FLOAT_COLUMNS = ("price", "size", "stop", "pnl", "cash")
+
+
+class TradeLog:
+    """
+    Columnar trade log backed by preallocated NumPy arrays.
+
+    Columns: date (int64 ns), type (TradeType codes), price, size, stop,
+    pnl and cash. Fields a trade type does not use are NaN. Indexing and
+    iteration yield the per-trade dicts the engine used to produce, so
+    existing callers keep working.
+    """
+
+    def __init__(self, capacity: int = 64):
+        capacity = max(1, capacity)
+        self._n = 0
+        self._date = np.empty(capacity, dtype=np.int64)
+        self._type = np.empty(capacity, dtype=np.int8)
+        self._floats = {
+            col: np.empty(capacity, dtype=np.float64) for col in _FLOAT_COLUMNS
+        }
+
+    def __len__(self):
+        return self._n
+
+    def __getstate__(self) -> Dict:
+        # Pickle only the filled rows, not the spare capacity
+        n = self._n
+        return {
+            "_n": n,
+            "_date": self._date[:n].copy(),
+            "_type": self._type[:n].copy(),
+            "_floats": {col: v[:n].copy() for col, v in self._floats.items()},
+        }
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        if self._n == 0:
+            self.__init__()
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self._date)
+        self._date = np.resize(self._date, capacity)
+        self._type = np.resize(self._type, capacity)
+        self._floats = {
+            col: np.resize(values, capacity) for col, values in self._floats.items()
+        }
+
+    def append(
+        self,
+        date,
+        trade_type: TradeType,
+        price: float = np.nan,
+        size: float = np.nan,
+        stop: float = np.nan,
+        pnl: float = np.nan,
+        cash: float = np.nan,
+    ) -> None:
+        """
+        Append one trade in place, growing the arrays when full.
+        """
+        if self._n == len(self._date):
+            self._grow()
+
+        if not isinstance(date, (int, np.integer)):
+            date = pd.Timestamp(date).value
+
+        i = self._n
+        self._date[i] = date
+        self._type[i] = trade_type
+        self._floats["price"][i] = price
+        self._floats["size"][i] = size
+        self._floats["stop"][i] = stop
+        self._floats["pnl"][i] = pnl
+        self._floats["cash"][i] = cash
+        self._n += 1
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._date[: self._n]
+
+    @property
+    def types(self) -> np.ndarray:
+        return self._type[: self._n]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        View of one float column (price, size, stop, pnl, cash).
+        """
+        return self._floats[name][: self._n]
+
+    def mask(self, *trade_types: TradeType) -> np.ndarray:
+        return np.isin(self.types, [int(t) for t in trade_types])
+
+    def action(self, index: int) -> str:
+        """
+        Order side (BUY or SELL) of an entry or exit. A stop sells out
+        of a long and buys back a short, depending on the entry before it.
+        """
+        if index < 0:
+            index += self._n
+        trade_type = TradeType(self._type[index])
+        if trade_type == TradeType.STOP:
+            entries = np.flatnonzero(self.mask(*ENTRY_TYPES)[:index])
+            if not len(entries):
+                raise ValueError("stop without a preceding entry")
+            entry = TradeType(self._type[entries[-1]])
+            return "SELL" if entry == TradeType.BUY else "BUY"
+        return ORDER_ACTIONS[trade_type]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        DataFrame over the log's arrays without copying them.
+        """
+        columns = {
+            "date": self.dates.view("datetime64[ns]"),
+            "type": pd.Categorical.from_codes(self.types, TRADE_TYPES),
+        }
+        for col in _FLOAT_COLUMNS:
+            columns[col] = self.column(col)
+        return pd.DataFrame(columns, copy=False)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._n))]
+
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("trade index out of range")
+
+        trade_type = TradeType(self._type[index])
+        record = {
+            "date": pd.Timestamp(self._date[index]),
+            "type": trade_type.name,
+        }
+        if trade_type == TradeType.HALT:
+            record["reason"] = HALT_REASON
+        for key in _RECORD_KEYS[trade_type]:
+            record[key] = float(self._floats[key][index])
+        return record
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self._n):
+            yield self[i]
+
+    @classmethod
+    def from_arrays(cls, dates: np.ndarray, types: np.ndarray, **floats: np.ndarray) -> "TradeLog":
+        """
+        Build a log around existing column arrays (as returned by dates,
+        types and column()), e.g. ones loaded from disk.
+        """
+        log = cls.__new__(cls)
+        log.__setstate__(
+            {
+                "_n": len(dates),
+                "_date": np.asarray(dates, dtype=np.int64),
+                "_type": np.asarray(types, dtype=np.int8),
+                "_floats": {
+                    col: np.asarray(floats[col], dtype=np.float64)
+                    for col in _FLOAT_COLUMNS
+                },
+            }
+        )
+        return log
+
+    @classmethod
+    def from_records(cls, trades: Iterable[Dict]) -> "TradeLog":
+        """
+        Build a log from per-trade dicts in the engine's legacy layout.
+        """
+        trades = list(trades)
+        log = cls(capacity=len(trades))
+        for t in trades:
+            log.append(
+                t["date"],
+                TradeType[t["type"]],
+                **{k: t[k] for k in _FLOAT_COLUMNS if k in t},
+            )
+        return log
+
+
+def as_trade_log(trades: Union[TradeLog, Iterable[Dict]]) -> TradeLog:
+    """
+    Accept either a TradeLog or a list of trade dicts.
+    """
+    if isinstance(trades, TradeLog):
+        return trades
+    return TradeLog.from_records(trades)
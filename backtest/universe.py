@@ -0,0 +1,104 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from backtest.engine import BacktestEngine
+from backtest.trade_log import TradeLog
+from engine.indicators import compute_atr_panel
+from engine.strategy import Strategy
+from engine.universe import Panel
+
+
+@dataclass
+class SleeveConfig:
+    """
+    One strategy sleeve run on every symbol of a universe.
+    capital is the sleeve total, split equally across symbols.
+    """
+
+    name: str
+    strategy: Strategy
+    capital: float
+    risk_per_trade: float
+    max_drawdown: float
+    atr_period: int = 14
+    atr_multiplier: float = 2.0
+    transaction_cost: float = 0.0
+    slippage: float = 0.0
+
+
+def _simulate(task: Tuple) -> TradeLog:
+    sleeve, capital, dates, closes, signals, atr = task
+
+    data = pd.DataFrame({"date": dates.view("datetime64[ns]"), "close": closes})
+    engine = BacktestEngine(
+        data=data,
+        strategy=sleeve.strategy,
+        initial_capital=capital,
+        risk_per_trade=sleeve.risk_per_trade,
+        max_drawdown=sleeve.max_drawdown,
+        atr_period=sleeve.atr_period,
+        atr_multiplier=sleeve.atr_multiplier,
+        transaction_cost=sleeve.transaction_cost,
+        slippage=sleeve.slippage,
+    )
+
+    return engine.run_vectorized(signals, atr)
+
+
+def run_universe(
+    panel: Panel,
+    sleeves: List[SleeveConfig],
+    max_workers: int = 1,
+) -> Dict[str, Dict[str, TradeLog]]:
+    """
+    Run every sleeve on every symbol of the panel.
+
+    Signals and ATR are computed for all symbols at once as 2-D array
+    operations; each (sleeve, symbol) simulation then runs on that
+    symbol's own bars, across max_workers processes when > 1.
+    Returns trades keyed by sleeve name, then symbol.
+    """
+    valid = panel.valid()
+    dates = panel.dates.to_numpy().astype("datetime64[ns]").view("i8")
+    atr_by_period = {}
+
+    tasks = []
+    keys = []
+    for sleeve in sleeves:
+        signals = sleeve.strategy.generate_panel_signals(panel)
+        if sleeve.atr_period not in atr_by_period:
+            atr_by_period[sleeve.atr_period] = compute_atr_panel(
+                panel.high, panel.low, panel.close, sleeve.atr_period
+            )
+        atr = atr_by_period[sleeve.atr_period]
+        capital = sleeve.capital / len(panel.symbols)
+
+        for j, symbol in enumerate(panel.symbols):
+            rows = valid[:, j]
+            tasks.append(
+                (
+                    sleeve,
+                    capital,
+                    dates[rows],
+                    panel.close[rows, j],
+                    signals[rows, j],
+                    atr[rows, j],
+                )
+            )
+            keys.append((sleeve.name, symbol))
+
+    if max_workers > 1:
+        chunksize = max(1, len(tasks) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_simulate, tasks, chunksize=chunksize))
+    else:
+        results = [_simulate(task) for task in tasks]
+
+    trades: Dict[str, Dict[str, TradeLog]] = {s.name: {} for s in sleeves}
+    for (name, symbol), log in zip(keys, results):
+        trades[name][symbol] = log
+
+    return trades
@@ -0,0 +1,267 @@
+import inspect
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import BacktestEngine
+from backtest.metrics import compute_max_drawdown
+from backtest.sweep import expand_grid
+from engine.data_store import read_store, write_store
+from engine.indicators import indicator_cache
+
+
+# BacktestEngine keyword arguments a grid may vary
+ENGINE_PARAMS = (
+    "risk_per_trade",
+    "max_drawdown",
+    "atr_period",
+    "atr_multiplier",
+    "transaction_cost",
+    "slippage",
+)
+
+BARS_PER_YEAR = 252
+
+
+class Fold(NamedTuple):
+    """
+    Bar index ranges [start, end) of one train/test split.
+    """
+
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+def make_folds(
+    n_bars: int,
+    train_bars: int,
+    test_bars: int,
+    anchored: bool = False,
+) -> List[Fold]:
+    """
+    Consecutive out-of-sample windows of test_bars, each preceded by its
+    training window: the previous train_bars bars (rolling) or every
+    bar since the start (anchored). The last test window may be short.
+    """
+    if train_bars < 1 or test_bars < 1:
+        raise ValueError("train_bars and test_bars must be >= 1")
+
+    folds = []
+    test_start = train_bars
+    while test_start < n_bars:
+        test_end = min(test_start + test_bars, n_bars)
+        train_start = 0 if anchored else test_start - train_bars
+        folds.append(Fold(train_start, test_start, test_start, test_end))
+        test_start = test_end
+
+    if not folds:
+        raise ValueError("Not enough bars for one train/test fold")
+    return folds
+
+
+def _total_return(equity: np.ndarray) -> float:
+    return equity[-1] / equity[0] - 1.0
+
+
+def _sharpe(equity: np.ndarray) -> float:
+    returns = np.diff(equity) / equity[:-1]
+    std = returns.std() if len(returns) > 1 else 0.0
+    if std == 0:
+        return 0.0
+    return returns.mean() / std * np.sqrt(BARS_PER_YEAR)
+
+
+def _return_over_drawdown(equity: np.ndarray) -> float:
+    drawdown = -compute_max_drawdown(equity) / equity[0]
+    ret = _total_return(equity)
+    return ret / drawdown if drawdown > 0 else ret
+
+
+def _score(objective, equity: np.ndarray, initial_capital: float) -> float:
+    # Measure from the capital the window started with
+    return float(objective(np.concatenate([[initial_capital], equity])))
+
+
+OBJECTIVES = {
+    "return": _total_return,
+    "sharpe": _sharpe,
+    "return_over_drawdown": _return_over_drawdown,
+}
+
+
+# Set once per worker process by _init_worker
+_worker: Dict = {}
+
+
+def _init_worker(directory: str, strategy_cls, engine_kwargs: Dict, folds, objective):
+    _worker.update(
+        data=read_store(Path(directory)),
+        strategy_cls=strategy_cls,
+        engine_kwargs=engine_kwargs,
+        folds=folds,
+        objective=OBJECTIVES[objective],
+    )
+
+
+def _split_params(strategy_cls, params: Dict) -> Tuple[Dict, Dict]:
+    accepted = inspect.signature(strategy_cls.__init__).parameters
+    strategy_params = {k: v for k, v in params.items() if k in accepted}
+    engine_params = {k: v for k, v in params.items() if k in ENGINE_PARAMS}
+
+    unknown = set(params) - set(strategy_params) - set(engine_params)
+    if unknown:
+        raise ValueError(f"Unknown grid parameters: {sorted(unknown)}")
+    return strategy_params, engine_params
+
+
+def _simulate(data, strategy, engine_kwargs, signals, atr, start, end) -> np.ndarray:
+    engine = BacktestEngine(
+        data=data.iloc[start:end],
+        strategy=strategy,
+        **engine_kwargs,
+    )
+    engine.run_vectorized(signals=signals[start:end], atr=atr[start:end])
+    return engine.equity_series()
+
+
+def _run_params(params: Dict) -> Tuple[List[float], List[np.ndarray]]:
+    """
+    Score one parameter set on every training window and simulate it on
+    every test window.
+
+    Signals and ATR are trailing, so they are computed once over the
+    whole history and sliced per window: the value at a bar is the same
+    whichever fold it falls in, and a test window's indicators are
+    already warmed up by the bars before it.
+    """
+    data = _worker["data"]
+    strategy_params, engine_params = _split_params(_worker["strategy_cls"], params)
+    strategy = _worker["strategy_cls"](**strategy_params)
+    engine_kwargs = {**_worker["engine_kwargs"], **engine_params}
+
+    signals = strategy.generate_signals(data)
+    atr = indicator_cache.atr(data, engine_kwargs.get("atr_period", 14))
+
+    scores = []
+    test_equity = []
+    for fold in _worker["folds"]:
+        train = _simulate(
+            data, strategy, engine_kwargs, signals, atr, fold.train_start, fold.train_end
+        )
+        scores.append(
+            _score(_worker["objective"], train, engine_kwargs["initial_capital"])
+        )
+        test_equity.append(
+            _simulate(
+                data, strategy, engine_kwargs, signals, atr, fold.test_start, fold.test_end
+            )
+        )
+
+    return scores, test_equity
+
+
+def run_walk_forward(
+    data: pd.DataFrame,
+    strategy_cls,
+    grid: Dict[str, Sequence],
+    engine_kwargs: Dict,
+    train_bars: int,
+    test_bars: int,
+    anchored: bool = False,
+    objective: str = "sharpe",
+    output_path: Optional[str] = "output/walk_forward.csv",
+    max_workers: Optional[int] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Walk-forward optimization of one strategy sleeve.
+
+    For every fold, the grid combination with the best objective on the
+    training window is evaluated on the following test window, and the
+    out-of-sample test equity is stitched into one curve by compounding
+    each fold's returns.
+
+    grid keys are strategy_cls constructor arguments and/or the
+    BacktestEngine settings in ENGINE_PARAMS; engine_kwargs supplies
+    initial_capital and the settings the grid leaves fixed. Each
+    combination is one task on a process pool, sharing the data as a
+    memory-mapped column store, and computes its indicators once for all
+    folds.
+
+    Returns (folds, equity): one row per fold with its dates, chosen
+    parameters and scores, and the stitched out-of-sample equity curve.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {sorted(OBJECTIVES)}")
+
+    combos = expand_grid(grid)
+    if not combos:
+        raise ValueError("Parameter grid is empty")
+    _split_params(strategy_cls, combos[0])
+
+    folds = make_folds(len(data), train_bars, test_bars, anchored)
+    max_workers = min(max_workers or os.cpu_count() or 1, len(combos))
+
+    with tempfile.TemporaryDirectory(prefix="walk_forward_") as tmp:
+        shared_dir = str(Path(tmp) / "data")
+        write_store(data, Path(shared_dir))
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(shared_dir, strategy_cls, engine_kwargs, folds, objective),
+        ) as pool:
+            results = list(pool.map(_run_params, combos))
+
+    # scores[c, f]: objective of combination c on fold f's training window
+    scores = np.array([r[0] for r in results])
+    best = np.argmax(np.where(np.isnan(scores), -np.inf, scores), axis=0)
+
+    dates = data["date"].to_numpy()
+    initial_capital = engine_kwargs["initial_capital"]
+    level = 1.0
+    rows = []
+    stitched = []
+
+    for f, fold in enumerate(folds):
+        c = best[f]
+        equity = results[c][1][f]
+
+        stitched.append(equity * level)
+        level *= equity[-1] / initial_capital
+
+        rows.append(
+            {
+                "fold": f,
+                "train_start": dates[fold.train_start],
+                "train_end": dates[fold.train_end - 1],
+                "test_start": dates[fold.test_start],
+                "test_end": dates[fold.test_end - 1],
+                **combos[c],
+                "train_score": scores[c, f],
+                "test_score": _score(OBJECTIVES[objective], equity, initial_capital),
+                "test_return": equity[-1] / initial_capital - 1.0,
+                "test_max_drawdown": compute_max_drawdown(equity),
+            }
+        )
+
+    fold_table = pd.DataFrame(rows)
+    if output_path:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        fold_table.to_csv(output_path, index=False)
+
+    first = folds[0].test_start
+    oos_equity = pd.DataFrame(
+        {
+            "date": dates[first : folds[-1].test_end],
+            "equity": np.concatenate(stitched),
+        }
+    )
+
+    return fold_table, oos_equity
@@ -0,0 +1,244 @@
+"""
+Timing harness for the backtest hot path.
+
+    python -m benchmarks.run --sizes 1000 100000 --baseline benchmarks/baseline.json
+
+Times each stage on synthetic data, records bars/sec and peak memory,
+writes the results as JSON and exits non-zero when any stage is slower
+than the baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest.allocation_test import run_allocation
+from backtest.engine import BacktestEngine
+from backtest.event_engine import EventEngine, EventSleeve
+from backtest.metrics import compute_equity_curve
+from benchmarks.synthetic import make_ohlcv
+from engine.data_loader import load_csv, parse_csv
+from engine.indicators import compute_atr, indicator_cache
+from engine.mean_reversion_strategy import MeanReversionStrategy
+from engine.sma_trend_strategy import SMATrendStrategy
+
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+CAPITAL = 100_000.0
+
+
+def _trend_engine(data: pd.DataFrame) -> BacktestEngine:
+    return BacktestEngine(
+        data=data,
+        strategy=SMATrendStrategy(window=200),
+        initial_capital=CAPITAL,
+        risk_per_trade=0.01,
+        max_drawdown=0.20,
+        atr_period=14,
+        atr_multiplier=2.0,
+        transaction_cost=10.0,
+        slippage=0.5,
+    )
+
+
+def _event_engine(data: pd.DataFrame) -> EventEngine:
+    engine = EventEngine()
+    engine.add_feed("bench", data)
+    engine.add_sleeve(
+        EventSleeve(
+            "trend",
+            SMATrendStrategy(window=200),
+            initial_capital=CAPITAL,
+            risk_per_trade=0.01,
+            max_drawdown=0.20,
+            transaction_cost=10.0,
+            slippage=0.5,
+        ),
+        "bench",
+    )
+    return engine
+
+
+def _cold(fn: Callable) -> Callable:
+    # Indicator series are memoized; time the computation, not the lookup
+    def call():
+        indicator_cache.clear()
+        return fn()
+
+    return call
+
+
+def build_cases(data: pd.DataFrame, workdir: Path) -> Dict[str, Callable]:
+    """
+    Zero-argument callables, one per benchmarked stage.
+    """
+    csv_path = workdir / "bench.csv"
+    store_dir = workdir / "processed"
+    data.to_csv(csv_path, index=False)
+    load_csv(csv_path, cache_dir=store_dir)
+
+    trades = _trend_engine(data).run()
+
+    return {
+        "parse_csv": lambda: parse_csv(csv_path),
+        "load_csv": lambda: load_csv(csv_path, cache_dir=store_dir),
+        "compute_atr": lambda: compute_atr(data, period=14),
+        "sma_trend.generate_signal": (
+            lambda: SMATrendStrategy(200).generate_signal(data)
+        ),
+        "mean_reversion.generate_signal": (
+            lambda: MeanReversionStrategy().generate_signal(data)
+        ),
+        "sma_trend.generate_signals": _cold(
+            lambda: SMATrendStrategy(200).generate_signals(data)
+        ),
+        "mean_reversion.generate_signals": _cold(
+            lambda: MeanReversionStrategy().generate_signals(data)
+        ),
+        "engine.run": lambda: _trend_engine(data).run(),
+        "engine.run_vectorized": _cold(lambda: _trend_engine(data).run_vectorized()),
+        "event_engine.run": lambda: _event_engine(data).run(),
+        "compute_equity_curve": lambda: compute_equity_curve(trades, CAPITAL),
+        "run_allocation": _cold(lambda: run_allocation(data, CAPITAL, 0.7)),
+    }
+
+
+def measure(fn: Callable, n_bars: int, repeat: int) -> Dict:
+    """
+    Best-of-repeat wall time, plus peak traced memory from a separate
+    run so tracing overhead doesn't distort the timing.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "bars_per_sec": n_bars / best if best > 0 else float("inf"),
+        "peak_mb": peak / 2**20,
+    }
+
+
+def run_benchmarks(
+    sizes: List[int],
+    repeat: int = 3,
+    only: Optional[List[str]] = None,
+) -> Dict:
+    results = {}
+
+    for n_bars in sizes:
+        data = make_ohlcv(n_bars, seed=42)
+        results[str(n_bars)] = {}
+
+        with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+            for name, fn in build_cases(data, Path(tmp)).items():
+                if only and name not in only:
+                    continue
+                result = measure(fn, n_bars, repeat)
+                results[str(n_bars)][name] = result
+                print(
+                    f"{n_bars:>9} {name:<34} {result['seconds']:>10.4f}s "
+                    f"{result['bars_per_sec']:>14,.0f} bars/s "
+                    f"{result['peak_mb']:>9.1f} MB"
+                )
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def find_regressions(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Stages whose throughput fell more than threshold (a fraction)
+    below the baseline, for every size present in both.
+    """
+    regressions = []
+
+    for size, cases in current["results"].items():
+        for name, result in cases.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if base is None:
+                continue
+
+            floor = base["bars_per_sec"] * (1 - threshold)
+            if result["bars_per_sec"] < floor:
+                regressions.append(
+                    f"{name} @ {size} bars: {result['bars_per_sec']:,.0f} bars/s "
+                    f"vs baseline {base['bars_per_sec']:,.0f}"
+                )
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Backtest hot-path benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="run only these stages")
+    parser.add_argument("--output", default="output/benchmarks.json")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed fractional slowdown vs baseline (default 0.25)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write these results to --baseline instead of comparing",
+    )
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.sizes, repeat=args.repeat, only=args.only)
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=2)
+
+    if not args.baseline:
+        return 0
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        return 0
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+
+    regressions = find_regressions(current, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
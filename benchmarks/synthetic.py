@@ -0,0 +1,49 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Business days run past pandas' Timestamp range beyond this many bars
+MAX_DAILY_BARS = 50_000
+
+# Log prices are reflected into start_price * exp(+-LOG_BAND)
+LOG_BAND = np.log(4.0)
+
+
+def make_ohlcv(
+    n_bars: int,
+    seed: int = 0,
+    start: str = "2000-01-03",
+    freq: Optional[str] = None,
+    start_price: float = 10000.0,
+) -> pd.DataFrame:
+    """
+    Deterministic synthetic OHLCV bars from a driftless geometric random
+    walk, reflected to stay within a factor of 4 of start_price so that
+    prices stay finite at any length. The same (n_bars, seed) always
+    yields the same frame. Bars are business days, or minutes for series
+    too long for that.
+    """
+    if freq is None:
+        freq = "B" if n_bars <= MAX_DAILY_BARS else "min"
+
+    rng = np.random.default_rng(seed)
+
+    walk = np.cumsum(rng.normal(0.0, 0.012, n_bars)) + LOG_BAND
+    log_price = LOG_BAND - np.abs(np.mod(walk, 4 * LOG_BAND) - 2 * LOG_BAND)
+    close = start_price * np.exp(log_price)
+    open_ = close * (1 + rng.normal(0.0, 0.003, n_bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0.0, 0.004, n_bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0.0, 0.004, n_bars)))
+    volume = rng.integers(100_000, 1_000_000, n_bars)
+
+    return pd.DataFrame(
+        {
+            "date": pd.date_range(start, periods=n_bars, freq=freq),
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+        }
+    )
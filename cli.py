@@ -0,0 +1,352 @@
+"""
+Command line entry point.
+
+    python cli.py signal                # today's signals -> output/order_ticket.csv
+    python cli.py backtest
+    python cli.py sweep --grid trend_weight=0.5,0.7 sma_window=100,200
+    python cli.py ingest data/raw/nifty_daily.csv
+    python cli.py bench --sizes 1000 100000
+    python cli.py serve                 # warm worker for `signal`
+
+Each subcommand imports the modules it needs when it runs, so startup
+stays cheap, and config files are read through engine.config's parse
+cache. `signal` hands the run to a `serve` worker when one is
+listening, which keeps the parsed config, the loaded bars and the
+indicator cache in memory between runs; otherwise it runs in-process.
+"""
+
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from engine.config import load_yaml
+
+
+CONFIG_PATH = Path("config/execution.yaml")
+
+# Imported by `serve` up front, so the first signal request is as fast
+# as the rest
+_SIGNAL_MODULES = (
+    "backtest.checkpoint",
+    "backtest.engine",
+    "backtest.portfolio",
+    "backtest.result_cache",
+    "engine.mean_reversion_strategy",
+    "engine.sma_trend_strategy",
+    "execution.order_ticket",
+    "execution.signals",
+)
+
+
+def _worker_address(cfg: Dict):
+    from execution.worker import WORKER_HOST, WORKER_PORT
+
+    wcfg = cfg.get("worker") or {}
+    return wcfg.get("host", WORKER_HOST), wcfg.get("port", WORKER_PORT)
+
+
+def _worker_timeout(cfg: Dict) -> float:
+    from execution.worker import REQUEST_TIMEOUT
+
+    return (cfg.get("worker") or {}).get("timeout", REQUEST_TIMEOUT)
+
+
+def _print_signals(signals: List[Dict]) -> None:
+    for s in signals:
+        print(
+            "%s | %s | %s %s qty %.2f | stop %.2f | %s"
+            % (
+                s["date"],
+                s["strategy"],
+                s["action"],
+                s["instrument"],
+                s["quantity"],
+                s["stop_loss"] if s["stop_loss"] else 0.0,
+                s["reason"],
+            )
+        )
+
+
+def cmd_signal(args) -> int:
+    """
+    Today's signals, from the worker when one is running.
+    """
+    if not args.no_worker:
+        import socket
+
+        from execution.worker import request
+
+        cfg = load_yaml(CONFIG_PATH)
+        host, port = _worker_address(cfg)
+        try:
+            reply = request({"command": "signal"}, host, port, timeout=_worker_timeout(cfg))
+        except socket.timeout:
+            print("Worker did not reply in time; running in-process", file=sys.stderr)
+            reply = None
+        except OSError:
+            reply = None
+
+        if reply is not None and reply["ok"]:
+            if reply["signals"]:
+                _print_signals(reply["signals"])
+                for path in reply.get("written", []):
+                    print(f"Written to {path}")
+            else:
+                print("No execution signals today")
+            return 0
+        if reply is not None:
+            print(f"Worker: {reply['error']}; running in-process", file=sys.stderr)
+
+    import main
+
+    main.main()
+    return 0
+
+
+def _serve_signal(message: Dict) -> Dict:
+    from dataclasses import asdict
+
+    import main
+
+    cfg = main.load_config()
+    if cfg["run"]["mode"] in ("paper", "live"):
+        raise ValueError("paper/live mode streams in the foreground: python main.py")
+
+    sinks = main.output_sinks(cfg)
+    try:
+        signals = main.run_signals(cfg, sinks)
+    finally:
+        sinks.close()
+
+    # The ticket and any file sinks, as the worker resolved them
+    written = [str(sink.path) for sink in sinks.sinks if getattr(sink, "path", None)]
+    return {"signals": [asdict(s) for s in signals], "written": written if signals else []}
+
+
+def cmd_serve(args) -> int:
+    """
+    Run the worker in the foreground until stopped.
+    """
+    import logging
+
+    import main
+
+    # Before importing anything else: dictConfig disables loggers that
+    # already exist
+    main.setup_logging()
+    from execution.worker import Worker
+
+    logger = logging.getLogger(__name__)
+    cfg = main.load_config()
+    host, port = _worker_address(cfg)
+
+    if args.stop:
+        from execution.worker import request
+
+        try:
+            request({"command": "stop"}, host, port)
+        except OSError:
+            print("No worker running", file=sys.stderr)
+            return 1
+        return 0
+
+    # Import the signal path and load the bars before the first request
+    started = time.perf_counter()
+    for module in _SIGNAL_MODULES:
+        importlib.import_module(module)
+    main.load_run_data(cfg)
+    logger.info("Worker warmed up in %.2fs", time.perf_counter() - started)
+
+    Worker({"signal": _serve_signal}, host, port).serve()
+    return 0
+
+
+def cmd_backtest(args) -> int:
+    """
+    Run the enabled sleeves over the configured instrument and print
+    each sleeve's result, re-priced under any configured cost models.
+    """
+    import main
+    from backtest.metrics import compute_max_drawdown
+    from backtest.portfolio import PortfolioEngine
+    from backtest.result_cache import ResultCache
+    from backtest.trade_log import EXIT_TYPES
+
+    main.setup_logging()
+    cfg = main.load_config()
+    data = main.load_run_data(cfg)
+
+    sleeves, _ = main.build_sleeves(cfg, data)
+    if not sleeves:
+        print("No sleeves enabled")
+        return 1
+
+    use_cache = cfg["run"].get("result_cache") and not args.no_cache
+    PortfolioEngine(sleeves).run(ResultCache() if use_cache else None)
+
+    for name, engine in sleeves.items():
+        equity = engine.equity_series()
+        print(
+            "%s: %d trades | final equity %.2f | max drawdown %.2f%s"
+            % (
+                name,
+                int(engine.trades.mask(*EXIT_TYPES).sum()),
+                equity[-1],
+                compute_max_drawdown(equity),
+                " | halted" if engine.halted else "",
+            )
+        )
+
+    if cfg["portfolio"].get("rebalance", {}).get("enabled"):
+        main.report_portfolio(cfg, sleeves)
+
+    if cfg.get("costs"):
+        for row in main.report_costs(cfg, sleeves).to_dict("records"):
+            print(
+                "%s under %s: final equity %.2f | fees %.2f | slippage %.2f | max drawdown %.2f"
+                % (
+                    row["sleeve"],
+                    row["model"],
+                    row["final_equity"],
+                    row["fees"],
+                    row["slippage"],
+                    row["max_drawdown"],
+                )
+            )
+
+    return 0
+
+
+def _grid_value(text: str):
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _grid_entry(text: str):
+    key, sep, values = text.partition("=")
+    if not key or not sep or not values:
+        raise argparse.ArgumentTypeError(f"expected key=v1,v2, got {text!r}")
+    return key, [_grid_value(v) for v in values.split(",")]
+
+
+def cmd_sweep(args) -> int:
+    """
+    run_allocation over a parameter grid on the configured instrument.
+    """
+    import main
+    from backtest.result_cache import RESULT_CACHE_DIR
+    from backtest.sweep import run_sweep
+
+    main.setup_logging()
+    cfg = main.load_config()
+    grid = dict(args.grid)
+
+    started = time.perf_counter()
+    results = run_sweep(
+        main.load_run_data(cfg),
+        cfg["run"]["capital"],
+        grid,
+        output_path=args.output,
+        max_workers=args.workers,
+        cache_dir=None if args.no_cache else RESULT_CACHE_DIR,
+    )
+
+    best = results.to_dict("records")[int(results["final_equity"].to_numpy().argmax())]
+    print(f"{len(results)} runs in {time.perf_counter() - started:.2f}s, written to {args.output}")
+    print("Best: " + ", ".join(f"{key}={best[key]}" for key in grid) + f" -> {best['final_equity']:.2f}")
+    return 0
+
+
+def cmd_ingest(args) -> int:
+    """
+    Stream a raw CSV into its ingest store under data/processed.
+    """
+    import main
+    from engine.ingest import CHUNK_ROWS, ingest_csv
+
+    main.setup_logging()
+    report = ingest_csv(
+        Path(args.path),
+        chunk_rows=args.chunk_rows or CHUNK_ROWS,
+        timezone=args.timezone,
+    )
+    print(
+        "%d rows (%s to %s) in %.2fs, %d gaps, written to %s"
+        % (
+            report["rows"],
+            report["first_date"],
+            report["last_date"],
+            report["seconds"],
+            report["gaps"],
+            report["store"],
+        )
+    )
+    return 0
+
+
+def cmd_bench(args, extra: List[str]) -> int:
+    """
+    benchmarks.run with the remaining arguments.
+    """
+    from benchmarks.run import main as bench_main
+
+    return bench_main(extra)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Algo-Trading command line")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    signal = commands.add_parser("signal", help="today's execution signals")
+    signal.add_argument("--no-worker", action="store_true", help="always run in-process")
+
+    serve = commands.add_parser("serve", help="keep a warm worker for `signal`")
+    serve.add_argument("--stop", action="store_true", help="stop the running worker")
+
+    backtest = commands.add_parser("backtest", help="run the enabled sleeves and report")
+    backtest.add_argument("--no-cache", action="store_true", help="ignore run.result_cache")
+
+    sweep = commands.add_parser("sweep", help="parameter sweep of run_allocation")
+    sweep.add_argument("--grid", nargs="+", required=True, type=_grid_entry, metavar="KEY=V1,V2")
+    sweep.add_argument("--workers", type=int)
+    sweep.add_argument("--output", default="output/sweep_results.csv")
+    sweep.add_argument("--no-cache", action="store_true", help="don't reuse cached sleeve runs")
+
+    ingest = commands.add_parser("ingest", help="stream a raw CSV into data/processed")
+    ingest.add_argument("path")
+    ingest.add_argument("--chunk-rows", type=int)
+    ingest.add_argument("--timezone")
+
+    commands.add_parser("bench", help="backtest benchmarks (see benchmarks/run.py)", add_help=False)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+
+    if args.command == "bench":
+        return cmd_bench(args, extra)
+    if extra:
+        parser.error("unrecognized arguments: " + " ".join(extra))
+
+    handlers = {
+        "signal": cmd_signal,
+        "serve": cmd_serve,
+        "backtest": cmd_backtest,
+        "sweep": cmd_sweep,
+        "ingest": cmd_ingest,
+    }
+    return handlers[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
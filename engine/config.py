@@ -0,0 +1,74 @@
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+# Not engine.data_loader.PROCESSED_DIR: importing it pulls in pandas
+CONFIG_CACHE_DIR = Path("data/processed/config")
+
+logger = logging.getLogger(__name__)
+
+# Parsed files by resolved path: (stamp, value)
+_parsed: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def _stamp(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_yaml(path: Path, cache_dir: Optional[Path] = CONFIG_CACHE_DIR) -> Any:
+    """
+    Parsed contents of a YAML file.
+
+    The result is kept in-process and pickled under cache_dir, both
+    keyed by the file's mtime and size, so a later run only parses the
+    file again after it changes and yaml is imported only then. Pass
+    cache_dir=None to skip the on-disk copy. Callers share the returned
+    object and must not mutate it.
+    """
+    path = Path(path)
+    key = str(path.resolve())
+    stamp = _stamp(path)
+
+    hit = _parsed.get(key)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+
+    cached = None
+    if cache_dir is not None:
+        cached = Path(cache_dir) / (key.strip(os.sep).replace(os.sep, "__") + ".pkl")
+        try:
+            with open(cached, "rb") as f:
+                cached_stamp, value = pickle.load(f)
+            if cached_stamp == stamp:
+                _parsed[key] = (stamp, value)
+                return value
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            pass
+
+    import yaml
+
+    with open(path, "r") as f:
+        value = yaml.safe_load(f)
+    _parsed[key] = (stamp, value)
+
+    if cached is not None:
+        try:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=cached.parent, suffix=".tmp")
+        except OSError as exc:
+            logger.warning("Could not cache parsed %s: %s", path, exc)
+            return value
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((stamp, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cached)
+        except OSError as exc:
+            Path(tmp).unlink(missing_ok=True)
+            logger.warning("Could not cache parsed %s: %s", path, exc)
+
+    return value
@@ -1,18 +1,57 @@
+import hashlib
+import logging
+import weakref
+
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from typing import Optional
+
+from engine.data_store import store_path, is_fresh, read_store, write_store
 
 
 REQUIRED_COLUMNS = {"date", "open", "high", "low", "close", "volume"}
 
+PROCESSED_DIR = Path("data/processed")
+
+logger = logging.getLogger(__name__)
+
 
-def load_csv(file_path: Path) -> pd.DataFrame:
+def load_csv(
+    file_path: Path,
+    cache_dir: Optional[Path] = PROCESSED_DIR,
+) -> pd.DataFrame:
     """
     Load market data from a CSV file with basic validation.
+
+    The validated frame is cached as memory-mapped columns under
+    cache_dir and reused while the CSV is unchanged. Pass
+    cache_dir=None to always parse the CSV.
     """
 
     if not file_path.exists():
         raise FileNotFoundError(f"Data file not found: {file_path}")
 
+    if cache_dir is not None:
+        store = store_path(file_path, cache_dir)
+        if is_fresh(store, file_path):
+            return read_store(store)
+
+    df = parse_csv(file_path)
+
+    if cache_dir is not None:
+        try:
+            write_store(df, store, raw_path=file_path, content_hash=dataset_hash(df))
+        except OSError as exc:
+            logger.warning("Could not cache %s: %s", file_path, exc)
+
+    return df
+
+
+def parse_csv(file_path: Path) -> pd.DataFrame:
+    """
+    Parse and validate a raw CSV, without touching the processed store.
+    """
     df = pd.read_csv(file_path)
 
     # Normalize column names
@@ -29,3 +68,55 @@ def load_csv(file_path: Path) -> pd.DataFrame:
     df = df.sort_values("date").reset_index(drop=True)
 
     return df
+
+
+# Hashes by id(frame), dropped when the frame is collected; see dataset_hash
+_hash_memo = {}
+
+
+def _columns_fingerprint(df: pd.DataFrame):
+    """
+    Length plus the buffer address and dtype of each hashed column:
+    cheap, and changed by any column reassignment.
+    """
+    parts = [len(df)]
+    for col in sorted(REQUIRED_COLUMNS):
+        values = df[col].to_numpy()
+        parts.append((values.__array_interface__["data"][0], values.dtype.str))
+    return tuple(parts)
+
+
+def dataset_hash(df: pd.DataFrame) -> str:
+    """
+    Content hash of the OHLCV columns.
+    Used to key caches of anything derived from a dataset.
+
+    The hash is remembered per frame, so repeated lookups (every
+    IndicatorCache hit) cost O(columns) rather than a pass over the
+    data. Reassigning a column invalidates it; frames are otherwise
+    treated as read-only once hashed, like the memory-mapped store's.
+    """
+    fingerprint = _columns_fingerprint(df)
+    hit = _hash_memo.get(id(df))
+    if hit is not None and hit[0] == fingerprint:
+        return hit[1]
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(len(df)).encode())
+
+    for col in sorted(REQUIRED_COLUMNS):
+        values = df[col].to_numpy()
+        if values.dtype.kind == "M":
+            values = values.view("i8")
+        elif values.dtype == object:
+            values = pd.util.hash_array(values)
+
+        h.update(col.encode())
+        h.update(values.dtype.str.encode())
+        h.update(np.ascontiguousarray(values))
+
+    digest = h.hexdigest()
+    if hit is None:
+        weakref.finalize(df, _hash_memo.pop, id(df), None)
+    _hash_memo[id(df)] = (fingerprint, digest)
+    return digest
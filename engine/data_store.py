@@ -0,0 +1,278 @@
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+STORE_VERSION = 1
+META_FILE = "meta.json"
+NPY_HEADER_LEN = 118
+
+
+def store_path(raw_path: Path, root: Path, tag: Optional[str] = None) -> Path:
+    """
+    Directory holding the processed columns for a raw file (and tag,
+    for more than one store per file). Named after the file's stem plus
+    a hash of its resolved path, so files of the same name in different
+    directories don't share a store.
+    """
+    digest = hashlib.sha1(str(Path(raw_path).resolve()).encode()).hexdigest()[:10]
+    name = raw_path.stem if tag is None else f"{raw_path.stem}_{tag}"
+    return root / f"{name}-{digest}"
+
+
+def _source_stat(raw_path: Path) -> Dict:
+    stat = raw_path.stat()
+    return {
+        "path": str(Path(raw_path).resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def read_meta(directory: Path) -> Optional[Dict]:
+    try:
+        with open(directory / META_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(directory: Path, raw_path: Path, params: Optional[Dict] = None) -> bool:
+    """
+    True when the store was built from the raw file as it is now, with
+    the same params (anything besides the file that shaped it, such as
+    a calendar fingerprint) as passed to write_store.
+    """
+    meta = read_meta(directory)
+    if meta is None or meta.get("version") != STORE_VERSION:
+        return False
+    if meta.get("params") != params:
+        return False
+
+    source = meta.get("source") or {}
+    stat = _source_stat(raw_path)
+    return (
+        source.get("path") == stat["path"]
+        and source.get("size") == stat["size"]
+        and source.get("mtime_ns") == stat["mtime_ns"]
+    )
+
+
+def write_store(
+    df: pd.DataFrame,
+    directory: Path,
+    raw_path: Optional[Path] = None,
+    content_hash: Optional[str] = None,
+    params: Optional[Dict] = None,
+) -> None:
+    """
+    Write each column of a validated, date-sorted frame to its own .npy
+    file, with dates as int64 nanoseconds, plus a meta.json describing
+    the source file, content hash and params (JSON-serializable).
+
+    The store is built in a sibling directory and swapped in, so readers
+    never see a half-written store.
+    """
+    tmp = _fresh_tmp(directory)
+
+    columns = []
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype.kind == "M":
+            values = values.astype("datetime64[ns]").view("i8")
+            kind = "datetime64[ns]"
+        else:
+            kind = values.dtype.str
+
+        np.save(tmp / f"{col}.npy", values, allow_pickle=values.dtype == object)
+        columns.append({"name": col, "dtype": kind})
+
+    _write_meta(tmp, len(df), columns, content_hash, raw_path, params)
+    _swap(tmp, directory)
+
+
+def _fresh_tmp(directory: Path) -> Path:
+    # Unique per writer, so concurrent writers (threads included) never
+    # build into the same directory
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    return Path(tempfile.mkdtemp(prefix=f"{directory.name}.tmp-", dir=directory.parent))
+
+
+def _write_meta(
+    directory: Path,
+    rows: int,
+    columns: List[Dict],
+    content_hash: Optional[str],
+    raw_path: Optional[Path],
+    params: Optional[Dict] = None,
+) -> None:
+    meta = {
+        "version": STORE_VERSION,
+        "rows": rows,
+        "columns": columns,
+        "dataset_hash": content_hash,
+        "source": _source_stat(raw_path) if raw_path is not None else None,
+        "params": params,
+    }
+    with open(directory / META_FILE, "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def _swap(tmp: Path, directory: Path) -> None:
+    # Rename the old store aside before moving the new one in: a reader
+    # sees either store whole (or, briefly, none, and parses the raw
+    # file), never a partly deleted one. Readers already holding the old
+    # files keep them, since they are only unlinked once renamed away.
+    old = Path(tempfile.mkdtemp(prefix=f"{directory.name}.old-", dir=directory.parent))
+    try:
+        try:
+            os.replace(directory, old)
+        except FileNotFoundError:
+            pass
+        try:
+            os.replace(tmp, directory)
+        except OSError:
+            # A concurrent writer swapped its store in first; it was
+            # built from the same source, so keep it and drop ours
+            if not (directory / META_FILE).exists():
+                raise
+            shutil.rmtree(tmp, ignore_errors=True)
+    finally:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _npy_header(dtype: np.dtype, rows: int) -> bytes:
+    # Fixed-size v1.0 header, so it can be rewritten once the row count
+    # is known; 128 bytes in all keeps the data 64-byte aligned
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+        dtype.str,
+        rows,
+    )
+    return (
+        np.lib.format.magic(1, 0)
+        + struct.pack("<H", NPY_HEADER_LEN)
+        + header.ljust(NPY_HEADER_LEN - 1).encode("latin1")
+        + b"\n"
+    )
+
+
+class StoreWriter:
+    """
+    Builds a store chunk by chunk, for data too large to hold in memory.
+
+    Each append writes the chunk's columns straight to their .npy files;
+    close fills in the headers and meta.json and swaps the store in, so
+    the result is the same as write_store on the concatenated frame.
+    Abandoning a writer (or an exception inside a with block) leaves any
+    existing store untouched.
+    """
+
+    def __init__(self, directory: Path, raw_path: Optional[Path] = None):
+        self.directory = directory
+        self.raw_path = raw_path
+        self.rows = 0
+        self._tmp = _fresh_tmp(directory)
+        self._files = {}
+        self._dtypes: Dict[str, np.dtype] = {}
+        self._columns: List[Dict] = []
+
+    def append(self, columns: Dict[str, np.ndarray]) -> None:
+        """
+        Write one chunk: a mapping of column name to equal-length arrays.
+        """
+        if not self._files:
+            for name, values in columns.items():
+                is_date = values.dtype.kind == "M"
+                dtype = np.dtype(np.int64) if is_date else values.dtype
+                self._columns.append(
+                    {"name": name, "dtype": "datetime64[ns]" if is_date else dtype.str}
+                )
+                self._dtypes[name] = dtype
+                self._files[name] = open(self._tmp / f"{name}.npy", "wb")
+                self._files[name].write(_npy_header(dtype, 0))
+
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) != 1 or set(columns) != set(self._files):
+            raise ValueError("Every chunk needs the same columns, of equal length")
+
+        for name, values in columns.items():
+            if values.dtype.kind == "M":
+                values = values.astype("datetime64[ns]").view("i8")
+            if values.dtype != self._dtypes[name]:
+                raise ValueError(f"Column {name} changed dtype")
+            np.ascontiguousarray(values).tofile(self._files[name])
+
+        self.rows += lengths.pop()
+
+    def close(
+        self,
+        hash_fn: Optional[Callable[[pd.DataFrame], str]] = None,
+    ) -> None:
+        """
+        Finish the files and swap the store in. hash_fn, if given, is
+        applied to the finished (memory-mapped) store to record its
+        content hash.
+        """
+        for name, f in self._files.items():
+            f.seek(0)
+            f.write(_npy_header(self._dtypes[name], self.rows))
+            f.close()
+        self._files = {}
+
+        _write_meta(self._tmp, self.rows, self._columns, None, self.raw_path)
+        if hash_fn is not None:
+            content_hash = hash_fn(read_store(self._tmp))
+            _write_meta(self._tmp, self.rows, self._columns, content_hash, self.raw_path)
+
+        _swap(self._tmp, self.directory)
+
+    def abort(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        shutil.rmtree(self._tmp, ignore_errors=True)
+
+    def __enter__(self) -> "StoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Not closed (or failed): discard the partial store
+        if self._tmp.exists():
+            self.abort()
+
+
+def read_store(directory: Path, mmap: bool = True) -> pd.DataFrame:
+    """
+    Load a store written by write_store.
+
+    Numeric columns are memory-mapped copy-on-write, so processes
+    reading the same store share pages and startup does no parsing.
+    """
+    meta = read_meta(directory)
+    if meta is None:
+        raise FileNotFoundError(f"No processed data store at {directory}")
+
+    columns = {}
+    for spec in meta["columns"]:
+        name = spec["name"]
+        if spec["dtype"] == "|O":
+            values = np.load(directory / f"{name}.npy", allow_pickle=True)
+        else:
+            # Plain ndarray view over the mapping, not an np.memmap subclass
+            values = np.asarray(
+                np.load(directory / f"{name}.npy", mmap_mode="c" if mmap else None)
+            )
+
+        if spec["dtype"] == "datetime64[ns]":
+            values = values.view("datetime64[ns]")
+        columns[name] = values
+
+    return pd.DataFrame(columns, copy=False)
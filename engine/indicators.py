@@ -1,10 +1,17 @@
+import math
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+import numpy as np
 import pandas as pd
 
+from engine.data_loader import dataset_hash
 
-def compute_atr(data: pd.DataFrame, period: int = 14) -> float:
+
+def compute_atr_series(data: pd.DataFrame, period: int = 14) -> pd.Series:
     """
     Compute ATR using simple moving average of True Range.
-    Returns the latest ATR value.
+    Returns the full ATR series, aligned with data.
     """
     high = data["high"]
     low = data["low"]
@@ -21,6 +28,288 @@ def compute_atr(data: pd.DataFrame, period: int = 14) -> float:
         axis=1,
     ).max(axis=1)
 
-    atr = tr.rolling(window=period).mean()
+    return tr.rolling(window=period).mean()
+
+
+def compute_atr(data: pd.DataFrame, period: int = 14) -> float:
+    """
+    Compute ATR using simple moving average of True Range.
+    Returns the latest ATR value.
+    """
+    return compute_atr_series(data, period).iloc[-1]
+
+
+def _pack(values: np.ndarray, valid: np.ndarray):
+    """
+    Move each column's valid rows to the top, keeping their order.
+    Returns the packed array and the row order that undoes it.
+    """
+    order = np.argsort(~valid, axis=0, kind="stable")
+    return np.take_along_axis(values, order, axis=0), order
+
+
+def _unpack(packed: np.ndarray, order: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Scatter packed rows back to their panel positions, NaN where a
+    column has no bar.
+    """
+    values = np.empty_like(packed)
+    np.put_along_axis(values, order, packed, axis=0)
+    values[~valid] = np.nan
+    return values
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Column-wise rolling mean of a 2-D (bars, symbols) array.
+
+    Each column's windows run over its own non-NaN rows, so the result
+    at a valid row matches pandas' rolling().mean() on that column with
+    the missing rows dropped; missing rows stay NaN.
+    """
+    valid = ~np.isnan(values)
+    if valid.all():
+        return pd.DataFrame(values).rolling(window).mean().to_numpy()
+
+    packed, order = _pack(values, valid)
+    return _unpack(pd.DataFrame(packed).rolling(window).mean().to_numpy(), order, valid)
+
+
+def compute_atr_panel(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14,
+) -> np.ndarray:
+    """
+    ATR for every column of (bars, symbols) arrays in one pass.
+
+    Each column is computed over the rows where it has a close, so a
+    symbol with missing dates gets the same values as
+    compute_atr_series on its own bars.
+    """
+    valid = ~np.isnan(close)
+    if not valid.all():
+        high, order = _pack(high, valid)
+        low, _ = _pack(low, valid)
+        close, _ = _pack(close, valid)
+
+    prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+
+    # fmax skips NaN like DataFrame.max does
+    tr = np.fmax(
+        np.fmax(high - low, np.abs(high - prev_close)),
+        np.abs(low - prev_close),
+    )
+    atr = pd.DataFrame(tr).rolling(period).mean().to_numpy()
+
+    if valid.all():
+        return atr
+    return _unpack(atr, order, valid)
+
+
+class RollingMean:
+    """
+    Streaming simple moving average over a fixed window.
+
+    Keeps a ring buffer and a compensated running sum, updated in the
+    same order as pandas' rolling().mean(), so every value matches the
+    batch computation bit for bit.
+    """
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("Rolling window must be >= 1")
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        self._buffer = [math.nan] * self.window
+        self._count = 0
+        self._nobs = 0
+        self._neg_ct = 0
+        self._sum = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same_ct = 0
+        self._prev = math.nan
+        self.value = math.nan
+
+    def _add(self, x: float) -> None:
+        if x != x:
+            return
+        self._nobs += 1
+        y = x - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, x) < 0:
+            self._neg_ct += 1
+        if x == self._prev:
+            self._same_ct += 1
+        else:
+            self._same_ct = 1
+        self._prev = x
+
+    def _remove(self, x: float) -> None:
+        if x != x:
+            return
+        self._nobs -= 1
+        y = -x - self._comp_remove
+        t = self._sum + y
+        self._comp_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, x) < 0:
+            self._neg_ct -= 1
+
+    def update(self, x: float) -> float:
+        """
+        Push a new value and return the current mean (NaN until the
+        window is full).
+        """
+        slot = self._count % self.window
+
+        if self._count == 0 or self.window == 1:
+            # pandas restarts the accumulator when windows don't overlap
+            self._nobs = self._neg_ct = self._same_ct = 0
+            self._sum = self._comp_add = self._comp_remove = 0.0
+            self._prev = x
+        elif self._count >= self.window:
+            self._remove(self._buffer[slot])
+
+        self._buffer[slot] = x
+        self._count += 1
+        self._add(x)
+
+        if self._nobs < self.window:
+            self.value = math.nan
+        elif self._same_ct >= self._nobs:
+            self.value = self._prev
+        else:
+            result = self._sum / self._nobs
+            if self._neg_ct == 0 and result < 0:
+                result = 0.0
+            elif self._neg_ct == self._nobs and result > 0:
+                result = 0.0
+            self.value = result
+
+        return self.value
+
+
+class RollingATR:
+    """
+    Streaming counterpart of compute_atr.
+    After each update, value equals compute_atr on all bars seen so far.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._mean = RollingMean(period)
+        self.reset()
+
+    def reset(self) -> None:
+        self._mean.reset()
+        self._prev_close = math.nan
+        self.value = math.nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        prev_close = self._prev_close
+        ranges = [
+            r
+            for r in (high - low, abs(high - prev_close), abs(low - prev_close))
+            if r == r
+        ]
+        tr = max(ranges) if ranges else math.nan
+        self._prev_close = close
+        self.value = self._mean.update(tr)
+        return self.value
+
+
+class IndicatorCache:
+    """
+    Memoizes full indicator series per (dataset, indicator, params).
+
+    Each series is computed once over the whole dataset and returned as
+    a read-only array, so the value at any bar is an O(1) index lookup.
+    Least recently used series are evicted beyond max_entries.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self._series: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._series)
+
+    def clear(self) -> None:
+        self._series.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        data: pd.DataFrame,
+        name: str,
+        params: Tuple,
+        compute: Callable[[pd.DataFrame], pd.Series],
+    ) -> np.ndarray:
+        """
+        Return the cached series for key, computing it on a miss.
+        """
+        key = (dataset_hash(data), name, params)
+
+        series = self._series.get(key)
+        if series is not None:
+            self._series.move_to_end(key)
+            self.hits += 1
+            return series
+
+        self.misses += 1
+        series = np.asarray(compute(data), dtype=np.float64)
+        series.setflags(write=False)
+
+        self._series[key] = series
+        if len(self._series) > self.max_entries:
+            self._series.popitem(last=False)
+
+        return series
+
+    def sma(self, data: pd.DataFrame, window: int, column: str = "close"):
+        return self.get(
+            data,
+            "sma",
+            (column, window),
+            lambda d: d[column].rolling(window).mean().to_numpy(),
+        )
+
+    def ema(self, data: pd.DataFrame, span: int, column: str = "close"):
+        return self.get(
+            data,
+            "ema",
+            (column, span),
+            lambda d: d[column].ewm(span=span, adjust=False).mean().to_numpy(),
+        )
+
+    def rolling_std(self, data: pd.DataFrame, window: int, column: str = "close"):
+        return self.get(
+            data,
+            "rolling_std",
+            (column, window),
+            lambda d: d[column].rolling(window).std().to_numpy(),
+        )
+
+    def atr(self, data: pd.DataFrame, period: int = 14):
+        return self.get(
+            data,
+            "atr",
+            (period,),
+            lambda d: compute_atr_series(d, period).to_numpy(),
+        )
+
 
-    return atr.iloc[-1]
+# Process-wide cache shared by strategies, engines and sweeps
+indicator_cache = IndicatorCache()
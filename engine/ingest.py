@@ -0,0 +1,210 @@
+import csv
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from engine.data_loader import PROCESSED_DIR, REQUIRED_COLUMNS, dataset_hash
+from engine.data_store import StoreWriter, store_path
+
+
+CHUNK_ROWS = 1_000_000
+
+# Ingested stores are tagged apart from load_csv's cache: their dtypes,
+# columns and dates (tz-aware converted to naive) differ from parse_csv's
+INGEST_TAG = "ingest"
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+# Gaps between consecutive bars longer than this are reported
+MAX_GAP = pd.Timedelta(days=5)
+
+logger = logging.getLogger(__name__)
+
+
+def read_header(raw_path: Path) -> Dict[str, str]:
+    """
+    Map normalized (lower-case, stripped) column names to the names as
+    written in the file. Raises if a required column is missing.
+    """
+    with open(raw_path, "r", newline="") as f:
+        header = next(csv.reader(f), [])
+
+    columns = {name.lower().strip(): name for name in header}
+    missing = REQUIRED_COLUMNS - set(columns)
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+    return columns
+
+
+def iter_chunks(
+    raw_path: Path,
+    chunk_rows: int = CHUNK_ROWS,
+    price_dtype=np.float64,
+    timezone: Optional[str] = None,
+    date_format: Optional[str] = None,
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Read the OHLCV columns of a raw CSV chunk_rows at a time, with
+    explicit dtypes: prices as price_dtype, volume as float64 and date
+    as int64 nanoseconds since the epoch.
+
+    Timezone-aware dates are converted to timezone (UTC when None) and
+    stored as naive local time; naive dates are kept as they are.
+    """
+    columns = read_header(raw_path)
+    dtypes = {columns[c]: price_dtype for c in PRICE_COLUMNS}
+    dtypes[columns["volume"]] = np.float64
+    dtypes[columns["date"]] = str
+
+    reader = pd.read_csv(
+        raw_path,
+        usecols=[columns[c] for c in REQUIRED_COLUMNS],
+        dtype=dtypes,
+        chunksize=chunk_rows,
+    )
+
+    for chunk in reader:
+        dates = pd.to_datetime(chunk[columns["date"]], format=date_format, errors="raise")
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_convert(timezone or "UTC").dt.tz_localize(None)
+
+        out = {"date": dates.to_numpy().astype("datetime64[ns]").view("i8")}
+        for c in (*PRICE_COLUMNS, "volume"):
+            out[c] = chunk[columns[c]].to_numpy()
+        yield out
+
+
+class ChunkValidator:
+    """
+    Checks consecutive chunks of one file: strictly increasing dates
+    across chunk boundaries, OHLC consistency and missing values, which
+    raise ValueError with the offending row number; and gaps longer than
+    max_gap, which are counted and reported.
+    """
+
+    def __init__(self, max_gap: pd.Timedelta = MAX_GAP):
+        self.max_gap = pd.Timedelta(max_gap).value
+        self.rows = 0
+        self.gaps = 0
+        self.largest_gap = 0
+        self.first_date: Optional[int] = None
+        self.last_date: Optional[int] = None
+
+    def _fail(self, mask: np.ndarray, message: str) -> None:
+        row = self.rows + int(np.argmax(mask))
+        raise ValueError(f"{message} at data row {row}")
+
+    def check(self, chunk: Dict[str, np.ndarray]) -> None:
+        dates = chunk["date"]
+        if not len(dates):
+            return
+
+        prices = [chunk[c] for c in PRICE_COLUMNS]
+        for name, values in zip(PRICE_COLUMNS, prices):
+            if np.isnan(values).any():
+                self._fail(np.isnan(values), f"Missing {name}")
+        if np.isnan(chunk["volume"]).any():
+            self._fail(np.isnan(chunk["volume"]), "Missing volume")
+
+        open_, high, low, close = prices
+        bad = (
+            (low > high)
+            | (open_ > high)
+            | (close > high)
+            | (open_ < low)
+            | (close < low)
+            | (low <= 0)
+        )
+        if bad.any():
+            self._fail(bad, "Inconsistent OHLC")
+        if (chunk["volume"] < 0).any():
+            self._fail(chunk["volume"] < 0, "Negative volume")
+
+        prev = dates[0] - 1 if self.last_date is None else self.last_date
+        steps = np.diff(dates, prepend=prev)
+        if (steps <= 0).any():
+            self._fail(steps <= 0, "Dates not strictly increasing")
+
+        # The first step of the file is 1ns, never a gap
+        self.gaps += int((steps > self.max_gap).sum())
+        self.largest_gap = max(self.largest_gap, int(steps.max()))
+
+        if self.first_date is None:
+            self.first_date = int(dates[0])
+        self.last_date = int(dates[-1])
+        self.rows += len(dates)
+
+
+def ingest_csv(
+    raw_path: Path,
+    cache_dir: Path = PROCESSED_DIR,
+    chunk_rows: int = CHUNK_ROWS,
+    price_dtype=np.float64,
+    max_gap: pd.Timedelta = MAX_GAP,
+    timezone: Optional[str] = None,
+    date_format: Optional[str] = None,
+) -> Dict:
+    """
+    Stream a raw CSV into its ingest store (store_path with INGEST_TAG)
+    in fixed-size chunks. load_csv never reads this store; open it with
+    read_store(report["store"]).
+
+    Each chunk is parsed with explicit dtypes, validated against the
+    rows before it and appended to the store's column files, so peak
+    memory depends on chunk_rows rather than the file size. The file
+    must already be sorted by date. On a validation error nothing is
+    written and any existing store is kept.
+
+    Returns a report with the store directory, row count, elapsed time,
+    throughput in rows per second and the gaps found.
+    """
+    if not raw_path.exists():
+        raise FileNotFoundError(f"Data file not found: {raw_path}")
+
+    validator = ChunkValidator(max_gap)
+    started = time.perf_counter()
+
+    store = store_path(raw_path, cache_dir, tag=INGEST_TAG)
+
+    with StoreWriter(store, raw_path=raw_path) as writer:
+        for chunk in iter_chunks(raw_path, chunk_rows, price_dtype, timezone, date_format):
+            validator.check(chunk)
+            chunk["date"] = chunk["date"].view("datetime64[ns]")
+            writer.append(chunk)
+
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "%s: %d rows (%.0f rows/s)",
+                raw_path.name,
+                validator.rows,
+                validator.rows / elapsed if elapsed > 0 else 0.0,
+            )
+
+        writer.close(dataset_hash)
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "store": store,
+        "rows": validator.rows,
+        "seconds": elapsed,
+        "rows_per_sec": validator.rows / elapsed if elapsed > 0 else 0.0,
+        "gaps": validator.gaps,
+        "largest_gap": pd.Timedelta(validator.largest_gap),
+        "first_date": pd.Timestamp(validator.first_date) if validator.rows else None,
+        "last_date": pd.Timestamp(validator.last_date) if validator.rows else None,
+    }
+
+    logger.info(
+        "Ingested %s: %d rows in %.2fs (%.0f rows/s), %d gaps > %s",
+        raw_path.name,
+        report["rows"],
+        report["seconds"],
+        report["rows_per_sec"],
+        report["gaps"],
+        pd.Timedelta(max_gap),
+    )
+    return report
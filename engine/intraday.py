@@ -0,0 +1,243 @@
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from engine.config import load_yaml
+from engine.data_loader import PROCESSED_DIR, dataset_hash
+from engine.data_store import is_fresh, read_store, store_path, write_store
+from engine.ingest import CHUNK_ROWS, ChunkValidator, iter_chunks
+
+
+CALENDAR_DIR = Path("data/calendar")
+SETTINGS_PATH = Path("config/settings.yaml")
+
+# NSE cash-market hours, used on weekdays when no calendar file exists
+DEFAULT_SESSION = ("09:15", "15:30")
+
+DAILY = ("1d", "d", "session")
+
+logger = logging.getLogger(__name__)
+
+
+def market_timezone(settings_path: Path = SETTINGS_PATH) -> str:
+    """
+    market.timezone from config/settings.yaml.
+    """
+    return load_yaml(settings_path)["market"]["timezone"]
+
+
+class TradingCalendar:
+    """
+    Trading sessions by date, in exchange-local time.
+
+    sessions has columns date, open and close (HH:MM); dates that are
+    not listed are holidays. Without sessions, every weekday trades
+    DEFAULT_SESSION.
+    """
+
+    def __init__(self, sessions: Optional[pd.DataFrame] = None):
+        self.sessions = None
+        if sessions is not None:
+            days = pd.to_datetime(sessions["date"]).to_numpy().astype("datetime64[D]")
+            self.sessions = pd.DataFrame(
+                {
+                    "open": pd.to_timedelta(sessions["open"] + ":00").to_numpy(),
+                    "close": pd.to_timedelta(sessions["close"] + ":00").to_numpy(),
+                },
+                index=pd.DatetimeIndex(days),
+            )
+
+    @classmethod
+    def load(cls, name: str = "nse", directory: Path = CALENDAR_DIR) -> "TradingCalendar":
+        """
+        Calendar from data/calendar/<name>.csv, or weekday default
+        hours when the file doesn't exist.
+        """
+        path = directory / f"{name}.csv"
+        if not path.exists():
+            logger.info("No calendar at %s; using weekday %s-%s", path, *DEFAULT_SESSION)
+            return cls()
+        return cls(pd.read_csv(path, dtype=str))
+
+    def fingerprint(self) -> str:
+        """
+        Hash of the sessions (or the default hours), so resampled data
+        cached under an older calendar can be told apart.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        if self.sessions is None:
+            h.update("default {} {}".format(*DEFAULT_SESSION).encode())
+        else:
+            h.update(self.sessions.index.to_numpy().view("i8").tobytes())
+            for column in ("open", "close"):
+                h.update(self.sessions[column].to_numpy().view("i8").tobytes())
+        return h.hexdigest()
+
+    def session_bounds(self, days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Session open and close as int64 local nanoseconds for each day
+        (datetime64[D]); both are -1 on days with no session.
+        """
+        midnight = days.astype("datetime64[ns]").view("i8")
+
+        if self.sessions is None:
+            trading = np.is_busday(days)
+            open_ns = np.full(len(days), pd.Timedelta(DEFAULT_SESSION[0] + ":00").value)
+            close_ns = np.full(len(days), pd.Timedelta(DEFAULT_SESSION[1] + ":00").value)
+        else:
+            rows = self.sessions.index.get_indexer(days.astype("datetime64[ns]"))
+            trading = rows >= 0
+            open_ns = self.sessions["open"].to_numpy().view("i8")[rows]
+            close_ns = self.sessions["close"].to_numpy().view("i8")[rows]
+
+        return (
+            np.where(trading, midnight + open_ns, -1),
+            np.where(trading, midnight + close_ns, -1),
+        )
+
+
+def _bucket(
+    times: np.ndarray,
+    calendar: TradingCalendar,
+    timeframe: str,
+) -> np.ndarray:
+    """
+    Start of the resampled bar each timestamp falls in, aligned to its
+    session's open so no bar spans two sessions; -1 outside sessions.
+    """
+    days = times.view("datetime64[ns]").astype("datetime64[D]")
+    open_ns, close_ns = calendar.session_bounds(days)
+    in_session = (times >= open_ns) & (times < close_ns)
+
+    if timeframe.lower() in DAILY:
+        bucket = days.astype("datetime64[ns]").view("i8")
+    else:
+        step = pd.Timedelta(timeframe).value
+        bucket = open_ns + (times - open_ns) // step * step
+
+    return np.where(in_session, bucket, -1)
+
+
+def _aggregate(bucket: np.ndarray, cols: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    OHLCV of each run of equal buckets in date-sorted rows.
+    """
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(bucket)] - 1
+
+    return {
+        "date": bucket[starts],
+        "open": cols["open"][starts],
+        "high": np.maximum.reduceat(cols["high"], starts),
+        "low": np.minimum.reduceat(cols["low"], starts),
+        "close": cols["close"][ends],
+        "volume": np.add.reduceat(cols["volume"], starts),
+    }
+
+
+def resample_intraday(
+    raw_path: Path,
+    timeframe: str,
+    calendar: Optional[TradingCalendar] = None,
+    timezone: Optional[str] = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> pd.DataFrame:
+    """
+    Resample a date-sorted intraday CSV to timeframe ("5min", "1h",
+    "1d", ...) without loading it whole.
+
+    Rows are read and validated chunk_rows at a time by the ingestion
+    reader, with aware timestamps converted to exchange-local time
+    (naive ones are taken as local already), and bucketed from each
+    session's open; rows outside a session are dropped. The last,
+    possibly incomplete, bar of every chunk is carried into the next,
+    so chunking never splits a bar. Peak memory is one chunk plus the
+    resampled output.
+    """
+    calendar = calendar or TradingCalendar.load()
+    timezone = timezone or market_timezone()
+
+    fields = ("open", "high", "low", "close", "volume")
+    carry = {field: np.empty(0) for field in fields}
+    carry_bucket = np.empty(0, dtype=np.int64)
+    parts = []
+    validator = ChunkValidator(max_gap=pd.Timedelta.max)
+
+    for chunk in iter_chunks(raw_path, chunk_rows, timezone=timezone):
+        validator.check(chunk)
+        times = chunk["date"]
+
+        bucket = _bucket(times, calendar, timeframe)
+        keep = bucket >= 0
+
+        bucket = np.concatenate([carry_bucket, bucket[keep]])
+        cols = {
+            field: np.concatenate(
+                [carry[field], chunk[field].astype(np.float64)[keep]]
+            )
+            for field in fields
+        }
+        if not len(bucket):
+            continue
+
+        # Hold back the last bar; the next chunk may extend it
+        tail = np.searchsorted(bucket, bucket[-1])
+        if tail:
+            parts.append(_aggregate(bucket[:tail], {f: v[:tail] for f, v in cols.items()}))
+        carry_bucket = bucket[tail:]
+        carry = {f: v[tail:] for f, v in cols.items()}
+
+    if len(carry_bucket):
+        parts.append(_aggregate(carry_bucket, carry))
+
+    if not parts:
+        return pd.DataFrame(columns=["date", *fields])
+
+    df = pd.DataFrame(
+        {field: np.concatenate([p[field] for p in parts]) for field in ("date", *fields)}
+    )
+    df["date"] = df["date"].to_numpy().view("datetime64[ns]")
+    return df
+
+
+def load_intraday(
+    raw_path: Path,
+    timeframe: str,
+    cache_dir: Optional[Path] = PROCESSED_DIR,
+    calendar: Optional[TradingCalendar] = None,
+    timezone: Optional[str] = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> pd.DataFrame:
+    """
+    Intraday data resampled to timeframe, cached per timeframe under
+    cache_dir (one store per timeframe) and reused while the raw file, the
+    calendar and the timezone are unchanged. Pass cache_dir=None to
+    always resample.
+    """
+    if not raw_path.exists():
+        raise FileNotFoundError(f"Data file not found: {raw_path}")
+
+    calendar = calendar or TradingCalendar.load()
+    timezone = timezone or market_timezone()
+    params = {"timezone": timezone, "calendar": calendar.fingerprint()}
+
+    if cache_dir is not None:
+        store = store_path(raw_path, cache_dir, tag=timeframe)
+        if is_fresh(store, raw_path, params):
+            return read_store(store)
+
+    df = resample_intraday(raw_path, timeframe, calendar, timezone, chunk_rows)
+
+    if cache_dir is not None:
+        try:
+            write_store(
+                df, store, raw_path=raw_path, content_hash=dataset_hash(df), params=params
+            )
+        except OSError as exc:
+            logger.warning("Could not cache %s at %s: %s", raw_path, timeframe, exc)
+
+    return df
@@ -1,15 +1,26 @@
+import numpy as np
 import pandas as pd
 
-from engine.strategy import Strategy, Signal
-from engine.indicators import compute_atr
+from engine.strategy import StreamingStrategy, Signal, Bar
+from engine.indicators import (
+    compute_atr,
+    RollingMean,
+    RollingATR,
+    compute_atr_panel,
+    indicator_cache,
+    rolling_mean,
+)
 
 
-class MeanReversionStrategy(Strategy):
+class MeanReversionStrategy(StreamingStrategy):
     """
     Mean reversion strategy for sideways regimes.
 
     Active only when price is below SMA-200.
     Enters when price deviates below SMA-20 by 1 ATR.
+
+    With short=True it also trades the mirror image above SMA-200:
+    short when price deviates above SMA-20 by 1 ATR.
     """
 
     def __init__(
@@ -18,11 +29,14 @@ class MeanReversionStrategy(Strategy):
         regime_window: int = 200,
         atr_period: int = 14,
         entry_atr: float = 1.0,
+        short: bool = False,
     ):
         self.mean_window = mean_window
         self.regime_window = regime_window
         self.atr_period = atr_period
         self.entry_atr = entry_atr
+        self.short = short
+        self.reset()
 
     def generate_signal(self, data: pd.DataFrame):
         # Need enough data for regime + mean + ATR
@@ -36,8 +50,8 @@ class MeanReversionStrategy(Strategy):
         sma_mean = closes.rolling(self.mean_window).mean().iloc[-1]
         price = closes.iloc[-1]
 
-        # Regime filter: disable during uptrend
-        if price > sma_regime:
+        # Regime filter: disable during uptrend, unless shorting it
+        if price > sma_regime and not self.short:
             return Signal(direction=0)
 
         atr = compute_atr(data, self.atr_period)
@@ -45,7 +59,88 @@ class MeanReversionStrategy(Strategy):
             return Signal(direction=0)
 
         # Mean reversion entry
-        if price < sma_mean - (self.entry_atr * atr):
+        if price > sma_regime:
+            if price > sma_mean + (self.entry_atr * atr):
+                return Signal(direction=-1)
+        elif price < sma_mean - (self.entry_atr * atr):
+            return Signal(direction=1)
+
+        return Signal(direction=0)
+
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        closes = data["close"].to_numpy(dtype=np.float64)
+
+        return self._signals(
+            closes,
+            indicator_cache.sma(data, self.regime_window),
+            indicator_cache.sma(data, self.mean_window),
+            indicator_cache.atr(data, self.atr_period),
+            np.arange(1, len(closes) + 1),
+        )
+
+    def generate_panel_signals(self, panel) -> np.ndarray:
+        return self._signals(
+            panel.close,
+            rolling_mean(panel.close, self.regime_window),
+            rolling_mean(panel.close, self.mean_window),
+            compute_atr_panel(panel.high, panel.low, panel.close, self.atr_period),
+            panel.bars_seen(),
+        )
+
+    def _signals(self, closes, sma_regime, sma_mean, atr, bars_seen) -> np.ndarray:
+        # Works on 1-D series and 2-D (bars, symbols) panels alike.
+        # Written as negations so NaN windows fall through like the
+        # scalar path does.
+        min_len = max(self.mean_window, self.regime_window, self.atr_period)
+
+        entry = (
+            ~(closes > sma_regime)
+            & (atr > 0)
+            & (closes < sma_mean - (self.entry_atr * atr))
+            & (bars_seen >= min_len)
+        )
+        signals = entry.astype(np.int64)
+
+        if self.short:
+            short = (
+                (closes > sma_regime)
+                & (atr > 0)
+                & (closes > sma_mean + (self.entry_atr * atr))
+                & (bars_seen >= min_len)
+            )
+            signals -= short
+
+        return signals
+
+    def reset(self) -> None:
+        self._sma_regime = RollingMean(self.regime_window)
+        self._sma_mean = RollingMean(self.mean_window)
+        self._atr = RollingATR(self.atr_period)
+        self._bars = 0
+
+    def on_bar(self, bar: Bar) -> Signal:
+        # Indicators advance on every bar, whether or not we trade on it
+        sma_regime = self._sma_regime.update(bar.close)
+        sma_mean = self._sma_mean.update(bar.close)
+        atr = self._atr.update(bar.high, bar.low, bar.close)
+        self._bars += 1
+
+        min_len = max(self.mean_window, self.regime_window, self.atr_period)
+        if self._bars < min_len:
+            return Signal(direction=0)
+
+        price = bar.close
+
+        if price > sma_regime and not self.short:
+            return Signal(direction=0)
+
+        if pd.isna(atr) or atr <= 0:
+            return Signal(direction=0)
+
+        if price > sma_regime:
+            if price > sma_mean + (self.entry_atr * atr):
+                return Signal(direction=-1)
+        elif price < sma_mean - (self.entry_atr * atr):
             return Signal(direction=1)
 
         return Signal(direction=0)
@@ -1,9 +1,11 @@
+import numpy as np
 import pandas as pd
 
-from engine.strategy import Strategy, Signal
+from engine.strategy import StreamingStrategy, Signal, Bar
+from engine.indicators import RollingMean, indicator_cache, rolling_mean
 
 
-class SMATrendStrategy(Strategy):
+class SMATrendStrategy(StreamingStrategy):
     """
     Trend-following strategy using SMA-200 regime.
 
@@ -13,6 +15,7 @@ class SMATrendStrategy(Strategy):
 
     def __init__(self, window: int = 200):
         self.window = window
+        self.reset()
 
     def generate_signal(self, data: pd.DataFrame):
         # Not enough data to compute SMA
@@ -27,3 +30,36 @@ class SMATrendStrategy(Strategy):
             return Signal(direction=1)
 
         return Signal(direction=0)
+
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        closes = data["close"].to_numpy(dtype=np.float64)
+        sma = indicator_cache.sma(data, self.window)
+
+        return self._signals(closes, sma, np.arange(1, len(closes) + 1))
+
+    def generate_panel_signals(self, panel) -> np.ndarray:
+        sma = rolling_mean(panel.close, self.window)
+
+        return self._signals(panel.close, sma, panel.bars_seen())
+
+    def _signals(self, closes, sma, bars_seen) -> np.ndarray:
+        # Works on 1-D series and 2-D (bars, symbols) panels alike
+        long = (closes > sma) & (bars_seen >= self.window)
+
+        return long.astype(np.int64)
+
+    def reset(self) -> None:
+        self._sma = RollingMean(self.window)
+        self._bars = 0
+
+    def on_bar(self, bar: Bar) -> Signal:
+        sma = self._sma.update(bar.close)
+        self._bars += 1
+
+        if self._bars < self.window:
+            return Signal(direction=0)
+
+        if bar.close > sma:
+            return Signal(direction=1)
+
+        return Signal(direction=0)
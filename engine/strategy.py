@@ -1,5 +1,7 @@
+import copy
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Iterator, NamedTuple, Optional
+import numpy as np
 import pandas as pd
 
 
@@ -18,6 +20,27 @@ class Signal:
         return f"Signal(direction={self.direction})"
 
 
+class Bar(NamedTuple):
+    """
+    A single OHLCV bar, as fed to streaming strategies.
+    """
+
+    date: pd.Timestamp
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def iter_bars(data: pd.DataFrame) -> Iterator[Bar]:
+    """
+    Iterate over a loaded frame as Bar tuples, without per-row indexing.
+    """
+    columns = [data[c].tolist() for c in Bar._fields]
+    return map(Bar._make, zip(*columns))
+
+
 class Strategy(ABC):
     """
     Abstract base class for all trading strategies.
@@ -30,3 +53,77 @@ class Strategy(ABC):
         Must not place trades or manage positions.
         """
         pass
+
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Return the direction for every bar as an int array.
+        Element i equals generate_signal(data.iloc[: i + 1]).direction.
+
+        The default replays generate_signal on each prefix; strategies
+        that depend only on trailing windows should override it with a
+        single vectorized pass.
+        """
+        directions = np.zeros(len(data), dtype=np.int64)
+        for i in range(len(data)):
+            signal = self.generate_signal(data.iloc[: i + 1])
+            directions[i] = signal.direction
+        return directions
+
+    def generate_panel_signals(self, panel) -> np.ndarray:
+        """
+        Directions for every (bar, symbol) of an engine.universe.Panel,
+        zero where a symbol has no bar.
+
+        The default runs generate_signals on each symbol's own bars;
+        strategies built on rolling windows should override it with
+        2-D array operations.
+        """
+        directions = np.zeros(panel.close.shape, dtype=np.int64)
+        valid = panel.valid()
+        for j, symbol in enumerate(panel.symbols):
+            directions[valid[:, j], j] = self.generate_signals(panel.frame(symbol))
+        return directions
+
+
+class StreamingStrategy(Strategy):
+    """
+    Strategy that can also consume bars one at a time.
+
+    Implementations keep their own rolling state so each call to
+    on_bar is O(1). The signal returned after the i-th bar must equal
+    generate_signal(data.iloc[: i + 1]).
+    """
+
+    @abstractmethod
+    def reset(self) -> None:
+        """
+        Clear all rolling state before a new pass over the data.
+        """
+        pass
+
+    @abstractmethod
+    def on_bar(self, bar: Bar) -> Signal:
+        """
+        Consume the next bar and return the signal for it.
+        """
+        pass
+
+    def generate_signals(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Stream every bar through on_bar. Resets any rolling state.
+        """
+        self.reset()
+        directions = np.zeros(len(data), dtype=np.int64)
+        for i, bar in enumerate(iter_bars(data)):
+            directions[i] = self.on_bar(bar).direction
+        return directions
+
+    def get_state(self) -> Dict:
+        """
+        Parameters and rolling state, enough for set_state to resume
+        the stream on another instance.
+        """
+        return copy.deepcopy(vars(self))
+
+    def set_state(self, state: Dict) -> None:
+        self.__dict__.update(copy.deepcopy(state))
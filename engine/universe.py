@@ -0,0 +1,99 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from engine.data_loader import load_csv
+
+
+PANEL_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class Panel:
+    """
+    Many instruments aligned on one date index.
+
+    Each field is a 2-D float array of shape (bars, symbols); a symbol
+    with no bar on a date has NaN in every field for that row.
+    """
+
+    def __init__(self, dates: pd.DatetimeIndex, symbols: List[str], fields: Dict):
+        self.dates = dates
+        self.symbols = symbols
+        self.open = fields["open"]
+        self.high = fields["high"]
+        self.low = fields["low"]
+        self.close = fields["close"]
+        self.volume = fields["volume"]
+
+    def __len__(self):
+        return len(self.dates)
+
+    def valid(self) -> np.ndarray:
+        """
+        Boolean (bars, symbols) mask of rows where a symbol has a bar.
+        """
+        return ~np.isnan(self.close)
+
+    def bars_seen(self) -> np.ndarray:
+        """
+        Number of the symbol's own bars up to and including each row.
+        """
+        return np.cumsum(self.valid(), axis=0)
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """
+        The symbol's own bars as a regular OHLCV frame.
+        """
+        j = self.symbols.index(symbol)
+        rows = self.valid()[:, j]
+        frame = pd.DataFrame({"date": self.dates[rows]})
+        for field in PANEL_FIELDS:
+            frame[field] = getattr(self, field)[rows, j]
+        return frame
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> "Panel":
+        """
+        Align per-symbol OHLCV frames on the union of their dates.
+        """
+        if not frames:
+            raise ValueError("Panel needs at least one symbol")
+
+        symbols = list(frames)
+        dates = pd.DatetimeIndex(
+            np.unique(np.concatenate([f["date"].to_numpy() for f in frames.values()]))
+        )
+
+        fields = {
+            field: np.full((len(dates), len(symbols)), np.nan) for field in PANEL_FIELDS
+        }
+        for j, symbol in enumerate(symbols):
+            df = frames[symbol]
+            rows = dates.get_indexer(df["date"])
+            for field in PANEL_FIELDS:
+                fields[field][rows, j] = df[field].to_numpy(dtype=np.float64)
+
+        return cls(dates, symbols, fields)
+
+
+def discover_symbols(
+    data_dir: Path,
+    symbols: Optional[List[str]] = None,
+) -> Dict[str, Path]:
+    """
+    Map symbol → CSV path. Without an explicit list, every CSV in
+    data_dir is a symbol named after its file stem.
+    """
+    if symbols:
+        return {s: data_dir / f"{s}.csv" for s in symbols}
+    return {p.stem: p for p in sorted(data_dir.glob("*.csv"))}
+
+
+def load_panel(paths: Dict[str, Path]) -> Panel:
+    """
+    Load every symbol through load_csv (and its processed-data cache)
+    and align them into one Panel.
+    """
+    return Panel.from_frames({symbol: load_csv(path) for symbol, path in paths.items()})
@@ -0,0 +1,115 @@
+import asyncio
+import csv
+import json
+import socket
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+import pandas as pd
+
+from engine.strategy import Bar
+
+
+def bar_from_record(record: Dict) -> Bar:
+    """
+    Build a Bar from a mapping with (any-case) OHLCV keys.
+    """
+    row = {k.lower().strip(): v for k, v in record.items()}
+    return Bar(
+        date=pd.Timestamp(row["date"]),
+        open=float(row["open"]),
+        high=float(row["high"]),
+        low=float(row["low"]),
+        close=float(row["close"]),
+        volume=float(row["volume"]),
+    )
+
+
+class FileTailSource:
+    """
+    Yields bars appended to a CSV file, like `tail -f`.
+
+    Rows already in the file are skipped unless from_start is set, so a
+    runner warmed up on the same file only sees new bars. Stops after
+    idle_timeout seconds without a new row (None waits forever).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        poll_interval: float = 1.0,
+        from_start: bool = False,
+        idle_timeout: Optional[float] = None,
+    ):
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.from_start = from_start
+        self.idle_timeout = idle_timeout
+
+    def __iter__(self) -> Iterator[Bar]:
+        with open(self.path, "r", newline="") as f:
+            header = next(csv.reader([f.readline()]))
+            if not self.from_start:
+                f.seek(0, 2)
+
+            pending = ""
+            idle_since = time.monotonic()
+
+            while True:
+                line = f.readline()
+                if not line:
+                    if (
+                        self.idle_timeout is not None
+                        and time.monotonic() - idle_since > self.idle_timeout
+                    ):
+                        return
+                    time.sleep(self.poll_interval)
+                    continue
+
+                # A writer may flush half a row; wait for the newline
+                pending += line
+                if not pending.endswith("\n"):
+                    continue
+
+                row = next(csv.reader([pending]))
+                pending = ""
+                idle_since = time.monotonic()
+                if row:
+                    yield bar_from_record(dict(zip(header, row)))
+
+
+class SocketSource:
+    """
+    Yields bars sent as newline-delimited JSON objects over a local TCP
+    connection, until the peer closes it.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9100):
+        self.host = host
+        self.port = port
+
+    def __iter__(self) -> Iterator[Bar]:
+        with socket.create_connection((self.host, self.port)) as conn:
+            with conn.makefile("r", encoding="utf-8") as stream:
+                for line in stream:
+                    line = line.strip()
+                    if line:
+                        yield bar_from_record(json.loads(line))
+
+
+class QueueSource:
+    """
+    Async stand-in for a market-data feed: yields Bars (or OHLCV
+    mappings) put on an asyncio.Queue until None is received.
+    """
+
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+
+    async def __aiter__(self) -> AsyncIterator[Bar]:
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                return
+            yield item if isinstance(item, Bar) else bar_from_record(item)
@@ -0,0 +1,139 @@
+import logging
+import time
+from typing import AsyncIterable, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from backtest.engine import BacktestEngine
+from backtest.trade_log import TradeType
+from engine.strategy import Bar, StreamingStrategy, iter_bars
+from execution.signals import ExecutionSignal
+
+
+logger = logging.getLogger(__name__)
+
+STOP_REASON = "ATR stop-loss hit"
+
+
+class LiveRunner:
+    """
+    Streams bars through warmed-up sleeves for paper or live trading.
+
+    Each sleeve is a BacktestEngine with a streaming strategy. warm_up
+    replays history once to build indicator, position and risk state;
+    after that every new bar costs one on_bar, one ATR update and one
+    risk step per sleeve, and any entry or exit it causes comes back as
+    an ExecutionSignal.
+    """
+
+    def __init__(
+        self,
+        sleeves: Dict[str, BacktestEngine],
+        reasons: Dict[str, str],
+        instrument: str,
+    ):
+        for name, engine in sleeves.items():
+            if not isinstance(engine.strategy, StreamingStrategy):
+                raise TypeError(f"Sleeve {name} needs a streaming strategy")
+
+        self.sleeves = sleeves
+        self.reasons = reasons
+        self.instrument = instrument
+
+        self.bars_seen = 0
+        self.latency_ns_total = 0
+        self.latency_ns_max = 0
+
+    def warm_up(self, history: pd.DataFrame) -> None:
+        """
+        Rebuild every sleeve's state from historical bars.
+        """
+        for engine in self.sleeves.values():
+            engine.start_stream()
+
+        for bar in iter_bars(history):
+            for engine in self.sleeves.values():
+                engine.step(bar)
+
+    def on_bar(self, bar: Bar) -> List[ExecutionSignal]:
+        """
+        Feed one new bar to every sleeve and return the orders it implies.
+        """
+        start = time.perf_counter_ns()
+        signals = []
+
+        for name, engine in self.sleeves.items():
+            if engine.halted:
+                continue
+
+            n_trades = len(engine.trades)
+            engine.step(bar)
+
+            # A reversal adds two trades on one bar: the exit, then the entry
+            for i in range(n_trades, len(engine.trades)):
+                trade = engine.trades[i]
+                trade_type = TradeType[trade["type"]]
+
+                if trade_type == TradeType.HALT:
+                    logger.warning("%s halted: %s", name, trade["reason"])
+                    continue
+
+                signals.append(
+                    ExecutionSignal(
+                        date=str(bar.date.date()),
+                        strategy=name,
+                        action=engine.trades.action(i),
+                        instrument=self.instrument,
+                        quantity=trade.get("size", 0),
+                        price=trade.get("price"),
+                        stop_loss=trade.get("stop"),
+                        reason=(
+                            STOP_REASON if trade_type == TradeType.STOP else self.reasons[name]
+                        ),
+                    )
+                )
+
+        elapsed = time.perf_counter_ns() - start
+        self.bars_seen += 1
+        self.latency_ns_total += elapsed
+        self.latency_ns_max = max(self.latency_ns_max, elapsed)
+
+        return signals
+
+    def run(
+        self,
+        source: Iterable[Bar],
+        sink: Callable[[List[ExecutionSignal]], None],
+        max_bars: Optional[int] = None,
+    ) -> None:
+        """
+        Consume bars from a synchronous source, passing each non-empty
+        batch of signals to sink.
+        """
+        for i, bar in enumerate(source):
+            signals = self.on_bar(bar)
+            if signals:
+                sink(signals)
+            if max_bars is not None and i + 1 >= max_bars:
+                break
+
+    async def run_async(
+        self,
+        source: AsyncIterable[Bar],
+        sink: Callable[[List[ExecutionSignal]], None],
+    ) -> None:
+        """
+        Same as run, for asynchronous sources such as QueueSource.
+        """
+        async for bar in source:
+            signals = self.on_bar(bar)
+            if signals:
+                sink(signals)
+
+    def latency_report(self) -> Dict:
+        mean = self.latency_ns_total / self.bars_seen if self.bars_seen else 0.0
+        return {
+            "bars": self.bars_seen,
+            "mean_us": mean / 1e3,
+            "max_us": self.latency_ns_max / 1e3,
+        }
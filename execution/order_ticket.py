@@ -1,40 +1,48 @@
 import csv
+import logging
+import os
+from pathlib import Path
 from typing import List
 from execution.signals import ExecutionSignal
+from execution.sinks import TICKET_FIELDS, SignalSink, ticket_row
+
+
+logger = logging.getLogger(__name__)
 
 
 def write_order_ticket(
     signals: List[ExecutionSignal],
     path: str = "output/order_ticket.csv",
 ):
+    """
+    Replace the order ticket with these signals. The file is written
+    alongside and renamed into place, so readers never see a partial
+    ticket.
+    """
     if not signals:
         return
 
-    with open(path, "w", newline="") as f:
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+
+    with open(tmp, "w", newline="") as f:
         writer = csv.writer(f)
-        writer.writerow(
-            [
-                "date",
-                "strategy",
-                "action",
-                "instrument",
-                "quantity",
-                "price",
-                "stop_loss",
-                "reason",
-            ]
-        )
-
-        for s in signals:
-            writer.writerow(
-                [
-                    s.date,
-                    s.strategy,
-                    s.action,
-                    s.instrument,
-                    round(s.quantity, 2),
-                    s.price,
-                    s.stop_loss,
-                    s.reason,
-                ]
-            )
+        writer.writerow(TICKET_FIELDS)
+        writer.writerows(ticket_row(s) for s in signals)
+
+    os.replace(tmp, path)
+
+
+class OrderTicketSink(SignalSink):
+    """
+    Replaces the order ticket with each batch, so under a BackgroundSink
+    the ticket write no longer runs on the signal loop.
+    """
+
+    def __init__(self, path: str = "output/order_ticket.csv"):
+        super().__init__(buffer_size=1)
+        self.path = path
+
+    def _emit(self, batch: List[ExecutionSignal]) -> None:
+        write_order_ticket(batch, self.path)
+        logger.info("Order ticket written to %s", self.path)
@@ -0,0 +1,394 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from execution.signals import ExecutionSignal
+
+
+TICKET_FIELDS = [
+    "date",
+    "strategy",
+    "action",
+    "instrument",
+    "quantity",
+    "price",
+    "stop_loss",
+    "reason",
+]
+
+logger = logging.getLogger(__name__)
+
+
+def ticket_row(s: ExecutionSignal) -> list:
+    return [
+        s.date,
+        s.strategy,
+        s.action,
+        s.instrument,
+        round(s.quantity, 2),
+        s.price,
+        s.stop_loss,
+        s.reason,
+    ]
+
+
+class SignalSink(ABC):
+    """
+    Destination for execution signals.
+
+    write() only buffers; flush() hands everything buffered to the
+    destination in one operation. Sinks are context managers that flush
+    and close on exit.
+    """
+
+    def __init__(self, buffer_size: int = 1000):
+        self.buffer_size = buffer_size
+        self._buffer: List[ExecutionSignal] = []
+
+    def write(self, signals: Iterable[ExecutionSignal]) -> None:
+        self._buffer.extend(signals)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            self._emit(batch)
+
+    @abstractmethod
+    def _emit(self, batch: List[ExecutionSignal]) -> None:
+        """
+        Hand one batch to the destination.
+        """
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "SignalSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class _AppendFileSink(SignalSink):
+    """
+    Append-only file sink. Each flush encodes the batch in memory and
+    appends it with a single write on an O_APPEND descriptor, so a
+    reader or a concurrent appender never sees a partial batch.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1000):
+        super().__init__(buffer_size)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._new = os.fstat(self._fd).st_size == 0
+
+    @abstractmethod
+    def _encode(self, batch: List[ExecutionSignal], header: bool) -> bytes:
+        """
+        The batch as file contents, preceded by a header if asked for.
+        """
+
+    def _emit(self, batch: List[ExecutionSignal]) -> None:
+        data = memoryview(self._encode(batch, header=self._new))
+        while data:
+            data = data[os.write(self._fd, data) :]
+        self._new = False
+
+    def close(self) -> None:
+        if self._fd is not None:
+            self.flush()
+            os.close(self._fd)
+            self._fd = None
+
+
+class CsvSink(_AppendFileSink):
+    """
+    Order-ticket columns, appended; the header is written once when the
+    file is new.
+    """
+
+    def _encode(self, batch: List[ExecutionSignal], header: bool) -> bytes:
+        out = io.StringIO()
+        writer = csv.writer(out)
+        if header:
+            writer.writerow(TICKET_FIELDS)
+        writer.writerows(ticket_row(s) for s in batch)
+        return out.getvalue().encode()
+
+
+class JsonlSink(_AppendFileSink):
+    """
+    One JSON object per signal per line.
+    """
+
+    def _encode(self, batch: List[ExecutionSignal], header: bool) -> bytes:
+        return "".join(json.dumps(asdict(s)) + "\n" for s in batch).encode()
+
+
+class ParquetSink(SignalSink):
+    """
+    Parquet file with one row group per flush. Needs pyarrow.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 10_000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("ParquetSink requires pyarrow") from exc
+
+        super().__init__(buffer_size)
+        self._pa = pa
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._schema = pa.schema(
+            [
+                ("date", pa.string()),
+                ("strategy", pa.string()),
+                ("action", pa.string()),
+                ("instrument", pa.string()),
+                ("quantity", pa.float64()),
+                ("price", pa.float64()),
+                ("stop_loss", pa.float64()),
+                ("reason", pa.string()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(self.path, self._schema)
+
+    def _emit(self, batch: List[ExecutionSignal]) -> None:
+        columns = {name: [getattr(s, name) for s in batch] for name in TICKET_FIELDS}
+        self._writer.write_table(self._pa.table(columns, schema=self._schema))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+
+
+class SocketSink(SignalSink):
+    """
+    Newline-delimited JSON over a local TCP connection, for a
+    downstream order-management stand-in.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9200, buffer_size: int = 1):
+        super().__init__(buffer_size)
+        self._conn = socket.create_connection((host, port))
+
+    def _emit(self, batch: List[ExecutionSignal]) -> None:
+        self._conn.sendall("".join(json.dumps(asdict(s)) + "\n" for s in batch).encode())
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+
+class QueueSink(SignalSink):
+    """
+    Puts each flushed batch on a queue.Queue or asyncio.Queue without
+    waiting; a full queue drops the batch with a warning.
+
+    asyncio queues aren't thread-safe, so batches for one are handed to
+    its event loop with call_soon_threadsafe unless they are emitted on
+    the loop's own thread. loop defaults to the loop running when the
+    sink is created.
+    """
+
+    def __init__(self, target, buffer_size: int = 1, loop: Optional[asyncio.AbstractEventLoop] = None):
+        super().__init__(buffer_size)
+        self.target = target
+        self.loop = loop
+        if loop is None and isinstance(target, asyncio.Queue):
+            try:
+                self.loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+
+    def _put(self, batch: List[ExecutionSignal]) -> None:
+        try:
+            self.target.put_nowait(batch)
+        except Exception as exc:
+            logger.warning("Dropped %d signals: %s", len(batch), exc)
+
+    def _emit(self, batch: List[ExecutionSignal]) -> None:
+        if self.loop is None:
+            self._put(batch)
+            return
+
+        try:
+            on_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            on_loop = False
+
+        if on_loop:
+            self._put(batch)
+        else:
+            try:
+                self.loop.call_soon_threadsafe(self._put, batch)
+            except RuntimeError as exc:
+                logger.warning("Dropped %d signals: %s", len(batch), exc)
+
+
+class LogSink(SignalSink):
+    """
+    Logs each batch, one line per signal.
+    """
+
+    def __init__(self, log: Optional[logging.Logger] = None):
+        super().__init__(buffer_size=1)
+        self.log = log or logger
+
+    def _emit(self, batch: List[ExecutionSignal]) -> None:
+        self.log.info("===== EXECUTION SIGNALS =====")
+        for s in batch:
+            self.log.info(
+                "%s | %s | %s %s qty %.2f | stop %.2f | %s",
+                s.date,
+                s.strategy,
+                s.action,
+                s.instrument,
+                s.quantity,
+                s.stop_loss if s.stop_loss else 0.0,
+                s.reason,
+            )
+
+
+class MultiSink(SignalSink):
+    """
+    Fans every batch out to several sinks.
+    """
+
+    def __init__(self, sinks: List[SignalSink]):
+        super().__init__(buffer_size=1)
+        self.sinks = sinks
+
+    def write(self, signals: Iterable[ExecutionSignal]) -> None:
+        self._emit(list(signals))
+
+    def _emit(self, batch: List[ExecutionSignal]) -> None:
+        for sink in self.sinks:
+            sink.write(batch)
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        """
+        Close every sink, even after one fails, then re-raise the first
+        failure.
+        """
+        error = None
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as exc:
+                if error is None:
+                    error = exc
+                else:
+                    logger.exception("Signal sink failed to close")
+        if error is not None:
+            raise error
+
+
+class BackgroundSink(SignalSink):
+    """
+    Runs another sink on a worker thread so the signal loop only pays
+    for a queue put. close() drains the queue before closing the sink.
+    """
+
+    _FLUSH = object()
+    _STOP = object()
+
+    def __init__(self, sink: SignalSink, max_pending: int = 10_000):
+        super().__init__(buffer_size=1)
+        self.sink = sink
+        self._queue: queue.Queue = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self._thread.start()
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                # Return even if close fails, or close() waits forever
+                try:
+                    self.sink.close()
+                except Exception:
+                    logger.exception("Signal sink failed to close")
+                finally:
+                    return
+            try:
+                if item is self._FLUSH:
+                    self.sink.flush()
+                else:
+                    self.sink.write(item)
+            except Exception:
+                logger.exception("Signal sink failed")
+
+    def write(self, signals: Iterable[ExecutionSignal]) -> None:
+        self._emit(list(signals))
+
+    def _emit(self, batch: List[ExecutionSignal]) -> None:
+        self._queue.put(batch)
+
+    def flush(self) -> None:
+        self._queue.put(self._FLUSH)
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+
+SINK_TYPES = {
+    "csv": CsvSink,
+    "jsonl": JsonlSink,
+    "parquet": ParquetSink,
+    "socket": SocketSink,
+}
+
+
+def make_sink(spec: Dict) -> SignalSink:
+    """
+    Build a sink from a config entry such as
+    {"type": "jsonl", "path": "output/signals.jsonl"}.
+    """
+    spec = dict(spec)
+    kind = spec.pop("type")
+    if kind not in SINK_TYPES:
+        raise ValueError(f"Unknown sink type {kind}; expected one of {sorted(SINK_TYPES)}")
+    return SINK_TYPES[kind](**spec)
+
+
+def make_sinks(
+    specs: Optional[List[Dict]],
+    background: bool = False,
+    base: Optional[List[SignalSink]] = None,
+) -> Optional[SignalSink]:
+    """
+    One sink fanning out to the base sinks, then every configured
+    entry, or None if there are none. background runs them all off the
+    calling thread.
+    """
+    sinks = list(base or []) + [make_sink(spec) for spec in specs or []]
+    if not sinks:
+        return None
+    sink: SignalSink = MultiSink(sinks)
+    return BackgroundSink(sink) if background else sink
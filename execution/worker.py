@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+from typing import Callable, Dict, Optional
+
+
+WORKER_HOST = "127.0.0.1"
+WORKER_PORT = 9300
+
+# A missing worker must not hold up the caller's in-process fallback
+CONNECT_TIMEOUT = 0.2
+
+# Longest wait for a reply before the caller gives up on a stuck worker
+REQUEST_TIMEOUT = 30.0
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict], Dict]
+
+
+def request(
+    message: Dict,
+    host: str = WORKER_HOST,
+    port: int = WORKER_PORT,
+    timeout: Optional[float] = REQUEST_TIMEOUT,
+) -> Dict:
+    """
+    Send one command to a running worker and return its reply.
+
+    Raises OSError when no worker is listening, the connection drops
+    before a reply, or (socket.timeout) no reply arrives within timeout
+    seconds; None waits indefinitely. The caller's working directory is
+    sent along, since relative paths in the config resolve against the
+    worker's.
+    """
+    with socket.create_connection((host, port), timeout=CONNECT_TIMEOUT) as sock:
+        sock.settimeout(timeout)
+        payload = {**message, "cwd": os.getcwd()}
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+
+    if not line:
+        raise ConnectionError("Worker closed the connection without a reply")
+    return json.loads(line)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        reply = self.server.worker.dispatch(json.loads(line))
+        self.wfile.write(json.dumps(reply, default=str).encode() + b"\n")
+
+
+class _Server(socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+class Worker:
+    """
+    Long-lived process that answers commands over a local socket.
+
+    handlers maps a command name to a function taking the request and
+    returning the reply fields. Whatever the handlers keep in memory
+    (parsed config, loaded data, indicator series) stays warm from one
+    request to the next. Requests run one at a time, in arrival order.
+    ping and stop are built in; a request from a different working
+    directory is refused, so the caller can run it in-process instead.
+    """
+
+    def __init__(self, handlers: Dict[str, Handler], host: str = WORKER_HOST, port: int = WORKER_PORT):
+        self.handlers = handlers
+        self.host = host
+        self.port = port
+        self.cwd = os.getcwd()
+        self.requests = 0
+        self._stopping = False
+
+    def dispatch(self, message: Dict) -> Dict:
+        command = message.get("command")
+        if command == "ping":
+            return {"ok": True, "requests": self.requests}
+        if command == "stop":
+            self._stopping = True
+            return {"ok": True}
+        if message.get("cwd", self.cwd) != self.cwd:
+            return {"ok": False, "error": f"Worker runs in {self.cwd}"}
+
+        handler = self.handlers.get(command)
+        if handler is None:
+            return {"ok": False, "error": f"Unknown command: {command}"}
+
+        self.requests += 1
+        try:
+            return {"ok": True, **handler(message)}
+        except Exception as exc:
+            logger.exception("Worker command %s failed", command)
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+    def serve(self) -> None:
+        """
+        Listen until a stop request or KeyboardInterrupt.
+        """
+        with _Server((self.host, self.port), _RequestHandler) as server:
+            server.worker = self
+            logger.info("Worker listening on %s:%d", self.host, self.port)
+            try:
+                while not self._stopping:
+                    server.handle_request()
+            except KeyboardInterrupt:
+                pass
+        logger.info("Worker stopped after %d requests", self.requests)
@@ -1,44 +1,84 @@
+import copy
 import logging
 import logging.config
 from pathlib import Path
 from datetime import date
 
-import yaml
+from engine.config import load_yaml
 
-from engine.data_loader import load_csv
-from engine.sma_trend_strategy import SMATrendStrategy
-from engine.mean_reversion_strategy import MeanReversionStrategy
-from backtest.engine import BacktestEngine
-from backtest.metrics import compute_equity_curve
-from backtest.portfolio import combine_equity_curves
-from execution.signals import ExecutionSignal
-from execution.order_ticket import write_order_ticket
+# Everything else is imported where it is used: a run only pays for the
+# data, strategy and execution modules its mode needs.
 
 
 def setup_logging():
-    with open("config/logging.yaml", "r") as f:
-        config = yaml.safe_load(f)
-    logging.config.dictConfig(config)
+    # dictConfig consumes its input; the parsed file is shared
+    logging.config.dictConfig(copy.deepcopy(load_yaml(Path("config/logging.yaml"))))
 
 
 def load_config():
-    with open("config/execution.yaml", "r") as f:
-        return yaml.safe_load(f)
+    return load_yaml(Path("config/execution.yaml"))
 
 
-def main():
-    setup_logging()
-    logger = logging.getLogger(__name__)
-    cfg = load_config()
+# Loaded bars by (data_path, timeframe), with the file's mtime and size,
+# so a long-lived worker only reloads data that changed
+_run_data = {}
 
-    data = load_csv(Path(cfg["run"]["data_path"]))
-    run_date = str(data.iloc[-1]["date"].date())
 
-    signals = []
+def load_run_data(cfg):
+    """
+    The configured instrument's bars: the daily CSV as is, or intraday
+    data resampled to run.timeframe when one is set.
+    """
+    data_path = Path(cfg["run"]["data_path"])
+    timeframe = cfg["run"].get("timeframe")
+
+    try:
+        stat = data_path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        stamp = None
+
+    key = (str(data_path.resolve()), timeframe)
+    hit = _run_data.get(key)
+    if stamp is not None and hit is not None and hit[0] == stamp:
+        return hit[1]
+
+    if timeframe:
+        from engine.intraday import load_intraday
+
+        data = load_intraday(data_path, timeframe)
+    else:
+        from engine.data_loader import load_csv
+
+        data = load_csv(data_path)
+
+    _run_data[key] = (stamp, data)
+    return data
+
+
+def run_checkpoint(cfg, sleeve):
+    from backtest.checkpoint import checkpoint_path
+
+    timeframe = cfg["run"].get("timeframe")
+    name = f"{sleeve}_{timeframe}" if timeframe else sleeve
+    return checkpoint_path(cfg["run"]["data_path"], name)
+
+
+def build_sleeves(cfg, data):
+    """
+    One BacktestEngine per enabled sleeve on the single instrument,
+    plus the order-ticket reason for each.
+    """
+    from backtest.engine import BacktestEngine
+    from engine.mean_reversion_strategy import MeanReversionStrategy
+    from engine.sma_trend_strategy import SMATrendStrategy
+
+    sleeves = {}
+    reasons = {}
 
     # --- Trend Strategy ---
     if cfg["trend_strategy"]["enabled"]:
-        engine = BacktestEngine(
+        sleeves["Trend"] = BacktestEngine(
             data=data,
             strategy=SMATrendStrategy(cfg["trend_strategy"]["sma_window"]),
             initial_capital=cfg["run"]["capital"] * cfg["portfolio"]["allocation"]["trend"],
@@ -49,29 +89,15 @@ def main():
             transaction_cost=cfg["execution"]["transaction_cost"],
             slippage=cfg["execution"]["slippage"],
         )
-
-        trades = engine.run()
-        if trades:
-            last = trades[-1]
-            if last["type"] in ("BUY", "SELL"):
-                signals.append(
-                    ExecutionSignal(
-                        date=run_date,
-                        strategy="Trend",
-                        action=last["type"],
-                        instrument="NIFTY",
-                        quantity=last.get("size", 0),
-                        price=last.get("price"),
-                        stop_loss=last.get("stop"),
-                        reason="SMA-200 regime change",
-                    )
-                )
+        reasons["Trend"] = "SMA-200 regime change"
 
     # --- Mean Reversion Strategy ---
     if cfg["mean_reversion_strategy"]["enabled"]:
-        engine = BacktestEngine(
+        sleeves["MeanReversion"] = BacktestEngine(
             data=data,
-            strategy=MeanReversionStrategy(),
+            strategy=MeanReversionStrategy(
+                short=cfg["mean_reversion_strategy"].get("short", False)
+            ),
             initial_capital=cfg["run"]["capital"] * cfg["portfolio"]["allocation"]["mean_reversion"],
             risk_per_trade=cfg["mean_reversion_strategy"]["risk_per_trade"],
             max_drawdown=cfg["execution"]["max_drawdown"],
@@ -80,44 +106,349 @@ def main():
             transaction_cost=cfg["execution"]["transaction_cost"],
             slippage=cfg["execution"]["slippage"],
         )
+        reasons["MeanReversion"] = "Reversion to SMA-20"
+
+    return sleeves, reasons
+
+
+def report_portfolio(cfg, sleeves):
+    """
+    Reallocate the run's capital between the sleeves per
+    portfolio.rebalance and write the portfolio curve to
+    output/portfolio_equity.csv.
+    """
+    from backtest.portfolio import Allocator, combine_equity_curves, PortfolioEngine
+
+    logger = logging.getLogger(__name__)
+    rcfg = cfg["portfolio"]["rebalance"]
+    allocation = cfg["portfolio"]["allocation"]
+
+    allocator = Allocator(
+        method=rcfg.get("method", "static"),
+        weights={
+            "Trend": allocation["trend"],
+            "MeanReversion": allocation["mean_reversion"],
+        },
+        every=rcfg.get("every"),
+        lookback=rcfg.get("lookback", 63),
+        vol_trigger=rcfg.get("vol_trigger"),
+        drawdown_trigger=rcfg.get("drawdown_trigger"),
+    )
+
+    curves = combine_equity_curves(
+        {name: engine.equity_curve() for name, engine in sleeves.items()}
+    )
+    portfolio, rebalances = allocator.run(
+        curves,
+        cfg["run"]["capital"],
+        exposure=PortfolioEngine(sleeves).exposure(),
+    )
+
+    output = Path("output/portfolio_equity.csv")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    portfolio.to_csv(output, index=False)
+    logger.info(
+        "Portfolio equity %.2f after %d rebalances (%s); written to %s",
+        portfolio["portfolio_equity"].iloc[-1],
+        len(rebalances) - 1,
+        allocator.method,
+        output,
+    )
+
+
+def report_costs(cfg, sleeves):
+    """
+    Re-price each sleeve's fills under the engine's own costs and every
+    model in the costs section, and write the comparison to
+    output/cost_comparison.csv.
+    """
+    import pandas as pd
+
+    from backtest.costs import engine_costs, make_cost_model, reprice_many
+
+    logger = logging.getLogger(__name__)
+    ecfg = cfg["execution"]
+
+    models = {"engine": engine_costs(ecfg["transaction_cost"], ecfg["slippage"])}
+    for name, specs in cfg["costs"].items():
+        models[name] = make_cost_model(specs)
+
+    frames = []
+    for name, engine in sleeves.items():
+        frame = reprice_many(engine, models)
+        frame.insert(0, "sleeve", name)
+        frames.append(frame)
+    comparison = pd.concat(frames, ignore_index=True)
+
+    output = Path("output/cost_comparison.csv")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    comparison.to_csv(output, index=False)
+    logger.info("Cost comparison of %d models written to %s", len(models), output)
+
+    return comparison
+
+
+def last_orders(trades):
+    """
+    Indices of the trades behind today's orders: the last trade if it is
+    an entry or exit, preceded by the exit it reversed out of, if any.
+    """
+    from backtest.trade_log import ORDER_ACTIONS
+
+    orders = []
+    last_date = trades.dates[-1] if len(trades) else None
+    for i in range(len(trades) - 1, -1, -1):
+        if trades.dates[i] != last_date or int(trades.types[i]) not in ORDER_ACTIONS:
+            break
+        orders.insert(0, i)
+    return orders
+
+
+def instrument_signals(cfg):
+    """
+    Run every enabled sleeve on the single configured instrument.
+    """
+    from execution.signals import ExecutionSignal
+
+    data = load_run_data(cfg)
+    run_date = str(data.iloc[-1]["date"].date())
+
+    sleeves, reasons = build_sleeves(cfg, data)
+
+    if cfg["run"].get("checkpoint"):
+        # --- Resume each sleeve from its checkpoint, new bars only ---
+        from backtest.checkpoint import run_incremental
+
+        for name, engine in sleeves.items():
+            run_incremental(engine, run_checkpoint(cfg, name))
+    elif sleeves:
+        # --- Single pass over the data for all sleeves ---
+        from backtest.portfolio import PortfolioEngine
+        from backtest.result_cache import ResultCache
+
+        cache = ResultCache() if cfg["run"].get("result_cache") else None
+        PortfolioEngine(sleeves).run(cache)
+
+    if sleeves and cfg["portfolio"].get("rebalance", {}).get("enabled"):
+        report_portfolio(cfg, sleeves)
+
+    signals = []
+
+    for name, engine in sleeves.items():
+        trades = engine.trades
+        for i in last_orders(trades):
+            trade = trades[i]
+            signals.append(
+                ExecutionSignal(
+                    date=run_date,
+                    strategy=name,
+                    action=trades.action(i),
+                    instrument="NIFTY",
+                    quantity=trade.get("size", 0),
+                    price=trade.get("price"),
+                    stop_loss=trade.get("stop"),
+                    reason=reasons[name],
+                )
+            )
+
+    return signals
+
+
+def universe_signals(cfg):
+    """
+    Run every enabled sleeve across the configured universe and return
+    one signal per instrument whose latest trade is an entry or exit.
+    """
+    from backtest.universe import SleeveConfig, run_universe
+    from engine.mean_reversion_strategy import MeanReversionStrategy
+    from engine.sma_trend_strategy import SMATrendStrategy
+    from engine.universe import discover_symbols, load_panel
+    from execution.signals import ExecutionSignal
+
+    ucfg = cfg["universe"]
+    panel = load_panel(discover_symbols(Path(ucfg["data_dir"]), ucfg.get("symbols")))
+    run_date = str(panel.dates[-1].date())
+
+    sleeves = []
+    reasons = {}
+
+    if cfg["trend_strategy"]["enabled"]:
+        sleeves.append(
+            SleeveConfig(
+                name="Trend",
+                strategy=SMATrendStrategy(cfg["trend_strategy"]["sma_window"]),
+                capital=cfg["run"]["capital"] * cfg["portfolio"]["allocation"]["trend"],
+                risk_per_trade=cfg["trend_strategy"]["risk_per_trade"],
+                max_drawdown=cfg["execution"]["max_drawdown"],
+                atr_period=cfg["trend_strategy"]["atr_period"],
+                atr_multiplier=cfg["trend_strategy"]["atr_multiplier"],
+                transaction_cost=cfg["execution"]["transaction_cost"],
+                slippage=cfg["execution"]["slippage"],
+            )
+        )
+        reasons["Trend"] = "SMA-200 regime change"
+
+    if cfg["mean_reversion_strategy"]["enabled"]:
+        sleeves.append(
+            SleeveConfig(
+                name="MeanReversion",
+                strategy=MeanReversionStrategy(
+                    short=cfg["mean_reversion_strategy"].get("short", False)
+                ),
+                capital=cfg["run"]["capital"] * cfg["portfolio"]["allocation"]["mean_reversion"],
+                risk_per_trade=cfg["mean_reversion_strategy"]["risk_per_trade"],
+                max_drawdown=cfg["execution"]["max_drawdown"],
+                atr_period=cfg["mean_reversion_strategy"]["atr_period"],
+                atr_multiplier=cfg["mean_reversion_strategy"]["atr_multiplier"],
+                transaction_cost=cfg["execution"]["transaction_cost"],
+                slippage=cfg["execution"]["slippage"],
+            )
+        )
+        reasons["MeanReversion"] = "Reversion to SMA-20"
+
+    results = run_universe(panel, sleeves, max_workers=ucfg.get("max_workers", 1))
 
-        trades = engine.run()
-        if trades:
-            last = trades[-1]
-            if last["type"] in ("BUY", "SELL"):
+    signals = []
+
+    for name, by_symbol in results.items():
+        for symbol, trades in by_symbol.items():
+            for i in last_orders(trades):
+                trade = trades[i]
                 signals.append(
                     ExecutionSignal(
                         date=run_date,
-                        strategy="MeanReversion",
-                        action=last["type"],
-                        instrument="NIFTY",
-                        quantity=last.get("size", 0),
-                        price=last.get("price"),
-                        stop_loss=last.get("stop"),
-                        reason="Reversion to SMA-20",
+                        strategy=name,
+                        action=trades.action(i),
+                        instrument=symbol,
+                        quantity=trade.get("size", 0),
+                        price=trade.get("price"),
+                        stop_loss=trade.get("stop"),
+                        reason=reasons[name],
                     )
                 )
 
+    return signals
+
+
+def bar_source(cfg):
+    """
+    The bar source named by the stream config block.
+    """
+    from execution.bar_sources import FileTailSource, SocketSource
+
+    scfg = cfg["stream"]
+    if scfg["source"] == "file":
+        return FileTailSource(
+            Path(scfg.get("path", cfg["run"]["data_path"])),
+            poll_interval=scfg.get("poll_interval", 1.0),
+            idle_timeout=scfg.get("idle_timeout"),
+        )
+    if scfg["source"] == "socket":
+        return SocketSource(scfg.get("host", "127.0.0.1"), scfg.get("port", 9100))
+    raise ValueError(f"Unknown stream source: {scfg['source']}")
+
+
+def stream_signals(cfg, sink):
+    """
+    Paper/live mode: warm the sleeves up on the history once, then emit
+    signals bar by bar as the configured source delivers them.
+    """
+    from backtest.checkpoint import run_incremental
+    from execution.live import LiveRunner
+
+    logger = logging.getLogger(__name__)
+    history = load_run_data(cfg)
+
+    sleeves, reasons = build_sleeves(cfg, history)
+    runner = LiveRunner(sleeves, reasons, instrument="NIFTY")
+    if cfg["run"].get("checkpoint"):
+        for name, engine in sleeves.items():
+            run_incremental(engine, run_checkpoint(cfg, name))
+    else:
+        runner.warm_up(history)
+    logger.info("Warmed up on %d bars; waiting for new bars", len(history))
+
+    try:
+        runner.run(bar_source(cfg), sink)
+    except KeyboardInterrupt:
+        pass
+
+    report = runner.latency_report()
+    logger.info(
+        "Processed %d live bars | mean %.1fus | max %.1fus per bar",
+        report["bars"],
+        report["mean_us"],
+        report["max_us"],
+    )
+
+
+def output_sinks(cfg, background=False):
+    """
+    The signal log, the order ticket and any configured output sinks,
+    fanned out from one sink. background runs all of them on a worker
+    thread.
+    """
+    from execution.order_ticket import OrderTicketSink
+    from execution.sinks import LogSink, make_sinks
+
+    return make_sinks(
+        cfg.get("output", {}).get("sinks"),
+        background=background,
+        base=[LogSink(logging.getLogger(__name__)), OrderTicketSink()],
+    )
+
+
+def publish(signals, sinks):
+    """
+    Log the signals, write them to the order ticket and pass them to
+    any configured output sinks, through output_sinks().
+    """
+    sinks.write(signals)
+    sinks.flush()
+
+
+def run_signals(cfg, sinks):
+    """
+    Backtest mode: today's signals for the instrument or the universe,
+    published to the order ticket and sinks.
+    """
+    logger = logging.getLogger(__name__)
+
+    if cfg.get("universe", {}).get("enabled"):
+        signals = universe_signals(cfg)
+    else:
+        signals = instrument_signals(cfg)
+
     # --- Output ---
     if signals:
-        logger.info("===== EXECUTION SIGNALS =====")
-        for s in signals:
-            logger.info(
-                "%s | %s | %s %s qty %.2f | stop %.2f | %s",
-                s.date,
-                s.strategy,
-                s.action,
-                s.instrument,
-                s.quantity,
-                s.stop_loss if s.stop_loss else 0.0,
-                s.reason,
-            )
-
-        write_order_ticket(signals)
-        logger.info("Order ticket written to output/order_ticket.csv")
+        publish(signals, sinks)
     else:
         logger.info("No execution signals today")
 
+    return signals
+
+
+def main():
+    setup_logging()
+    cfg = load_config()
+
+    streaming = cfg["run"]["mode"] in ("paper", "live")
+
+    # Streaming runs hand all output, logging and the order ticket
+    # included, to a worker thread so it never blocks the bar loop.
+    # Each bar's signals are flushed as they arrive: a buffered live
+    # signal is one that never reaches the ticket
+    sinks = output_sinks(cfg, background=streaming)
+
+    try:
+        if streaming:
+            stream_signals(cfg, lambda signals: publish(signals, sinks))
+            return
+
+        run_signals(cfg, sinks)
+    finally:
+        sinks.close()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _make_bars(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Deterministic daily OHLCV random walk, choppy enough to trade both
+    sleeves and hit their stops.
+    """
+    rng = np.random.default_rng(seed)
+    close = 1000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.015, n)))
+    open_ = close * (1 + rng.normal(0.0, 0.004, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0.0, 0.006, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0.0, 0.006, n)))
+
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2000-01-03", periods=n, freq="B"),
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": rng.integers(1_000, 10_000, n).astype(np.float64),
+        }
+    )
+
+
+@pytest.fixture
+def make_bars():
+    return _make_bars
@@ -0,0 +1,72 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.checkpoint import load_checkpoint, run_incremental
+from backtest.engine import BacktestEngine
+from engine.mean_reversion_strategy import MeanReversionStrategy
+from engine.sma_trend_strategy import SMATrendStrategy
+
+
+STRATEGIES = [
+    lambda: SMATrendStrategy(window=50),
+    lambda: MeanReversionStrategy(mean_window=10, regime_window=50, atr_period=14),
+]
+
+
+def _engine(data, strategy):
+    return BacktestEngine(
+        data=data,
+        strategy=strategy,
+        initial_capital=100_000.0,
+        risk_per_trade=0.01,
+        max_drawdown=0.20,
+        atr_period=14,
+        atr_multiplier=2.0,
+        transaction_cost=10.0,
+        slippage=0.5,
+    )
+
+
+def _frame(trades):
+    return pd.DataFrame(list(trades))
+
+
+@pytest.mark.parametrize("split", [300, 777, 1499])
+@pytest.mark.parametrize("make_strategy", STRATEGIES, ids=["SMATrendStrategy", "MeanReversionStrategy"])
+def test_resume_matches_full_run(tmp_path, caplog, make_bars, make_strategy, split):
+    data = make_bars(1500, seed=5)
+    path = tmp_path / "sleeve.ckpt"
+
+    run_incremental(_engine(data.iloc[:split], make_strategy()), path)
+    assert load_checkpoint(path)["rows"] == split
+
+    with caplog.at_level(logging.INFO, logger="backtest.checkpoint"):
+        resumed = _engine(data, make_strategy())
+        trades = run_incremental(resumed, path)
+    assert f"Resumed {path.name} at bar {split}" in caplog.text
+
+    full = _engine(data, make_strategy())
+    full.run()
+
+    pd.testing.assert_frame_equal(_frame(trades), _frame(full.trades))
+    np.testing.assert_array_equal(resumed.equity_series(), full.equity_series())
+    assert load_checkpoint(path)["rows"] == len(data)
+
+
+def test_changed_history_replays(tmp_path, caplog, make_bars):
+    data = make_bars(800, seed=5)
+    path = tmp_path / "sleeve.ckpt"
+    run_incremental(_engine(data.iloc[:500], SMATrendStrategy(window=50)), path)
+
+    revised = data.copy()
+    revised.loc[100, "close"] *= 1.01
+    with caplog.at_level(logging.INFO, logger="backtest.checkpoint"):
+        trades = run_incremental(_engine(revised, SMATrendStrategy(window=50)), path)
+    assert "rebuilding" in caplog.text
+
+    full = _engine(revised, SMATrendStrategy(window=50))
+    full.run()
+    pd.testing.assert_frame_equal(_frame(trades), _frame(full.trades))
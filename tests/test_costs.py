@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.costs import CostModel, Fills, VolumeImpact, engine_costs, make_cost_model, reprice, reprice_many
+from backtest.engine import BacktestEngine
+from engine.mean_reversion_strategy import MeanReversionStrategy
+from engine.sma_trend_strategy import SMATrendStrategy
+
+
+STRATEGIES = {
+    "trend": lambda: SMATrendStrategy(window=50),
+    "short": lambda: MeanReversionStrategy(mean_window=10, regime_window=50, atr_period=14, short=True),
+}
+
+RISK = {"normal": (0.01, 0.20), "halting": (0.20, 0.05)}
+
+
+def _engine(data, strategy, risk_per_trade=0.01, max_drawdown=0.20):
+    engine = BacktestEngine(
+        data=data,
+        strategy=strategy,
+        initial_capital=100_000.0,
+        risk_per_trade=risk_per_trade,
+        max_drawdown=max_drawdown,
+        atr_period=14,
+        atr_multiplier=2.0,
+        transaction_cost=10.0,
+        slippage=0.5,
+    )
+    engine.run()
+    return engine
+
+
+@pytest.mark.parametrize("risk", RISK.values(), ids=RISK.keys())
+@pytest.mark.parametrize("name", STRATEGIES)
+def test_engine_costs_reproduce_the_run(make_bars, name, risk):
+    engine = _engine(make_bars(2000, seed=3), STRATEGIES[name](), *risk)
+
+    trades, equity = reprice(engine, engine_costs(engine.transaction_cost, engine.slippage))
+
+    pd.testing.assert_frame_equal(trades.to_frame(), engine.trades.to_frame(), rtol=1e-10)
+    np.testing.assert_allclose(equity, engine.equity_series(), rtol=1e-10)
+
+
+def test_volume_impact_skips_missing_volume(make_bars):
+    data = make_bars(2000, seed=3)
+    engine = _engine(data, SMATrendStrategy(window=50))
+    fills = Fills.from_engine(engine)
+    fills.volume[::3] = np.nan
+    fills.volume[1::3] = 0.0
+
+    cost = VolumeImpact(coefficient=0.1).cost(fills)
+
+    assert (cost[fills.volume > 0] > 0).all()
+    assert (cost[~(fills.volume > 0)] == 0).all()
+
+
+def test_config_models(make_bars):
+    engine = _engine(make_bars(2000, seed=3), SMATrendStrategy(window=50))
+    models = {
+        "engine": engine_costs(10.0, 0.5),
+        "nse": make_cost_model(
+            [
+                {"type": "nse_charges", "segment": "futures", "brokerage": {"type": "fixed_fee", "per_fill": 20}},
+                {"type": "atr_slippage", "multiple": 0.05},
+            ]
+        ),
+    }
+
+    table = reprice_many(engine, models).set_index("model")
+
+    assert table.loc["engine", "final_equity"] == pytest.approx(engine.equity_series()[-1])
+    assert table.loc["nse", "fees"] > table.loc["engine", "fees"]
+    with pytest.raises(TypeError):
+        CostModel()
@@ -0,0 +1,30 @@
+import numpy as np
+
+from engine.data_store import is_fresh, read_store, store_path, write_store
+
+
+def test_same_name_in_different_directories(tmp_path, make_bars):
+    root = tmp_path / "processed"
+    first, second = tmp_path / "a" / "daily.csv", tmp_path / "b" / "daily.csv"
+    for path in (first, second):
+        path.parent.mkdir()
+        path.write_text("date,close\n")
+
+    assert store_path(first, root) != store_path(second, root)
+
+    write_store(make_bars(50), store_path(first, root), raw_path=first)
+    assert is_fresh(store_path(first, root), first)
+    # Same size and mtime, different file: not this store
+    assert not is_fresh(store_path(first, root), second)
+
+
+def test_rewrite_replaces_store(tmp_path, make_bars):
+    raw = tmp_path / "daily.csv"
+    raw.write_text("date,close\n")
+    store = store_path(raw, tmp_path / "processed")
+
+    write_store(make_bars(50), store, raw_path=raw)
+    write_store(make_bars(80, seed=1), store, raw_path=raw)
+
+    np.testing.assert_array_equal(read_store(store)["close"], make_bars(80, seed=1)["close"])
+    assert [p.name for p in store.parent.iterdir()] == [store.name]
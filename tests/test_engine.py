@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from backtest.engine import BacktestEngine
+from engine.mean_reversion_strategy import MeanReversionStrategy
+from engine.sma_trend_strategy import SMATrendStrategy
+
+
+def _engine(data, strategy, risk_per_trade=0.01, max_drawdown=0.20):
+    return BacktestEngine(
+        data=data,
+        strategy=strategy,
+        initial_capital=100_000.0,
+        risk_per_trade=risk_per_trade,
+        max_drawdown=max_drawdown,
+        atr_period=14,
+        atr_multiplier=2.0,
+        transaction_cost=10.0,
+        slippage=0.5,
+    )
+
+
+def _frame(trades):
+    return pd.DataFrame(list(trades))
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [SMATrendStrategy(window=50), MeanReversionStrategy(mean_window=10, regime_window=50)],
+    ids=lambda s: type(s).__name__,
+)
+@pytest.mark.parametrize("risk", [(0.01, 0.20), (0.20, 0.05)], ids=["normal", "halting"])
+def test_run_vectorized_matches_run(make_bars, strategy, risk):
+    data = make_bars(1500, seed=4)
+
+    expected = _engine(data, strategy, *risk).run()
+    trades = _engine(data, strategy, *risk).run_vectorized()
+
+    assert len(expected) > 0
+    pd.testing.assert_frame_equal(_frame(trades), _frame(expected))
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import BacktestEngine
+from backtest.event_engine import EventEngine, EventSleeve
+from engine.mean_reversion_strategy import MeanReversionStrategy
+from engine.sma_trend_strategy import SMATrendStrategy
+
+
+STRATEGIES = [
+    lambda: SMATrendStrategy(window=50),
+    lambda: MeanReversionStrategy(mean_window=10, regime_window=50, atr_period=14),
+]
+
+RISK = {"normal": (0.01, 0.20), "halting": (0.20, 0.05)}
+
+
+def _settings(risk_per_trade, max_drawdown):
+    return dict(
+        initial_capital=100_000.0,
+        risk_per_trade=risk_per_trade,
+        max_drawdown=max_drawdown,
+        atr_period=14,
+        atr_multiplier=2.0,
+        transaction_cost=10.0,
+        slippage=0.5,
+    )
+
+
+@pytest.mark.parametrize("risk", RISK.values(), ids=RISK.keys())
+@pytest.mark.parametrize("make_strategy", STRATEGIES, ids=["SMATrendStrategy", "MeanReversionStrategy"])
+def test_market_sleeve_matches_backtest_engine(make_bars, make_strategy, risk):
+    data = make_bars(1500, seed=7)
+    settings = _settings(*risk)
+
+    expected = BacktestEngine(data=data, strategy=make_strategy(), **settings)
+    expected.run()
+
+    engine = EventEngine()
+    engine.add_feed("NIFTY", data)
+    sleeve = engine.add_sleeve(
+        EventSleeve("sleeve", make_strategy(), **settings, entry="market", intrabar_stops=False),
+        "NIFTY",
+    )
+    engine.run()
+
+    assert len(sleeve.trades) > 0
+    assert sleeve.halted == expected.halted
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(list(sleeve.trades)), pd.DataFrame(list(expected.trades))
+    )
+    np.testing.assert_allclose(sleeve.equity_series(), expected.equity_series(), rtol=1e-12)
@@ -0,0 +1,21 @@
+import numpy as np
+
+from engine.data_loader import dataset_hash
+from engine.indicators import IndicatorCache
+
+
+def test_cache_hit_and_column_reassignment(make_bars):
+    data = make_bars(300, seed=5)
+    cache = IndicatorCache()
+
+    first = cache.sma(data, 20)
+    assert cache.sma(data, 20) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Reassigning a column changes the content hash, so the memoized
+    # hash must not be reused
+    before = dataset_hash(data)
+    data["close"] = data["close"] * 2.0
+    assert dataset_hash(data) != before
+    np.testing.assert_allclose(cache.sma(data, 20), first * 2.0)
+    assert cache.misses == 2
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from engine.data_loader import load_csv
+from engine.data_store import read_store, store_path
+from engine.ingest import ingest_csv
+
+
+def test_ingest_store_is_separate_from_load_csv(tmp_path, make_bars):
+    raw = tmp_path / "daily.csv"
+    data = make_bars(500)
+    # tz-aware dates and an extra column: ingest drops the column and
+    # converts the dates, which load_csv must not see
+    data.assign(
+        date=data["date"].dt.tz_localize("Asia/Kolkata"),
+        oi=np.arange(len(data)),
+    ).to_csv(raw, index=False)
+    cache = tmp_path / "processed"
+
+    report = ingest_csv(raw, cache_dir=cache, chunk_rows=128)
+
+    assert report["store"] != store_path(raw, cache)
+    ingested = read_store(report["store"])
+    assert list(ingested.columns) == ["date", "open", "high", "low", "close", "volume"]
+    assert ingested["date"].dt.tz is None
+
+    loaded = load_csv(raw, cache_dir=cache)
+    pd.testing.assert_frame_equal(loaded, load_csv(raw, cache_dir=None))
+    assert loaded["date"].dt.tz is not None
+    assert "oi" in loaded.columns
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.portfolio import Allocator, inverse_vol_weights, risk_parity_weights
+
+
+CAPITAL = 300_000.0
+
+
+def _returns(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    common = rng.normal(0.0, 0.01, n)
+    return np.column_stack(
+        [
+            0.5 * common + rng.normal(0.0, 0.004, n),
+            common + rng.normal(0.0, 0.01, n),
+            rng.normal(0.0, 0.02, n),
+        ]
+    )
+
+
+def _curves(n=2000, seed=0):
+    equity = 100_000.0 * np.cumprod(1.0 + _returns(n, seed), axis=0)
+    curves = pd.DataFrame(equity, columns=["equity_a", "equity_b", "equity_c"])
+    curves.insert(0, "date", pd.date_range("2010-01-01", periods=n, freq="B"))
+    return curves
+
+
+def test_inverse_vol_weights():
+    returns = _returns()
+
+    inv = 1.0 / returns.std(axis=0, ddof=1)
+
+    np.testing.assert_allclose(inverse_vol_weights(returns), inv / inv.sum())
+
+
+def test_risk_parity_weights_equalize_risk_contributions():
+    returns = _returns()
+    cov = np.cov(returns, rowvar=False)
+
+    weights = risk_parity_weights(returns)
+    contributions = weights * (cov @ weights)
+
+    assert weights.sum() == pytest.approx(1.0)
+    np.testing.assert_allclose(contributions, contributions.mean(), rtol=1e-8)
+
+
+def _reference(curves, allocator, target):
+    """
+    Bar-by-bar allocation: each sleeve's capital grows with its curve
+    and is reset to target(window) on schedule or a drawdown trigger.
+    """
+    equity = curves.filter(like="equity_").to_numpy()
+    returns = np.vstack([np.zeros((1, equity.shape[1])), equity[1:] / equity[:-1] - 1.0])
+    scheduled = allocator._scheduled(curves["date"].to_numpy())
+
+    held = np.empty_like(equity)
+    held[0] = target(returns[:1]) * CAPITAL
+    peak = CAPITAL
+    reasons = ["initial"]
+    for t in range(1, len(equity)):
+        held[t] = held[t - 1] * (1.0 + returns[t])
+        total = held[t].sum()
+        peak = max(peak, total)
+
+        reason = "schedule" if scheduled[t] else None
+        if allocator.drawdown_trigger is not None and total / peak - 1.0 <= -allocator.drawdown_trigger:
+            reason = "drawdown"
+        if reason is not None:
+            window = returns[max(1, t + 1 - allocator.lookback) : t + 1]
+            held[t] = target(window) * total
+            peak = total
+            reasons.append(reason)
+
+    return held, reasons
+
+
+STATIC = {"a": 2.0, "b": 1.0, "c": 1.0}
+
+
+@pytest.mark.parametrize(
+    "allocator, target",
+    [
+        (
+            Allocator("static", weights=STATIC, every=21),
+            lambda window: np.array([0.5, 0.25, 0.25]),
+        ),
+        (
+            Allocator("static", weights=STATIC, every="M", drawdown_trigger=0.03),
+            lambda window: np.array([0.5, 0.25, 0.25]),
+        ),
+        (
+            Allocator("inverse_vol", every=63, lookback=63),
+            lambda window: inverse_vol_weights(window) if len(window) >= 2 else np.full(3, 1 / 3),
+        ),
+        (
+            Allocator("risk_parity", every="Q", lookback=126),
+            lambda window: risk_parity_weights(window) if len(window) >= 2 else np.full(3, 1 / 3),
+        ),
+    ],
+    ids=["static", "static-drawdown", "inverse_vol", "risk_parity"],
+)
+def test_allocator_matches_bar_by_bar_reference(allocator, target):
+    curves = _curves()
+
+    portfolio, rebalances = allocator.run(curves, CAPITAL)
+    held, reasons = _reference(curves, allocator, target)
+
+    assert list(rebalances["reason"]) == reasons
+    assert len(reasons) > 5
+    np.testing.assert_allclose(portfolio.filter(like="capital_").to_numpy(), held, rtol=1e-9)
+    np.testing.assert_allclose(
+        rebalances.filter(like="weight_").to_numpy().sum(axis=1), 1.0
+    )
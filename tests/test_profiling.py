@@ -0,0 +1,23 @@
+import tracemalloc
+
+import pytest
+
+from backtest.engine import BacktestEngine
+from backtest.profiling import Profiler
+from engine.sma_trend_strategy import SMATrendStrategy
+
+
+@pytest.mark.parametrize("already_tracing", [False, True])
+def test_tracemalloc_capture_keeps_tracing_state(make_bars, already_tracing):
+    engine = BacktestEngine(make_bars(300), SMATrendStrategy(window=50), 100_000.0, 0.01, 0.20, 14, 2.0, 10.0, 0.5)
+    if already_tracing:
+        tracemalloc.start()
+    try:
+        profiler = Profiler(capture="tracemalloc")
+        with profiler.session(engine):
+            engine.run()
+
+        assert tracemalloc.is_tracing() == already_tracing
+        assert profiler.captured
+    finally:
+        tracemalloc.stop()
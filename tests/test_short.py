@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import BacktestEngine
+from backtest.event_engine import EventEngine, EventSleeve
+from backtest.trade_log import TradeType
+from engine.mean_reversion_strategy import MeanReversionStrategy
+from engine.sma_trend_strategy import SMATrendStrategy
+from engine.strategy import Signal
+
+
+class _ReversalStrategy(SMATrendStrategy):
+    """
+    Long above the SMA and short below it, so every cross is a
+    reversal.
+    """
+
+    def generate_signal(self, data: pd.DataFrame):
+        if len(data) < self.window:
+            return Signal(direction=0)
+        return Signal(direction=1 if super().generate_signal(data).direction == 1 else -1)
+
+    def _signals(self, closes, sma, bars_seen) -> np.ndarray:
+        long = super()._signals(closes, sma, bars_seen)
+        return np.where(bars_seen >= self.window, 2 * long - 1, 0)
+
+    def on_bar(self, bar):
+        direction = super().on_bar(bar).direction
+        if self._bars < self.window:
+            return Signal(direction=0)
+        return Signal(direction=1 if direction == 1 else -1)
+
+
+STRATEGIES = {
+    "mean_reversion": lambda: MeanReversionStrategy(mean_window=10, regime_window=50, atr_period=14, short=True),
+    "reversal": lambda: _ReversalStrategy(window=50),
+}
+
+SETTINGS = dict(
+    initial_capital=100_000.0,
+    risk_per_trade=0.01,
+    max_drawdown=0.50,
+    atr_period=14,
+    atr_multiplier=2.0,
+    transaction_cost=10.0,
+    slippage=0.5,
+)
+
+
+def _frame(trades):
+    return pd.DataFrame(list(trades))
+
+
+@pytest.mark.parametrize("name", STRATEGIES)
+def test_run_vectorized_and_event_sleeve_agree(make_bars, name):
+    data = make_bars(3000, seed=11)
+
+    looped = BacktestEngine(data=data, strategy=STRATEGIES[name](), **SETTINGS)
+    looped.run()
+    vectorized = BacktestEngine(data=data, strategy=STRATEGIES[name](), **SETTINGS)
+    vectorized.run_vectorized()
+
+    engine = EventEngine()
+    engine.add_feed("NIFTY", data)
+    sleeve = engine.add_sleeve(
+        EventSleeve("sleeve", STRATEGIES[name](), **SETTINGS, entry="market", intrabar_stops=False),
+        "NIFTY",
+    )
+    engine.run()
+
+    assert looped.trades.mask(TradeType.SHORT).sum() > 10
+    expected = _frame(looped.trades)
+    pd.testing.assert_frame_equal(_frame(vectorized.trades), expected)
+    pd.testing.assert_frame_equal(_frame(sleeve.trades), expected)
+    np.testing.assert_allclose(sleeve.equity_series(), looped.equity_series(), rtol=1e-12)
+
+
+@pytest.mark.parametrize("name", STRATEGIES)
+def test_short_pnl_and_stops(make_bars, name):
+    data = make_bars(3000, seed=11)
+    engine = BacktestEngine(data=data, strategy=STRATEGIES[name](), **SETTINGS)
+    trades = list(engine.run())
+
+    entry = None
+    reversals = short_stops = 0
+    for previous, trade in zip([None] + trades, trades):
+        kind = trade["type"]
+        if kind in ("BUY", "SHORT"):
+            side = 1 if kind == "BUY" else -1
+            # The stop sits on the losing side of the entry
+            assert side * (trade["price"] - trade["stop"]) > 0
+            if previous is not None and previous["date"] == trade["date"] and previous["type"] in ("SELL", "COVER"):
+                reversals += 1
+            entry = trade
+        elif kind in ("SELL", "COVER", "STOP"):
+            side = 1 if entry["type"] == "BUY" else -1
+            if kind != "STOP":
+                assert kind == ("SELL" if side == 1 else "COVER")
+            else:
+                # Stops trigger on the close through the stop level
+                assert side * (trade["price"] - entry["stop"]) <= 0
+                short_stops += side == -1
+            expected = side * (trade["price"] - entry["price"]) * entry["size"] - SETTINGS["transaction_cost"]
+            assert trade["pnl"] == pytest.approx(expected)
+            entry = None
+
+    assert short_stops > 0
+    if name == "reversal":
+        assert reversals > 10
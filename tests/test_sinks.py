@@ -0,0 +1,32 @@
+import time
+
+import pytest
+
+import main
+from execution.signals import ExecutionSignal
+from execution.sinks import SignalSink, _AppendFileSink, make_sinks
+
+
+SIGNAL = ExecutionSignal("2024-01-02", "trend", "BUY", "NIFTY", 5.0, 21000.0, 20800.0, "entry")
+
+
+def test_sink_bases_are_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        SignalSink()
+    with pytest.raises(TypeError):
+        _AppendFileSink(tmp_path / "signals.out")
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_publish_reaches_file_before_close(tmp_path, background):
+    path = tmp_path / "signals.jsonl"
+    sinks = make_sinks([{"type": "jsonl", "path": str(path)}], background=background)
+    try:
+        main.publish([SIGNAL], sinks)
+
+        deadline = time.monotonic() + 5.0
+        while not path.read_text() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert path.read_text().count("\n") == 1
+    finally:
+        sinks.close()
@@ -0,0 +1,46 @@
+import numpy as np
+
+from engine.indicators import RollingATR, RollingMean, compute_atr
+from engine.mean_reversion_strategy import MeanReversionStrategy
+from engine.sma_trend_strategy import SMATrendStrategy
+from engine.strategy import Bar
+
+
+def _bars(data):
+    return [Bar(*row) for row in data[list(Bar._fields)].itertuples(index=False)]
+
+
+def test_rolling_mean_matches_pandas(make_bars):
+    closes = make_bars(500, seed=1)["close"]
+
+    sma = RollingMean(20)
+    streamed = np.array([sma.update(x) for x in closes])
+
+    np.testing.assert_array_equal(streamed, closes.rolling(20).mean().to_numpy())
+
+
+def test_rolling_atr_matches_batch(make_bars):
+    data = make_bars(200, seed=2)
+
+    atr = RollingATR(14)
+    streamed = np.array([atr.update(b.high, b.low, b.close) for b in _bars(data)])
+    batch = np.array([compute_atr(data.iloc[: i + 1], 14) for i in range(len(data))])
+
+    np.testing.assert_allclose(streamed, batch, rtol=1e-12)
+
+
+def test_on_bar_matches_generate_signal(make_bars):
+    data = make_bars(300, seed=3)
+
+    for strategy in (
+        SMATrendStrategy(window=50),
+        MeanReversionStrategy(mean_window=10, regime_window=50, atr_period=14),
+    ):
+        strategy.reset()
+        streamed = [strategy.on_bar(bar).direction for bar in _bars(data)]
+        replayed = [
+            strategy.generate_signal(data.iloc[: i + 1]).direction for i in range(len(data))
+        ]
+
+        assert streamed == replayed, type(strategy).__name__
+        assert any(streamed), type(strategy).__name__
@@ -0,0 +1,16 @@
+import numpy as np
+
+from benchmarks.synthetic import LOG_BAND, make_ohlcv
+
+
+def test_long_series_stay_finite():
+    # Past the ~2.3M bars where a drifting walk overflowed
+    data = make_ohlcv(3_000_000, seed=42)
+
+    for column in ("open", "high", "low", "close"):
+        assert np.isfinite(data[column].to_numpy()).all(), column
+
+    close = data["close"].to_numpy()
+    bound = 10000.0 * np.exp(LOG_BAND)
+    assert close.max() <= bound * (1 + 1e-9)
+    assert close.min() >= 10000.0 * np.exp(-LOG_BAND) * (1 - 1e-9)
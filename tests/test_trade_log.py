@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.trade_log import TradeLog, TradeType
+
+
+RECORDS = [
+    {"date": pd.Timestamp("2020-01-02"), "type": "BUY", "price": 100.0, "size": 5.0, "stop": 95.0, "cash": 99_490.0},
+    {"date": pd.Timestamp("2020-01-03"), "type": "STOP", "price": 95.0, "pnl": -25.0, "cash": 99_955.0},
+    {"date": pd.Timestamp("2020-01-06"), "type": "BUY", "price": 96.0, "size": 4.0, "stop": 90.0, "cash": 99_561.0},
+    {"date": pd.Timestamp("2020-01-07"), "type": "SELL", "price": 101.0, "pnl": 20.0, "cash": 99_965.0},
+    {"date": pd.Timestamp("2020-01-08"), "type": "HALT", "reason": "Max drawdown breached", "cash": 99_965.0},
+]
+
+
+def test_dict_view_round_trips_records():
+    log = TradeLog.from_records(RECORDS)
+
+    assert len(log) == len(RECORDS)
+    assert list(log) == RECORDS
+    assert log[-1] == RECORDS[-1]
+    assert log[1:3] == RECORDS[1:3]
+    with pytest.raises(IndexError):
+        log[len(RECORDS)]
+
+
+def test_columns_and_frame():
+    log = TradeLog(capacity=1)
+    for record in RECORDS:
+        fields = {k: v for k, v in record.items() if k not in ("date", "type", "reason")}
+        log.append(record["date"], TradeType[record["type"]], **fields)
+
+    np.testing.assert_array_equal(log.column("pnl")[[1, 3]], [-25.0, 20.0])
+    assert np.isnan(log.column("pnl")[0])
+    assert log.mask(TradeType.BUY).sum() == 2
+
+    frame = log.to_frame()
+    assert list(frame["type"]) == [r["type"] for r in RECORDS]
+    assert list(frame["date"]) == [r["date"] for r in RECORDS]
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from backtest.engine import BacktestEngine
+from backtest.universe import SleeveConfig, run_universe
+from engine.mean_reversion_strategy import MeanReversionStrategy
+from engine.sma_trend_strategy import SMATrendStrategy
+from engine.strategy import Strategy
+from engine.universe import Panel
+
+
+CAPITAL = 100_000.0
+
+
+def _frames(make_bars):
+    data = make_bars(1500, seed=3)
+    return {
+        "FULL": data,
+        # Interior gaps: a two-day suspension and a single missing row
+        "GAPS": data.drop(index=[600, 601, 1100]).reset_index(drop=True),
+        "LATE": data.iloc[300:].reset_index(drop=True),
+    }
+
+
+STRATEGIES = [SMATrendStrategy(200), MeanReversionStrategy()]
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=lambda s: type(s).__name__)
+def test_panel_signals_match_per_symbol(strategy, make_bars):
+    panel = Panel.from_frames(_frames(make_bars))
+
+    expected = Strategy.generate_panel_signals(strategy, panel)
+
+    np.testing.assert_array_equal(strategy.generate_panel_signals(panel), expected)
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES, ids=lambda s: type(s).__name__)
+def test_universe_matches_single_instrument_run(strategy, make_bars):
+    frames = _frames(make_bars)
+    sleeve = SleeveConfig(
+        name="sleeve",
+        strategy=strategy,
+        capital=CAPITAL * len(frames),
+        risk_per_trade=0.01,
+        max_drawdown=0.20,
+        atr_period=14,
+        atr_multiplier=2.0,
+        transaction_cost=10.0,
+        slippage=0.5,
+    )
+
+    results = run_universe(Panel.from_frames(frames), [sleeve])["sleeve"]
+
+    for symbol, data in frames.items():
+        expected = BacktestEngine(
+            data=data,
+            strategy=strategy,
+            initial_capital=CAPITAL,
+            risk_per_trade=0.01,
+            max_drawdown=0.20,
+            atr_period=14,
+            atr_multiplier=2.0,
+            transaction_cost=10.0,
+            slippage=0.5,
+        ).run()
+        trades = results[symbol]
+
+        assert len(trades) == len(expected), symbol
+        np.testing.assert_array_equal(trades.dates, expected.dates)
+        np.testing.assert_array_equal(trades.types, expected.types)
+        for column in ("price", "size", "stop"):
+            np.testing.assert_allclose(trades.column(column), expected.column(column))
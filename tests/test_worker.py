@@ -0,0 +1,23 @@
+import socket
+
+import pytest
+
+from execution.worker import request
+
+
+def test_request_times_out_on_a_stuck_worker():
+    # Accepts connections (the kernel completes the handshake) but
+    # never replies
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        host, port = server.getsockname()
+
+        with pytest.raises(socket.timeout):
+            request({"command": "signal"}, host, port, timeout=0.2)
+
+
+def test_request_without_worker_raises_oserror():
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        host, port = server.getsockname()
+
+    with pytest.raises(OSError):
+        request({"command": "ping"}, host, port)